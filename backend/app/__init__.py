@@ -1,5 +1,10 @@
 # backend/app/__init__.py
 
+import time
+
+# Start of the app import, reported at startup by app.main
+IMPORT_STARTED = time.perf_counter()
+
 from fastapi import APIRouter
 from .routes import router as api_router
 
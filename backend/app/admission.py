@@ -0,0 +1,321 @@
+# File: backend/app/admission.py
+#
+# Cost-aware admission control for the expensive endpoints. Each request is
+# costed before it runs, in units of about one text page, and must pass, in
+# order:
+#   - the client's concurrency limit for its kind of request (429),
+#   - the client's token bucket (429 with Retry-After),
+#   - the worker's in-flight cost budget for its kind of request, waiting in a
+#     bounded FIFO queue when it is exhausted (503 with Retry-After when the
+#     queue is full or the wait times out); uploads and queries have separate
+#     budgets, so queries never wait behind a large upload.
+# Limits are per worker process. Outcomes are counted in /metrics.
+
+import asyncio
+import collections
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+import logging
+
+from src.utils.config import Config
+from src.utils.instrumentation import metrics
+
+logger = logging.getLogger(__name__)
+
+# Buckets kept before idle, fully refilled ones are dropped
+_MAX_TRACKED_CLIENTS = 10_000
+
+def client_key(request: Request) -> str:
+    """
+    Identifies the client of a request: the ADMISSION_CLIENT_HEADER value (set
+    by an authenticating gateway), else the client address.
+    """
+    return (
+        request.headers.get(Config.ADMISSION_CLIENT_HEADER)
+        or (request.client.host if request.client else None)
+        or 'anonymous'
+    )
+
+def estimate_upload_cost(file_path: str, file_type: str) -> float:
+    """
+    Estimates the processing cost of an uploaded file before it is processed.
+
+    A PDF page costs one unit, or ADMISSION_OCR_PAGE_COST units when it has no
+    text layer and will be OCRed (estimated from a sample of pages). Other files
+    cost one unit per ADMISSION_BYTES_PER_UNIT bytes.
+
+    Args:
+        file_path (str): Path to the saved upload.
+        file_type (str): Detected file type (parser name).
+
+    Returns:
+        float: The cost in units, at least 1.
+    """
+    if file_type == 'pdf':
+        try:
+            from src.parsers.pdf_parser import inspect_pdf
+            pages, without_text = inspect_pdf(file_path)
+            return max(1.0, pages * (1 + without_text * (Config.ADMISSION_OCR_PAGE_COST - 1)))
+        except Exception as e:
+            logger.warning(f"Could not inspect PDF for admission; costing it by size: {e}")
+    return max(1.0, os.path.getsize(file_path) / Config.ADMISSION_BYTES_PER_UNIT)
+
+def _retry_after(seconds: float) -> Dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+class AdmissionTicket:
+    def __init__(self, controller: Optional["AdmissionController"], client_id: str, kind: str):
+        """
+        A request's admission: its client concurrency slot, and once charged, its
+        share of the in-flight cost budget. Release it when the work is done.
+        """
+        self.controller = controller
+        self.client_id = client_id
+        self.kind = kind
+        self.cost = 0.0
+        self._released = False
+
+    async def charge(self, cost: float):
+        """
+        Charges the request's cost to the client's bucket and waits for capacity.
+
+        Raises:
+            HTTPException: 429 if the client's bucket is short, 503 if the worker is overloaded.
+        """
+        if self.controller is not None:
+            await self.controller._charge(self, cost)
+
+    def release(self):
+        """
+        Frees the request's capacity and concurrency slot. Safe to call more than once.
+        """
+        if not self._released:
+            self._released = True
+            if self.controller is not None:
+                self.controller._release(self)
+
+class CapacityPool:
+    def __init__(self, max_inflight_cost: float, max_queue: int = 64, queue_timeout: float = 30.0):
+        """
+        The worker's budget for one kind of request: requests run while their
+        total cost stays within max_inflight_cost (a request costing more runs
+        alone) and otherwise wait in FIFO order.
+
+        Args:
+            max_inflight_cost (float): Units processed at once.
+            max_queue (int): Requests waiting before new ones are shed.
+            queue_timeout (float): Seconds a request waits.
+        """
+        self.max_inflight_cost = max_inflight_cost
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.inflight_cost = 0.0
+        self._waiting: Deque[List] = collections.deque()  # [cost, future] in arrival order
+
+    def _fits(self, cost: float) -> bool:
+        return self.inflight_cost == 0 or self.inflight_cost + cost <= self.max_inflight_cost
+
+    async def reserve(self, cost: float) -> bool:
+        """
+        Waits until the request fits.
+
+        Returns:
+            bool: Whether the request had to wait.
+
+        Raises:
+            OverflowError: If the queue is full.
+            asyncio.TimeoutError: If the request waited queue_timeout seconds.
+        """
+        if not self._waiting and self._fits(cost):
+            self.inflight_cost += cost
+            return False
+        if len(self._waiting) >= self.max_queue:
+            raise OverflowError("Admission queue is full.")
+        entry = [cost, asyncio.get_running_loop().create_future()]
+        self._waiting.append(entry)
+        try:
+            await asyncio.wait_for(entry[1], self.queue_timeout)
+        except BaseException:
+            if entry[1].done() and not entry[1].cancelled():
+                # Granted, then cancelled before resuming
+                self.inflight_cost -= cost
+            try:
+                self._waiting.remove(entry)
+            except ValueError:
+                pass
+            # A request giving up at the head of the queue may have held back others
+            self._wake()
+            raise
+        return True
+
+    def release(self, cost: float):
+        self.inflight_cost = max(0.0, self.inflight_cost - cost)
+        self._wake()
+
+    def _wake(self):
+        while self._waiting:
+            cost, future = self._waiting[0]
+            if future.done():
+                self._waiting.popleft()
+                continue
+            if not self._fits(cost):
+                break
+            self._waiting.popleft()
+            self.inflight_cost += cost
+            future.set_result(None)
+
+class AdmissionController:
+    def __init__(
+        self,
+        enabled: bool = True,
+        rate: float = 5.0,
+        burst: float = 500.0,
+        client_limits: Optional[Dict[str, int]] = None,
+        pools: Optional[Dict[str, CapacityPool]] = None
+    ):
+        """
+        Per-client token buckets and concurrency limits, and per-worker capacity pools.
+
+        A bucket holds up to burst units and refills at rate units per second.
+        A request is admitted when the bucket holds its cost (or is full, for a
+        request costing more than burst) and is then charged its full cost, so
+        the bucket may go into debt: a client's long-run throughput is rate
+        units per second whatever the size of its requests. Each kind of request
+        then waits for room in its own pool, so queries never queue behind
+        uploads.
+
+        Must be used from a single event loop (the worker's).
+
+        Args:
+            enabled (bool): When False, every request is admitted.
+            rate (float): Bucket refill, in units per second.
+            burst (float): Bucket capacity, in units.
+            client_limits (Dict[str, int], optional): Concurrent requests per client, by kind.
+            pools (Dict[str, CapacityPool], optional): Capacity by kind; kinds without a pool are not limited.
+        """
+        self.enabled = enabled
+        self.rate = rate
+        self.burst = burst
+        self.client_limits = dict(client_limits or {})
+        self.pools = dict(pools or {})
+        self._buckets: Dict[str, List[float]] = {}  # client -> [tokens, last refill]
+        self._active: Dict[Tuple[str, str], int] = {}  # (client, kind) -> requests in progress
+
+    @classmethod
+    def from_config(cls) -> "AdmissionController":
+        return cls(
+            enabled=Config.ADMISSION_ENABLED,
+            rate=Config.ADMISSION_RATE,
+            burst=Config.ADMISSION_BURST,
+            client_limits={'upload': Config.ADMISSION_CLIENT_UPLOADS, 'query': Config.ADMISSION_CLIENT_QUERIES},
+            pools={
+                'upload': CapacityPool(
+                    Config.ADMISSION_MAX_INFLIGHT_COST, Config.ADMISSION_MAX_QUEUE, Config.ADMISSION_QUEUE_TIMEOUT
+                ),
+                'query': CapacityPool(
+                    Config.ADMISSION_MAX_INFLIGHT_QUERIES, Config.ADMISSION_MAX_QUEUE, Config.ADMISSION_QUEUE_TIMEOUT
+                ),
+            }
+        )
+
+    def _reject(self, kind: str, reason: str, status_code: int, detail: str, retry_after: Optional[float] = None):
+        metrics.inc("rag_admission_rejected_total", "Requests rejected by admission control.", kind=kind, reason=reason)
+        logger.warning(f"Rejected {kind} request ({reason}): {detail}")
+        raise HTTPException(
+            status_code=status_code, detail=detail, headers=_retry_after(retry_after) if retry_after is not None else None
+        )
+
+    async def enter(self, client_id: str, kind: str) -> AdmissionTicket:
+        """
+        Takes one of the client's concurrency slots for this kind of request.
+
+        Args:
+            client_id (str): The client (see client_key).
+            kind (str): 'upload' or 'query'.
+
+        Returns:
+            AdmissionTicket: The ticket to charge and release.
+
+        Raises:
+            HTTPException: 429 if the client already has its limit of requests in progress.
+        """
+        if not self.enabled:
+            return AdmissionTicket(None, client_id, kind)
+        key = (client_id, kind)
+        limit = self.client_limits.get(kind)
+        if limit is not None and self._active.get(key, 0) >= limit:
+            self._reject(kind, 'concurrency', 429, f"Too many concurrent {kind} requests; at most {limit} at a time.")
+        self._active[key] = self._active.get(key, 0) + 1
+        return AdmissionTicket(self, client_id, kind)
+
+    @asynccontextmanager
+    async def admit(self, client_id: str, kind: str):
+        """
+        enter() as a context manager that releases the ticket on exit.
+        """
+        ticket = await self.enter(client_id, kind)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def _refill(self, client_id: str) -> List[float]:
+        now = time.monotonic()
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            if len(self._buckets) >= _MAX_TRACKED_CLIENTS:
+                self._prune(now)
+            bucket = self._buckets[client_id] = [self.burst, now]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        return bucket
+
+    def _prune(self, now: float):
+        # A bucket refilled to capacity is the same as no bucket
+        for client_id, (tokens, last) in list(self._buckets.items()):
+            if tokens + (now - last) * self.rate >= self.burst:
+                del self._buckets[client_id]
+
+    async def _charge(self, ticket: AdmissionTicket, cost: float):
+        kind = ticket.kind
+        bucket = self._refill(ticket.client_id)
+        needed = min(cost, self.burst)
+        if bucket[0] < needed:
+            self._reject(
+                kind, 'rate', 429, f"Request budget exhausted; this request costs {cost:.0f} units.",
+                retry_after=(needed - bucket[0]) / self.rate
+            )
+        bucket[0] -= cost
+        pool = self.pools.get(kind)
+        try:
+            if pool is not None and await pool.reserve(cost):
+                metrics.inc("rag_admission_queued_total", "Requests that waited for capacity.", kind=kind)
+        except BaseException as e:
+            # Shed for lack of capacity (or cancelled): not the client's spending
+            bucket[0] = min(self.burst, bucket[0] + cost)
+            if isinstance(e, OverflowError):
+                self._reject(kind, 'queue_full', 503, "Server is busy; try again later.", retry_after=pool.queue_timeout)
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject(kind, 'queue_timeout', 503, "Server is busy; try again later.", retry_after=pool.queue_timeout)
+            raise
+        ticket.cost = cost
+        metrics.inc("rag_admission_admitted_total", "Requests admitted by admission control.", kind=kind)
+        metrics.inc("rag_admission_cost_units_total", "Estimated cost of admitted requests.", amount=cost, kind=kind)
+
+    def _release(self, ticket: AdmissionTicket):
+        key = (ticket.client_id, ticket.kind)
+        self._active[key] -= 1
+        if not self._active[key]:
+            del self._active[key]
+        pool = self.pools.get(ticket.kind)
+        if ticket.cost and pool is not None:
+            pool.release(ticket.cost)
+
+# Per-process controller used by the routes
+admission = AdmissionController.from_config()
@@ -3,7 +3,9 @@
 import nltk
 
 def download_nltk_data():
-    nltk.download('punkt')
+    # punkt_tab is the data format read by newer NLTK releases
+    for package in ('punkt', 'punkt_tab'):
+        nltk.download(package)
 
 if __name__ == "__main__":
     download_nltk_data()
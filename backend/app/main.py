@@ -1,27 +1,53 @@
 # File: backend/app/main.py
 
+import time
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
+from src.utils.logger import configure_logging, log_context, new_id
+
+# This module is the server's entry point, so it configures logging. The app
+# package has already imported the routes by now; importing them only creates
+# loggers, so nothing is logged before this point.
+configure_logging()
+
+from . import IMPORT_STARTED
 from .routes import router as upload_router
+from .profiling import ProfilingMiddleware, router as admin_router, start_continuous_sampler, stop_continuous_sampler
+from src.utils.config import Config
+from src.utils.warmup import warmup
 
-# Initialize logger
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # Set to DEBUG for detailed logs
 
-# Create console handler with a higher log level
-ch = logging.StreamHandler()
-ch.setLevel(logging.DEBUG)
+IMPORT_MS = round((time.perf_counter() - IMPORT_STARTED) * 1000, 1)
+
+class RequestIdMiddleware:
+    def __init__(self, app):
+        """
+        ASGI middleware that tags every log record of a request with its ID.
+
+        The ID is taken from the X-Request-ID header when the client sends one,
+        and is returned in the X-Request-ID response header.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = next(
+            (value.decode('latin-1') for key, value in scope.get("headers", []) if key == b"x-request-id"), None
+        ) or new_id()
 
-# Create formatter and add it to the handlers
-formatter = logging.Formatter('%(levelname)s:%(name)s:%(message)s')
-ch.setFormatter(formatter)
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode('latin-1'))]
+            await send(message)
 
-# Add the handlers to the logger if not already added
-if not logger.handlers:
-    logger.addHandler(ch)
+        with log_context(request_id=request_id):
+            await self.app(scope, receive, send_with_request_id)
 
 app = FastAPI(
     title="Multimodal RAG System Backend",
@@ -38,8 +64,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profile requests on demand (X-Profile header or POST /admin/profile)
+app.add_middleware(ProfilingMiddleware)
+
+# Outermost, so that everything logged while serving a request carries its ID
+app.add_middleware(RequestIdMiddleware)
+
 # Include the upload router
 app.include_router(upload_router)
+app.include_router(admin_router)
+
+@app.on_event("startup")
+def warm_up():
+    # Under gunicorn with preload_app this already ran in the master (see
+    # gunicorn.conf.py), and the worker finds everything loaded
+    logger.info(f"App imported in {IMPORT_MS:.0f} ms.")
+    if Config.WARMUP_ON_STARTUP:
+        warmup()
+
+@app.on_event("startup")
+def start_profiling():
+    if Config.PROFILE_SAMPLER_ENABLED:
+        start_continuous_sampler()
+
+@app.on_event("shutdown")
+def stop_profiling():
+    stop_continuous_sampler()
 
 @app.get("/")
 def read_root():
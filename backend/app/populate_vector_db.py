@@ -12,9 +12,8 @@ if project_root not in sys.path:
 from src.data_extraction.extractor import extract_data
 from src.preprocessing.cleaner import clean_data, chunk_data
 from src.embedding.embedder import generate_embeddings
-from src.vector_db.vectordb import VectorDB
-from src.utils.config import Config
-from src.utils.logger import setup_logger
+from src.utils.components import components
+from src.utils.logger import configure_logging, log_context, new_id, setup_logger
 
 logger = setup_logger(__name__)
 
@@ -46,7 +45,7 @@ def populate_vector_db():
 
         # Step 5: Store in VectorDB
         logger.info("Initializing VectorDB...")
-        vectordb = VectorDB(Config.REDIS_URL, Config.CHROMA_COLLECTION_NAME)
+        vectordb = components.vector_db
         logger.info("Adding documents to VectorDB...")
         vectordb.add_documents(embeddings, chunks)  # Ensure this method matches your VectorDB implementation
 
@@ -57,4 +56,6 @@ def populate_vector_db():
         raise e
 
 if __name__ == "__main__":
-    populate_vector_db()
+    configure_logging()
+    with log_context(job_id=new_id()):
+        populate_vector_db()
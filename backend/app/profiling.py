@@ -0,0 +1,184 @@
+# File: backend/app/profiling.py
+
+import asyncio
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+import logging
+
+from src.utils.config import Config
+from src.utils.profiler import ContinuousSampler, SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+# Sources ranked by the continuous sampler
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILED_ROOTS = (os.path.join(BACKEND_DIR, 'app'), os.path.join(BACKEND_DIR, 'src'))
+
+_PROFILE_ID_PATTERN = re.compile(r'^[\w-]+$')
+
+class ProfileBudget:
+    """
+    Number of upcoming requests to profile, armed through POST /admin/profile.
+    """
+    def __init__(self):
+        self._remaining = 0
+        self._lock = threading.Lock()
+
+    def arm(self, requests: int):
+        with self._lock:
+            self._remaining = requests
+
+    def take(self) -> bool:
+        with self._lock:
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            return True
+
+    @property
+    def remaining(self) -> int:
+        return self._remaining
+
+profile_budget = ProfileBudget()
+continuous_sampler: Optional[ContinuousSampler] = None
+
+def _profile_extension() -> str:
+    return '.collapsed.txt' if Config.PROFILE_FORMAT == 'collapsed' else '.speedscope.json'
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+def _wants_profile(scope) -> bool:
+    if Config.PROFILE_HEADER_ENABLED and _header(scope, b"x-profile") in ("1", "true"):
+        # With an admin token configured, the header alone is not enough
+        if not Config.ADMIN_TOKEN or _header(scope, b"x-admin-token") == Config.ADMIN_TOKEN:
+            return True
+    return profile_budget.take()
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        """
+        ASGI middleware that runs a sampling profiler over selected requests and
+        saves the profile under PROFILE_DIR. The response carries the profile ID
+        in the X-Profile-Id header; fetch it from GET /admin/profiles/{profile_id}.
+
+        All threads are sampled, so work the request hands to thread pools is
+        included, and so is anything running concurrently with it.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/admin") or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        slug = re.sub(r'[^\w]+', '_', scope["path"]).strip('_') or 'root'
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}_{scope['method'].lower()}_{slug}_{uuid.uuid4().hex[:8]}"
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profiler = SamplingProfiler(interval=Config.PROFILE_INTERVAL_MS / 1000).start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            path = os.path.join(Config.PROFILE_DIR, profile_id + _profile_extension())
+            name = f"{scope['method']} {scope['path']}"
+            try:
+                await asyncio.to_thread(profiler.write, path, Config.PROFILE_FORMAT, name)
+            except Exception as e:
+                logger.error(f"Failed to write profile {profile_id}: {e}")
+
+def start_continuous_sampler() -> ContinuousSampler:
+    """
+    Starts the process-wide continuous sampler.
+    """
+    global continuous_sampler
+    if continuous_sampler is None:
+        continuous_sampler = ContinuousSampler(
+            PROFILED_ROOTS,
+            interval=Config.PROFILE_SAMPLER_INTERVAL_MS / 1000,
+            report_interval=Config.PROFILE_REPORT_SECONDS,
+        ).start()
+    return continuous_sampler
+
+def stop_continuous_sampler():
+    global continuous_sampler
+    if continuous_sampler is not None:
+        continuous_sampler.stop()
+        continuous_sampler = None
+
+# ----------------------------
+# Admin Endpoints
+# ----------------------------
+
+router = APIRouter(prefix="/admin")
+
+def require_admin(token: Optional[str]):
+    if not Config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN.")
+    if token != Config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+@router.post("/profile")
+async def arm_profiler(requests: int = 1, x_admin_token: Optional[str] = Header(None)):
+    """
+    Profiles the next N requests.
+
+    Args:
+        requests (int): Number of requests to profile; 0 disarms.
+    """
+    require_admin(x_admin_token)
+    if requests < 0:
+        raise HTTPException(status_code=400, detail="requests must not be negative.")
+    profile_budget.arm(requests)
+    logger.info(f"Profiling the next {requests} requests.")
+    return {"armed": requests}
+
+@router.get("/profiles")
+async def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    """
+    Lists the saved request profiles, newest first.
+    """
+    require_admin(x_admin_token)
+    if not os.path.isdir(Config.PROFILE_DIR):
+        return {"profiles": [], "armed": profile_budget.remaining}
+    names = sorted(os.listdir(Config.PROFILE_DIR), reverse=True)
+    return {"profiles": [name.split('.', 1)[0] for name in names], "armed": profile_budget.remaining}
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """
+    Downloads a saved request profile.
+    """
+    require_admin(x_admin_token)
+    if not _PROFILE_ID_PATTERN.match(profile_id):
+        raise HTTPException(status_code=400, detail="Invalid profile ID.")
+    for extension in ('.speedscope.json', '.collapsed.txt'):
+        path = os.path.join(Config.PROFILE_DIR, profile_id + extension)
+        if os.path.exists(path):
+            return FileResponse(path, filename=profile_id + extension)
+    raise HTTPException(status_code=404, detail="Profile not found.")
+
+@router.get("/profile/hot")
+async def hot_functions(top: int = 20, x_admin_token: Optional[str] = Header(None)):
+    """
+    Returns the hottest functions seen by the continuous sampler.
+    """
+    require_admin(x_admin_token)
+    if continuous_sampler is None:
+        raise HTTPException(status_code=404, detail="Continuous sampler is not running; set PROFILE_SAMPLER_ENABLED.")
+    return continuous_sampler.report(top)
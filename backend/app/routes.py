@@ -1,165 +1,267 @@
 # File: backend/app/routes.py
 
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from fastapi import APIRouter, File, UploadFile, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from contextlib import aclosing
+import asyncio
 import shutil
 import os
+import tempfile
+import json
 import logging
 
-from .schemas import UploadResponse, Table, TableRow
+from .admission import admission, client_key, estimate_upload_cost
+from .schemas import UploadResponse, QueryRequest
 from .utils import (
-    extract_text_from_pdf, 
-    extract_text_from_docx, 
-    extract_text_from_txt, 
-    compute_metrics, 
-    extract_entities_with_spacy,
-    chunk_text,
-    batch_chunk_text
+    extract_document,
+    extract_entities_with_spacy
 )
+from src.chunkers.strategies import ChunkingInput, registered_strategies, run_strategies
+from src.chunkers.hierarchical import build_parent_child_records
+from src.chunkers.records import build_chunk_records, make_document_id, strip_page_breaks
+from src.chunkers.image_chunker import chunk_images
+from src.chunkers.table_chunker import chunk_tables
+from src.parsers.image_parser import extract_images_from_pdf
+from src.parsers.registry import detect_file_type
+from src.multimodal_llm.llm import astream_response
+from src.utils.components import components
+from src.utils.config import Config
+from src.utils.instrumentation import collect_spans, metrics, span
+from src.utils.summary import TextMetrics
+from src.vector_db.filters import build_filter
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 # Initialize logger
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # Set to DEBUG for detailed logs
 
-# Create console handler with a higher log level
-ch = logging.StreamHandler()
-ch.setLevel(logging.DEBUG)
+router = APIRouter()
 
-# Create formatter and add it to the handlers
-formatter = logging.Formatter('%(levelname)s:%(name)s:%(message)s')
-ch.setFormatter(formatter)
+# File types (parser registry names) accepted by the upload endpoint
+UPLOAD_FILE_TYPES = ('pdf', 'docx', 'txt', 'html')
 
-# Add the handlers to the logger if not already added
-if not logger.handlers:
-    logger.addHandler(ch)
+def index_pdf_images(file_path: str, document_id: str) -> int:
+    """
+    Extracts the embedded images of a PDF and indexes them as image chunks.
 
-router = APIRouter()
+    Args:
+        file_path (str): Path to the PDF file.
+        document_id (str): ID of the document.
+
+    Returns:
+        int: Number of image chunks indexed.
+    """
+    logger.info("Indexing image chunks in VectorDB...")
+    images = extract_images_from_pdf(
+        file_path, components.blob_store, thumbnail_size=Config.THUMBNAIL_SIZE
+    )
+    records = list(chunk_images(
+        images, document_id, captioner=components.captioner, batch_size=Config.IMAGE_BATCH_SIZE
+    ))
+    if records:
+        components.vector_db.add_records(records)
+    logger.info(f"Indexed {len(records)} image chunks.")
+    return len(records)
+
+@router.get("/api/chunkers")
+async def list_chunkers():
+    """
+    Lists the chunking strategies an upload can select, and the default selection.
+    """
+    return {
+        "strategies": [
+            {"name": strategy.name, "description": strategy.description} for strategy in registered_strategies()
+        ],
+        "default": [name.strip() for name in Config.CHUNKING_STRATEGIES.split(',') if name.strip()],
+    }
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Exposes per-stage durations, item counts and peak memory in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @router.post("/api/upload", response_model=UploadResponse)
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(
+    request: Request, file: UploadFile = File(...), include_timings: bool = False, chunkers: Optional[str] = None
+):
     """
     Handles the file upload, extracts text, tables, chunks the text,
     extracts entities, computes metrics, and returns the response.
 
-    Supports .txt, .pdf, and .docx file formats.
+    Supports .txt, .pdf, and .docx file formats. The upload is costed (pages,
+    OCR, size) once saved and goes through admission control before it is
+    processed; the processing runs in a worker thread.
 
     Args:
+        request (Request): The incoming request, used to identify the client.
         file (UploadFile): The uploaded file.
+        include_timings (bool): Whether to add the per-stage timings of this upload to the response.
+        chunkers (str, optional): Comma-separated chunking strategies to run (see GET /api/chunkers).
+            Defaults to CHUNKING_STRATEGIES.
 
     Returns:
         UploadResponse: Contains the metrics, list of chunks, extracted entities, and tables.
     """
     logger.info(f"Received file: {file.filename}")
 
-    # Validate file type
-    if not (file.filename.endswith('.pdf') or file.filename.endswith('.txt') or file.filename.endswith('.docx')):
-        logger.error("Unsupported file type")
-        raise HTTPException(status_code=400, detail="Unsupported file type. Please upload a .txt, .pdf, or .docx file.")
-
-    # Determine file type
-    if file.filename.endswith('.pdf'):
-        file_type = 'pdf'
-    elif file.filename.endswith('.docx'):
-        file_type = 'docx'
-    else:
-        file_type = 'txt'
-
-    # Save the uploaded file temporarily
-    temp_dir = "/tmp"
-    temp_file_path = os.path.join(temp_dir, f"temp_{file.filename}")
+    strategies = [name.strip() for name in (chunkers or Config.CHUNKING_STRATEGIES).split(',') if name.strip()]
+    available = [strategy.name for strategy in registered_strategies()]
+    unknown = [name for name in strategies if name not in available]
+    if unknown or not strategies:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown chunking strategies: {', '.join(unknown) or '(none)'}. Available: {', '.join(available)}."
+        )
+
+    async with admission.admit(client_key(request), 'upload') as ticket:
+        # Save the uploaded file temporarily, under a name no concurrent upload shares
+        fd, temp_file_path = tempfile.mkstemp(prefix="upload_", suffix=os.path.splitext(file.filename or '')[1])
+        os.close(fd)
+        try:
+            with collect_spans() as spans, span("upload"):
+                file_type = await asyncio.to_thread(save_upload, file, temp_file_path)
+                cost = await asyncio.to_thread(estimate_upload_cost, temp_file_path, file_type)
+                logger.info(f"Upload estimated at {cost:.0f} cost units.")
+                await ticket.charge(cost)
+                response_data = await asyncio.to_thread(process_upload, temp_file_path, file_type, strategies)
+        finally:
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+                logger.info(f"Deleted temporary file at: {temp_file_path}")
+    if include_timings:
+        response_data["timings"] = [stage_span.to_dict() for stage_span in spans]
+
+    logger.info("Returning response with chunks, entities, and tables.")
+    # Serialize directly; validating every table cell through Pydantic models
+    # dominates the response time for large tables. UploadResponse still
+    # documents the response schema.
+    return JSONResponse(content=response_data)
+
+def save_upload(file: UploadFile, temp_file_path: str) -> str:
+    """
+    Saves the uploaded file and detects its type.
+
+    Args:
+        file (UploadFile): The uploaded file.
+        temp_file_path (str): Where to save the file while it is processed.
+
+    Returns:
+        str: The file type (parser name).
+
+    Raises:
+        HTTPException: 400 if the file type is not supported.
+    """
     try:
         with open(temp_file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
         logger.info(f"Saved temporary file at: {temp_file_path}")
+    except Exception as e:
+        logger.error(f"Error saving uploaded file: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error.")
 
-        # Extract text and tables based on file type
-        if file_type == 'pdf':
-            extracted_text, extracted_tables = extract_text_from_pdf(temp_file_path)
-        elif file_type == 'docx':
-            extracted_text, extracted_tables = extract_text_from_docx(temp_file_path)
-        else:  # .txt
-            extracted_text, extracted_tables = extract_text_from_txt(temp_file_path)
-
-        if not extracted_text.strip() and not extracted_tables:
-            logger.error("No text or tables found in the document")
-            raise HTTPException(status_code=400, detail="No text or tables found in the document.")
+    # Determine the file type from the content; the file name is only a fallback
+    file_type = detect_file_type(temp_file_path, file.filename, file.content_type)
+    if file_type not in UPLOAD_FILE_TYPES:
+        logger.error(f"Unsupported file type: {file_type}")
+        raise HTTPException(
+            status_code=400,
+            detail="Unsupported file type. Please upload a .txt, .pdf, .docx or .html file."
+        )
+    logger.info(f"Detected file type: {file_type}")
+    return file_type
 
-        logger.info("Computing metrics before chunking...")
-        # Compute metrics before chunking (optional if metrics_before are needed)
-        metrics_before = compute_metrics(extracted_text, chunks=[])
+def process_upload(temp_file_path: str, file_type: str, strategies: List[str]) -> Dict:
+    """
+    Runs the upload pipeline on the saved copy of the file and builds the response data.
 
-        logger.info("Chunking text using Text Chunker...")
-        # Chunk the text using text_chunker
-        chunks_text_chunker = chunk_text(extracted_text, method='spacy')  # Adjust 'method' as needed
-        logger.info(f"Total chunks created by text_chunker: {len(chunks_text_chunker)}")
+    Args:
+        temp_file_path (str): Where the file was saved (see save_upload).
+        file_type (str): The detected file type.
+        strategies (List[str]): Chunking strategies whose chunks are returned.
 
-        logger.info("Chunking text using Batch Chunker...")
-        # Chunk the text using batch_chunker
-        chunks_batch_chunker = batch_chunk_text(extracted_text, batch_size=500)  # Example batch size
-        logger.info(f"Total chunks created by batch_chunker: {len(chunks_batch_chunker)}")
+    Returns:
+        Dict: The response data described by UploadResponse.
+    """
+    try:
+        # Extract text and tables based on file type; the document metrics are
+        # collected as the text is extracted
+        text_metrics = TextMetrics()
+        extracted_text, extracted_tables = extract_document(temp_file_path, file_type, metrics=text_metrics)
 
-        # Compute metrics for each chunking method
-        metrics_text_chunker = compute_metrics(extracted_text, chunks_text_chunker)
-        metrics_batch_chunker = compute_metrics(extracted_text, chunks_batch_chunker)
+        if not extracted_text.strip() and not extracted_tables:
+            logger.error("No text or tables found in the document")
+            raise HTTPException(status_code=400, detail="No text or tables found in the document.")
 
-        # Combine chunking results with their respective metrics
-        chunking_results = {
-            "text_chunker": chunks_text_chunker,
-            "batch_chunker": chunks_batch_chunker
+        # Run the selected chunking strategies concurrently over one cleaning and
+        # sentence split. The text chunker always runs: entity extraction and
+        # indexing use its chunks.
+        logger.info(f"Chunking text with: {', '.join(strategies)}")
+        chunking_input = ChunkingInput(extracted_text, sentence_method='spacy')
+        all_chunks = run_strategies(chunking_input, strategies + ['text_chunker'])
+        # Page breaks only serve the page spans of indexed records; callers and NER get plain chunks
+        plain_chunks = {
+            name: [strip_page_breaks(chunk) for chunk in chunks] for name, chunks in all_chunks.items()
         }
+        chunks_text_chunker = plain_chunks['text_chunker']
+        chunking_results = {name: plain_chunks[name] for name in strategies}
+
+        document_id = make_document_id(temp_file_path)
+        if Config.INDEX_UPLOADS:
+            if Config.HIERARCHICAL_INDEX:
+                # Small children are searched; their parent sections are stored once and returned
+                logger.info("Indexing child chunks in VectorDB and parent sections in the doc store...")
+                with span("hierarchy") as hierarchy_span:
+                    parents, records = build_parent_child_records(
+                        chunking_input.sentences, chunking_input.cleaned_text, document_id,
+                        parent_min_words=Config.PARENT_MIN_WORDS, parent_max_words=Config.PARENT_MAX_WORDS,
+                        child_max_words=Config.CHILD_MAX_WORDS
+                    )
+                    hierarchy_span.items = len(records)
+                components.doc_store.put(parents)
+            else:
+                logger.info("Indexing text chunks in VectorDB...")
+                records = build_chunk_records(
+                    all_chunks['text_chunker'], chunking_input.cleaned_text, document_id,
+                    modality='text', extractor='text_chunker'
+                )
+            components.vector_db.add_records(records)
+            table_records = chunk_tables(
+                extracted_tables, document_id,
+                style=Config.TABLE_CHUNK_STYLE, max_chars=Config.TABLE_CHUNK_MAX_CHARS
+            )
+            if table_records:
+                logger.info(f"Indexing {len(table_records)} table chunks in VectorDB...")
+                components.vector_db.add_records(table_records)
+            if file_type == 'pdf':
+                with span("images") as image_span:
+                    image_span.items = index_pdf_images(temp_file_path, document_id)
 
         # Extract entities using different methods
         # Currently, only spaCy is implemented
-        entities_spacy = extract_entities_with_spacy(extracted_text)
+        entities_spacy = extract_entities_with_spacy(extracted_text, chunks=chunks_text_chunker)
         entities_results = {
             "spacy": entities_spacy
             # Add other entity extractors here if available
         }
 
-        logger.info("Computing metrics after chunking...")
-        # Compute metrics after chunking (using text_chunker and batch_chunker)
-        # Already computed above
-
     except HTTPException as he:
         raise he
     except Exception as e:
         logger.error(f"Error processing file: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error.")
-    finally:
-        # Clean up temporary file
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-            logger.info(f"Deleted temporary file at: {temp_file_path}")
 
-    # Prepare the tables data
+    # Tables are sanitized by the extractors; drop empty ones and send them as is
     tables_response = {}
     for extractor, tables in extracted_tables.items():
-        extractor_tables = []
-        for table in tables:
-            table_rows = []
-            for row in table.get("rows", []):
-                # Ensure all cells are strings, replace None with empty string
-                sanitized_cells = [cell if cell is not None else "" for cell in row.get("cells", [])]
-                # Optionally, filter out rows where all cells are empty
-                if any(cell.strip() for cell in sanitized_cells):
-                    table_rows.append(TableRow(cells=sanitized_cells))
-                else:
-                    logger.debug("Skipping empty row.")
-            # Only include tables that have at least one non-empty row
-            if table_rows:
-                # Ensure 'page_number' is an integer
-                page_number = table.get("page_number", 0)
-                if not isinstance(page_number, int):
-                    logger.warning(f"Table {table.get('table_number',0)} has invalid page_number: {page_number}. Setting to 0.")
-                    page_number = 0
-                extractor_tables.append(Table(
-                    page_number=page_number,
-                    table_number=table.get("table_number", 0),
-                    rows=table_rows
-                ))
-        if extractor_tables:
-            tables_response[extractor] = extractor_tables
+        non_empty_tables = [table for table in tables if table.get("rows")]
+        if non_empty_tables:
+            tables_response[extractor] = non_empty_tables
+
+    # Document metrics, with the chunk count of the text chunker
+    metrics_text_chunker = text_metrics.result(num_chunks=len(chunks_text_chunker))
 
     # Prepare the response data
     response_data = {
@@ -172,9 +274,80 @@ async def upload_file(file: UploadFile = File(...)):
         "original_content_size": metrics_text_chunker["original_content_size"],
         "num_chunks": metrics_text_chunker["num_chunks"],
         "chunking": chunking_results,
+        "chunk_counts": {method: len(chunks) for method, chunks in chunking_results.items()},
         "entities": entities_results,  # Added entities to response
-        "tables": tables_response  # Added tables to response
+        "tables": tables_response,  # Added tables to response
+        "document_id": document_id
     }
+    return response_data
 
-    logger.info("Returning response with chunks, entities, and tables.")
-    return UploadResponse(**response_data)
+def format_sse(event: str, data) -> str:
+    """
+    Formats a server-sent event frame.
+
+    Args:
+        event (str): The event name.
+        data: JSON-serializable payload.
+
+    Returns:
+        str: The SSE frame.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/api/query")
+async def query_documents(payload: QueryRequest, request: Request):
+    """
+    Answers a query with the RAG pipeline, streaming the result as server-sent events.
+
+    Optional document, page range and modality filters restrict the search.
+    The stream emits a 'sources' event with the retrieved sources first, then one
+    'token' event per LLM token as it arrives, and finally a 'done' event with
+    retrieval time, time-to-first-token and total time. If the client disconnects,
+    the upstream LLM call is aborted.
+
+    Args:
+        payload (QueryRequest): The query and number of documents to retrieve.
+        request (Request): The incoming request, used to detect client disconnects.
+
+    Returns:
+        StreamingResponse: A text/event-stream response.
+    """
+    if not payload.query.strip():
+        raise HTTPException(status_code=400, detail="Query must not be empty.")
+
+    logger.info(f"Received query: {payload.query}")
+    page_range = None
+    if payload.page_start is not None or payload.page_end is not None:
+        page_range = (payload.page_start, payload.page_end)
+    where = build_filter(document_id=payload.document_id, page_range=page_range, modality=payload.modality)
+
+    # Admitted before streaming starts, so that rejections get a proper status code;
+    # the ticket is held until the stream ends
+    ticket = await admission.enter(client_key(request), 'query')
+    try:
+        await ticket.charge(Config.ADMISSION_QUERY_COST)
+    except BaseException:
+        ticket.release()
+        raise
+
+    async def event_stream():
+        try:
+            async with aclosing(astream_response(payload.query, k=payload.k, filter=where)) as events:
+                async for event in events:
+                    if await request.is_disconnected():
+                        logger.info("Client disconnected; aborting LLM stream.")
+                        break
+                    yield format_sse(event["event"], event["data"])
+        except Exception as e:
+            logger.error(f"Error streaming query response: {e}")
+            yield format_sse("error", {"detail": "Internal Server Error."})
+        finally:
+            ticket.release()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also releases the ticket if the stream never started
+        background=BackgroundTask(ticket.release)
+    )
@@ -1,7 +1,10 @@
 # File: backend/app/schemas.py
 
-from typing import List, Dict
-from pydantic import BaseModel
+from typing import List, Dict, Optional
+from pydantic import BaseModel, Field
+
+# Largest number of documents a query may retrieve
+MAX_QUERY_K = 50
 
 class TableRow(BaseModel):
     cells: List[str]
@@ -10,6 +13,7 @@ class Table(BaseModel):
     page_number: int
     table_number: int
     rows: List[TableRow]
+    char_offset: Optional[int] = None  # Position in the document text, for DOCX tables
 
 class TablesExtractionResults(BaseModel):
     tables: List[Table]
@@ -26,9 +30,26 @@ class UploadResponse(BaseModel):
     
     # Chunking results by method/library
     chunking: Dict[str, List[str]]  # e.g., {"text_chunker": [...], "batch_chunker": [...]}
+    chunk_counts: Optional[Dict[str, int]] = None  # e.g., {"text_chunker": 12, "batch_chunker": 3}
     
     # Entity extraction results by method/library
     entities: Dict[str, List[List[dict]]]  # e.g., {"spaCy": [...], "AnotherNER": [...]}
     
     # Tables extracted by different methods/libraries
     tables: Dict[str, List[Table]]  # e.g., {"Camelot": [...], "pdfplumber": [...], "Tabula-py": [...]}
+
+    # Content-derived ID of the document; use it to filter queries to this document
+    document_id: Optional[str] = None
+
+    # Per-stage timings of this upload, when requested with include_timings
+    timings: Optional[List[Dict]] = None  # e.g., [{"stage": "extraction", "duration_ms": 12.5, "items": 4096, ...}]
+
+class QueryRequest(BaseModel):
+    query: str
+    k: int = Field(5, ge=1, le=MAX_QUERY_K)  # Number of documents to retrieve
+
+    # Optional filters, pushed down into the vector index
+    document_id: Optional[str] = None
+    page_start: Optional[int] = None  # Chunks overlapping [page_start, page_end]
+    page_end: Optional[int] = None
+    modality: Optional[str] = None  # e.g., "text", "table", "image", "audio"
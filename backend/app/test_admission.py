@@ -0,0 +1,186 @@
+# File: backend/app/test_admission.py
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app import admission as admission_module
+from app.admission import AdmissionController, AdmissionTicket, CapacityPool
+
+def _controller(max_inflight_cost=10.0, max_queue=4, queue_timeout=5.0, rate=10.0, burst=100.0, client_limits=None):
+    pool = CapacityPool(max_inflight_cost, max_queue=max_queue, queue_timeout=queue_timeout)
+    return AdmissionController(rate=rate, burst=burst, client_limits=client_limits, pools={'upload': pool}), pool
+
+async def _admitted(controller, cost, client_id='client'):
+    ticket = await controller.enter(client_id, 'upload')
+    await ticket.charge(cost)
+    return ticket
+
+async def _waiting(controller, cost, client_id='client'):
+    # Starts a charge that has to queue, and lets it reach the queue
+    task = asyncio.ensure_future(_admitted(controller, cost, client_id))
+    await asyncio.sleep(0)
+    return task
+
+def test_requests_wait_in_fifo_order_until_capacity_frees():
+    async def scenario():
+        controller, pool = _controller(max_inflight_cost=10)
+        first = await _admitted(controller, 8)
+        large = await _waiting(controller, 5)
+        # Would fit, but must not overtake the large request
+        small = await _waiting(controller, 1)
+        assert not large.done() and not small.done()
+        assert pool.inflight_cost == 8
+
+        first.release()
+        large, small = await asyncio.wait_for(asyncio.gather(large, small), 1)
+        assert pool.inflight_cost == 6
+        large.release()
+        small.release()
+        assert pool.inflight_cost == 0
+
+    asyncio.run(scenario())
+
+def test_request_costing_more_than_the_budget_runs_alone():
+    async def scenario():
+        controller, pool = _controller(max_inflight_cost=10)
+        ticket = await _admitted(controller, 50)
+        assert pool.inflight_cost == 50
+        ticket.release()
+        assert pool.inflight_cost == 0
+
+    asyncio.run(scenario())
+
+def test_full_queue_is_rejected_with_503_and_refunded():
+    async def scenario():
+        controller, pool = _controller(max_inflight_cost=1, max_queue=1, queue_timeout=7)
+        first = await _admitted(controller, 1)
+        queued = await _waiting(controller, 1)
+        tokens = controller._buckets['client'][0]
+
+        with pytest.raises(HTTPException) as rejected:
+            await _admitted(controller, 1)
+        assert rejected.value.status_code == 503
+        assert rejected.value.headers == {"Retry-After": "7"}
+        assert controller._buckets['client'][0] == pytest.approx(tokens, abs=0.1)
+        assert len(pool._waiting) == 1
+
+        first.release()
+        (await queued).release()
+
+    asyncio.run(scenario())
+
+def test_queue_timeout_is_rejected_with_503_and_refunded():
+    async def scenario():
+        controller, pool = _controller(max_inflight_cost=1, queue_timeout=0.05, rate=0.001)
+        first = await _admitted(controller, 1)
+        tokens = controller._buckets['client'][0]
+
+        with pytest.raises(HTTPException) as rejected:
+            await _admitted(controller, 20)
+        assert rejected.value.status_code == 503
+        assert "Retry-After" in rejected.value.headers
+        # The shed request's cost is given back to the client
+        assert controller._buckets['client'][0] == pytest.approx(tokens, abs=0.1)
+        assert not pool._waiting
+        assert pool.inflight_cost == 1
+        first.release()
+
+    asyncio.run(scenario())
+
+def test_cancelled_waiter_does_not_leak_capacity():
+    async def scenario():
+        controller, pool = _controller(max_inflight_cost=1)
+        first = await _admitted(controller, 1)
+        queued = await _waiting(controller, 1)
+
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert not pool._waiting
+        assert pool.inflight_cost == 1
+        first.release()
+        assert pool.inflight_cost == 0
+
+    asyncio.run(scenario())
+
+def test_waiter_cancelled_after_its_grant_gives_the_capacity_back():
+    async def scenario():
+        controller, pool = _controller(max_inflight_cost=1)
+        first = await _admitted(controller, 1)
+        queued = await _waiting(controller, 1)
+        behind = await _waiting(controller, 1)
+
+        # Grants the queued request, which is cancelled before it resumes
+        first.release()
+        queued.cancel()
+        result, = await asyncio.gather(queued, return_exceptions=True)
+        # Either the grant is given back, or the request went ahead and releases it
+        if isinstance(result, AdmissionTicket):
+            assert pool.inflight_cost == 1
+            result.release()
+        behind = await asyncio.wait_for(behind, 1)
+        assert pool.inflight_cost == 1
+        behind.release()
+        assert pool.inflight_cost == 0
+
+    asyncio.run(scenario())
+
+def test_client_concurrency_limit_is_rejected_with_429():
+    async def scenario():
+        controller, _ = _controller(client_limits={'upload': 1})
+        ticket = await controller.enter('client', 'upload')
+
+        with pytest.raises(HTTPException) as rejected:
+            await controller.enter('client', 'upload')
+        assert rejected.value.status_code == 429
+        # Other clients and other kinds have their own slots
+        (await controller.enter('other', 'upload')).release()
+        (await controller.enter('client', 'query')).release()
+
+        ticket.release()
+        ticket.release()
+        (await controller.enter('client', 'upload')).release()
+        assert not controller._active
+
+    asyncio.run(scenario())
+
+def test_bucket_goes_into_debt_and_rejects_with_retry_after():
+    async def scenario():
+        controller, pool = _controller(max_inflight_cost=1000, rate=10, burst=100)
+        # A full bucket admits a request costing more than burst, and goes into debt
+        (await _admitted(controller, 150)).release()
+        assert controller._buckets['client'][0] == pytest.approx(-50, abs=0.1)
+
+        with pytest.raises(HTTPException) as rejected:
+            await _admitted(controller, 1)
+        assert rejected.value.status_code == 429
+        # 51 units short at 10 units per second
+        assert rejected.value.headers == {"Retry-After": "6"}
+        assert pool.inflight_cost == 0
+        # Other clients have their own bucket
+        (await _admitted(controller, 1, client_id='other')).release()
+
+    asyncio.run(scenario())
+
+def test_idle_full_buckets_are_pruned(monkeypatch):
+    monkeypatch.setattr(admission_module, '_MAX_TRACKED_CLIENTS', 2)
+
+    async def scenario():
+        controller, _ = _controller(rate=0.001)
+        (await _admitted(controller, 50, client_id='spender')).release()
+        (await controller.enter('idle', 'upload')).release()
+        controller._refill('idle')
+        controller._refill('new')
+        assert set(controller._buckets) == {'spender', 'new'}
+
+    asyncio.run(scenario())
+
+def test_disabled_controller_admits_everything():
+    async def scenario():
+        controller = AdmissionController(enabled=False, client_limits={'upload': 0})
+        ticket = await controller.enter('client', 'upload')
+        await ticket.charge(1e9)
+        ticket.release()
+
+    asyncio.run(scenario())
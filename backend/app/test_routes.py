@@ -0,0 +1,62 @@
+# File: backend/app/test_routes.py
+
+import io
+
+import pytest
+import spacy
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.schemas import Table, UploadResponse
+from src.utils.components import components
+from src.utils.config import Config
+
+docx = pytest.importorskip('docx')
+
+@pytest.fixture
+def client(monkeypatch):
+    """
+    A test client whose uploads are processed but not indexed, with a
+    sentence-splitting pipeline in place of the installed spaCy model.
+    """
+    monkeypatch.setattr(Config, 'INDEX_UPLOADS', False)
+    nlp = spacy.blank('en')
+    nlp.add_pipe('sentencizer')
+    components.override('nlp', nlp)
+    yield TestClient(app)
+    components.reset()
+
+def _docx_with_table() -> bytes:
+    document = docx.Document()
+    document.add_paragraph("Quarterly results were strong. Revenue grew in every region.")
+    table = document.add_table(rows=2, cols=2)
+    for row, cells in zip(table.rows, [("Region", "Revenue"), ("North", "120")]):
+        for cell, text in zip(row.cells, cells):
+            cell.text = text
+    document.add_paragraph("The outlook for next year is stable.")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def test_upload_payload_matches_the_response_model(client):
+    response = client.post(
+        "/api/upload",
+        params={"chunkers": "text_chunker"},
+        files={"file": (
+            "report.docx", _docx_with_table(),
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        )},
+    )
+
+    assert response.status_code == 200, response.text
+    payload = response.json()
+    # The route serializes the dict directly, so nothing but this test holds it to the schema
+    parsed = UploadResponse.model_validate(payload)
+    tables = [table for extracted in parsed.tables.values() for table in extracted]
+    assert [[row.cells for row in table.rows] for table in tables] == [[["Region", "Revenue"], ["North", "120"]]]
+    assert tables[0].char_offset is not None
+    # Every key the route sends is declared by the schema
+    assert set(payload) <= set(UploadResponse.model_fields)
+    for extracted in payload["tables"].values():
+        for table in extracted:
+            assert set(table) <= set(Table.model_fields)
@@ -1,56 +1,67 @@
 # File: backend/app/utils.py
 
 import logging
-import fitz  # PyMuPDF
-import pytesseract
-from PIL import Image
-import io
-import re
-from typing import List, Dict, Tuple
-import spacy
-import nltk
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 import unicodedata
-import camelot
-import pdfplumber
-import tabula
-import pandas as pd  # Required for Tabula-py
-import docx  # For DOCX table extraction
 
 from src.chunkers.text_chunker import chunk_text  # Ensure correct import path
 from src.chunkers.batch_chunker import batch_chunk_text  # Ensure correct import path
+from src.chunkers.records import strip_page_breaks
+from src.parsers.registry import parse_file
+from src.utils.components import components
+from src.utils.instrumentation import span
+from src.utils.summary import TextMetrics
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Table extraction libraries (Camelot, pdfplumber, Tabula-py, pandas) are imported
+# by the functions using them, and the spaCy model is the shared components.nlp,
+# so importing this module is cheap. src.utils.warmup preloads them at startup.
 
 # Initialize logger
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # Set to DEBUG for detailed logs
 
-# Create console handler with a higher log level
-ch = logging.StreamHandler()
-ch.setLevel(logging.DEBUG)  # Capture all logs at DEBUG level
+# ----------------------------
+# Table Extraction Functions
+# ----------------------------
 
-# Create formatter and add it to the handlers
-formatter = logging.Formatter('%(levelname)s:%(name)s:%(message)s')
-ch.setFormatter(formatter)
+def sanitize_table_frame(df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Normalizes a table DataFrame column by column: missing cells become empty
+    strings, all cells are stripped strings, and rows with only empty cells are dropped.
 
-# Add the handlers to the logger if not already added
-if not logger.handlers:
-    logger.addHandler(ch)
+    Args:
+        df (pd.DataFrame): Raw table as returned by an extractor.
 
-# Load spaCy model with error handling
-try:
-    # For entity extraction
-    nlp = spacy.load("en_core_web_lg")  # Upgraded to a larger model for better NER accuracy
-except OSError:
-    logger.info("Downloading spaCy 'en_core_web_lg' model...")
-    from spacy.cli import download
-    download("en_core_web_lg")
-    nlp = spacy.load("en_core_web_lg")
+    Returns:
+        pd.DataFrame: The sanitized table with a fresh positional index.
+    """
+    frame = df.astype(object).where(df.notna(), "").astype(str)
+    frame = frame.apply(lambda column: column.str.strip())
+    return frame[frame.ne("").any(axis=1)].reset_index(drop=True)
 
-# Download NLTK punkt tokenizer if not already downloaded
-nltk.download('punkt', quiet=True)
+def table_from_frame(df: "pd.DataFrame", page_number: int, table_number: int) -> Dict:
+    """
+    Builds a table dictionary from a DataFrame.
 
-# ----------------------------
-# Table Extraction Functions
-# ----------------------------
+    The rows are taken from the sanitized frame in one conversion, without
+    touching individual cells in Python.
+
+    Args:
+        df (pd.DataFrame): Raw table.
+        page_number (int): Page of the table (0 for documents without pages).
+        table_number (int): Number of the table.
+
+    Returns:
+        Dict: The table with page number, table number, and rows of cells.
+    """
+    frame = sanitize_table_frame(df)
+    return {
+        "page_number": int(page_number),
+        "table_number": table_number,
+        "rows": [{"cells": cells} for cells in frame.to_numpy().tolist()]
+    }
 
 def extract_tables_with_camelot(file_path: str) -> List[Dict]:
     """
@@ -65,6 +76,8 @@ def extract_tables_with_camelot(file_path: str) -> List[Dict]:
     logger.info(f"Extracting tables from PDF using Camelot: {file_path}")
     tables_data = []
     try:
+        import camelot
+
         # First attempt with 'lattice' flavor
         tables = camelot.read_pdf(file_path, pages='all', flavor='lattice')
         logger.info(f"Camelot found {tables.n} tables using 'lattice' flavor.")
@@ -76,23 +89,9 @@ def extract_tables_with_camelot(file_path: str) -> List[Dict]:
             logger.info(f"Camelot found {tables.n} tables using 'stream' flavor.")
 
         for table_num, table in enumerate(tables, 1):
-            df = table.df  # pandas DataFrame
-            logger.debug(f"Extracted Table {table_num} on Page {table.page}:\n{df}")
-            rows = []
-            for _, row in df.iterrows():
-                cells = row.tolist()
-                sanitized_cells = [cell.strip() if cell.strip() else "" for cell in cells]
-                rows.append({"cells": sanitized_cells})
-            table_dict = {
-                "page_number": table.page,  # Ensure this is always an integer
-                "table_number": table_num,
-                "rows": rows
-            }
-            tables_data.append(table_dict)
-            # Detailed logging of each table's content
-            logger.debug(f"Processed Table {table_num} on Page {table.page}:")
-            for row in rows:
-                logger.debug(f"Row: {row['cells']}")
+            # Camelot reports the page as a string
+            tables_data.append(table_from_frame(table.df, int(table.page), table_num))
+            logger.debug("Extracted table %d on page %s with shape %s", table_num, table.page, table.df.shape)
 
     except Exception as e:
         logger.error(f"Failed to extract tables with Camelot: {e}")
@@ -115,22 +114,15 @@ def extract_tables_with_pdfplumber(file_path: str) -> List[Dict]:
     logger.info(f"Extracting tables from PDF using pdfplumber: {file_path}")
     tables_data = []
     try:
+        import pandas as pd
+        import pdfplumber
+
         with pdfplumber.open(file_path) as pdf:
             for page_num, page in enumerate(pdf.pages, 1):
                 tables = page.extract_tables()
                 logger.info(f"pdfplumber - Page {page_num}: {len(tables)} tables found.")
                 for i, table in enumerate(tables, 1):
-                    # Ensure all cells are strings, replace None with empty string
-                    sanitized_table = [
-                        {"cells": [cell if cell is not None else "" for cell in row]}
-                        for row in table
-                    ]
-                    table_dict = {
-                        "page_number": page_num,  # Always an integer
-                        "table_number": i,
-                        "rows": sanitized_table
-                    }
-                    tables_data.append(table_dict)
+                    tables_data.append(table_from_frame(pd.DataFrame(table), page_num, i))
     except Exception as e:
         logger.error(f"Failed to extract tables with pdfplumber: {e}")
     return tables_data
@@ -148,6 +140,8 @@ def extract_tables_with_tabula(file_path: str) -> List[Dict]:
     logger.info(f"Extracting tables from PDF using Tabula-py: {file_path}")
     tables_data = []
     try:
+        import tabula
+
         # Get total number of pages
         info = tabula.environment_info()
         total_pages = info['number_of_pages']
@@ -156,59 +150,19 @@ def extract_tables_with_tabula(file_path: str) -> List[Dict]:
             tables = tabula.read_pdf(file_path, pages=page_num, multiple_tables=True, silent=True)
             logger.info(f"Tabula-py - Page {page_num}: {len(tables)} tables found.")
             for table_num, df in enumerate(tables, 1):
-                logger.debug(f"Extracted Table {table_num} on Page {page_num}:\n{df}")
-                rows = []
-                for _, row in df.iterrows():
-                    cells = row.tolist()
-                    sanitized_cells = [str(cell).strip() if pd.notna(cell) else "" for cell in cells]
-                    rows.append({"cells": sanitized_cells})
-                table_dict = {
-                    "page_number": page_num,
-                    "table_number": table_num,
-                    "rows": rows
-                }
-                tables_data.append(table_dict)
+                tables_data.append(table_from_frame(df, page_num, table_num))
+                logger.debug("Extracted table %d on page %d with shape %s", table_num, page_num, df.shape)
     except Exception as e:
         logger.error(f"Failed to extract tables with Tabula-py: {e}")
     return tables_data
 
-def extract_tables_with_python_docx(file_path: str) -> List[Dict]:
-    """
-    Extracts tables from a DOCX file using python-docx.
-
-    Args:
-        file_path (str): Path to the DOCX file.
-
-    Returns:
-        List[Dict]: A list of tables with table number and table data.
-    """
-    logger.info(f"Extracting tables from DOCX using python-docx: {file_path}")
-    tables_data = []
-    try:
-        doc = docx.Document(file_path)
-        for table_num, table in enumerate(doc.tables, 1):
-            rows = []
-            for row in table.rows:
-                cells = [cell.text.strip() if cell.text.strip() else "" for cell in row.cells]
-                if any(cell for cell in cells):
-                    rows.append({"cells": cells})
-            table_dict = {
-                "page_number": 0,  # DOCX doesn't have pages; set to 0 or another identifier
-                "table_number": table_num,
-                "rows": rows
-            }
-            tables_data.append(table_dict)
-    except Exception as e:
-        logger.error(f"Failed to extract tables from DOCX using python-docx: {e}")
-    return tables_data
-
 def extract_tables(file_path: str, file_type: str) -> Dict[str, List[Dict]]:
     """
     Extracts tables using multiple libraries/frameworks based on file type.
 
     Args:
         file_path (str): Path to the file.
-        file_type (str): Type of the file ('pdf' or 'docx').
+        file_type (str): Type of the file (e.g., 'pdf'). Other types get their tables from their parser.
 
     Returns:
         Dict[str, List[Dict]]: Dictionary containing tables extracted by each method.
@@ -216,25 +170,27 @@ def extract_tables(file_path: str, file_type: str) -> Dict[str, List[Dict]]:
     tables = {}
     if file_type == 'pdf':
         # Extract using Camelot
-        camelot_tables = extract_tables_with_camelot(file_path)
+        with span("tables.camelot") as table_span:
+            camelot_tables = extract_tables_with_camelot(file_path)
+            table_span.items = len(camelot_tables)
         if camelot_tables:
             tables['camelot'] = camelot_tables
 
         # Extract using pdfplumber
-        pdfplumber_tables = extract_tables_with_pdfplumber(file_path)
+        with span("tables.pdfplumber") as table_span:
+            pdfplumber_tables = extract_tables_with_pdfplumber(file_path)
+            table_span.items = len(pdfplumber_tables)
         if pdfplumber_tables:
             tables['pdfplumber'] = pdfplumber_tables
 
         # Extract using Tabula-py
-        tabula_tables = extract_tables_with_tabula(file_path)
+        with span("tables.tabula") as table_span:
+            tabula_tables = extract_tables_with_tabula(file_path)
+            table_span.items = len(tabula_tables)
         if tabula_tables:
             tables['tabula-py'] = tabula_tables
 
-    elif file_type == 'docx':
-        # Extract using python-docx
-        python_docx_tables = extract_tables_with_python_docx(file_path)
-        if python_docx_tables:
-            tables['python-docx'] = python_docx_tables
+    # DOCX and HTML tables come from their parsers, in the same pass as the text
 
     # Add more file types and extraction methods if needed
 
@@ -244,50 +200,58 @@ def extract_tables(file_path: str, file_type: str) -> Dict[str, List[Dict]]:
 # Text Extraction Functions
 # ----------------------------
 
-def extract_text_from_pdf(file_path: str) -> Tuple[str, Dict[str, List[Dict]]]:
+def extract_document(
+    file_path: str,
+    file_type: str,
+    metrics: Optional[TextMetrics] = None
+) -> Tuple[str, Dict[str, List[Dict]]]:
     """
-    Extracts text and tables from a PDF file using PyMuPDF and multiple table extraction libraries.
+    Extracts text and tables from a file through the parser registry.
+
+    Text comes from the registered parser for the file type (the single PDF
+    backend for PDFs); tables come from the table extractors of that type,
+    plus any tables the parser found itself (e.g., HTML tables).
 
     Args:
-        file_path (str): Path to the PDF file.
+        file_path (str): Path to the file.
+        file_type (str): File type as returned by detect_file_type.
+        metrics (TextMetrics, optional): Updated with the text as it is extracted
+            (page by page for streaming parsers), instead of rescanning it afterwards.
 
     Returns:
         Tuple[str, Dict[str, List[Dict]]]: Extracted text and dictionary of tables extracted by different libraries.
     """
-    logger.info(f"Extracting text from PDF: {file_path}")
-    text = ""
-    tables = {}
+    logger.info(f"Extracting text and tables from {file_type.upper()}: {file_path}")
     try:
-        with fitz.open(file_path) as doc:
-            for page_num, page in enumerate(doc, 1):
-                logger.info(f"Processing page {page_num}/{len(doc)}")
-                page_text = page.get_text()
-                if page_text.strip():
-                    # Text extracted successfully
-                    text += page_text + "\n"
-                else:
-                    # Fallback to OCR
-                    logger.info(f"No text found on page {page_num}, using OCR.")
-                    pix = page.get_pixmap()
-                    image_bytes = pix.tobytes("png")
-                    image = Image.open(io.BytesIO(image_bytes))
-                    # Preprocess image
-                    image = image.convert('L')  # Convert to grayscale
-                    image = image.resize((image.width * 2, image.height * 2), Image.ANTIALIAS)
-                    ocr_text = pytesseract.image_to_string(image, lang='eng', config='--psm 6')
-                    text += ocr_text + "\n"
-
-        # After extracting text, attempt to extract tables using multiple libraries
-        tables = extract_tables(file_path, file_type='pdf')
-
+        with span("extraction") as extraction_span:
+            parsed = parse_file(file_path, file_type, on_text=metrics.update if metrics is not None else None)
+            extraction_span.items = len(parsed.text)
+        tables = extract_tables(file_path, file_type)
+        if parsed.tables:
+            tables[parsed.tables_key or parsed.file_type] = parsed.tables
     except Exception as e:
-        logger.error(f"Failed to extract text from PDF: {e}")
+        logger.error(f"Failed to extract text from {file_type.upper()}: {e}")
         raise e
-    return text, tables
+    return parsed.text, tables
+
+def extract_text_from_pdf(file_path: str) -> Tuple[str, Dict[str, List[Dict]]]:
+    """
+    Extracts text and tables from a PDF file using the selected PDF backend and multiple table extraction libraries.
+
+    Every page's text is terminated by PAGE_BREAK (a form feed) so that chunk
+    page spans can be recovered from character offsets.
+
+    Args:
+        file_path (str): Path to the PDF file.
+
+    Returns:
+        Tuple[str, Dict[str, List[Dict]]]: Extracted text and dictionary of tables extracted by different libraries.
+    """
+    return extract_document(file_path, 'pdf')
 
 def extract_text_from_docx(file_path: str) -> Tuple[str, Dict[str, List[Dict]]]:
     """
-    Extracts text and tables from a DOCX file using python-docx.
+    Extracts text and tables from a DOCX file.
 
     Args:
         file_path (str): Path to the DOCX file.
@@ -295,18 +259,7 @@ def extract_text_from_docx(file_path: str) -> Tuple[str, Dict[str, List[Dict]]]:
     Returns:
         Tuple[str, Dict[str, List[Dict]]]: Extracted text and dictionary of tables extracted by different methods.
     """
-    logger.info(f"Extracting text and tables from DOCX: {file_path}")
-    text = ""
-    tables = {}
-    try:
-        doc = docx.Document(file_path)
-        text = '\n'.join([para.text for para in doc.paragraphs])
-        # Extract tables
-        tables = extract_tables(file_path, file_type='docx')
-    except Exception as e:
-        logger.error(f"Failed to extract text from DOCX: {e}")
-        raise e
-    return text, tables
+    return extract_document(file_path, 'docx')
 
 def extract_text_from_txt(file_path: str) -> Tuple[str, Dict[str, List[Dict]]]:
     """
@@ -318,43 +271,38 @@ def extract_text_from_txt(file_path: str) -> Tuple[str, Dict[str, List[Dict]]]:
     Returns:
         Tuple[str, Dict[str, List[Dict]]]: Extracted text and empty tables.
     """
-    logger.info(f"Extracting text from TXT: {file_path}")
-    text = ""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            text = f.read()
-    except Exception as e:
-        logger.error(f"Failed to extract text from TXT: {e}")
-        raise e
-    return text, {}
+    return extract_document(file_path, 'txt')
 
 # ----------------------------
 # Entity Extraction Function
 # ----------------------------
 
-def extract_entities_with_spacy(text: str) -> List[List[Dict]]:
+def extract_entities_with_spacy(text: str, chunks: Optional[List[str]] = None) -> List[List[Dict]]:
     """
     Extracts entities from text using spaCy.
 
     Args:
         text (str): The input text.
+        chunks (List[str], optional): The text's chunks from chunk_text, if already computed.
 
     Returns:
         List[List[Dict]]: A list where each element corresponds to a chunk and contains a list of entities.
     """
     logger.info("Extracting entities from chunks using spaCy...")
     # Assuming chunk_text is already implemented to return chunks
-    chunks = chunk_text(text, method='spacy')  # Adjust 'method' as needed
+    if chunks is None:
+        chunks = [strip_page_breaks(chunk) for chunk in chunk_text(text, method='spacy')]  # Adjust 'method' as needed
     entities_per_chunk = []
-    for idx, chunk in enumerate(chunks, 1):
-        logger.debug(f"Extracting entities from chunk {idx}/{len(chunks)} using spaCy.")
-        try:
-            doc = nlp(chunk)
-            entities = [{"text": ent.text, "label": ent.label_} for ent in doc.ents]
-            entities_per_chunk.append(entities)
-        except Exception as e:
-            logger.error(f"Failed to extract entities from chunk {idx}: {e}")
-            entities_per_chunk.append([])
+    with span("ner", items=len(chunks)):
+        for idx, chunk in enumerate(chunks, 1):
+            logger.debug("Extracting entities from chunk %d/%d using spaCy.", idx, len(chunks))
+            try:
+                doc = components.nlp(chunk)
+                entities = [{"text": ent.text, "label": ent.label_} for ent in doc.ents]
+                entities_per_chunk.append(entities)
+            except Exception as e:
+                logger.error(f"Failed to extract entities from chunk {idx}: {e}")
+                entities_per_chunk.append([])
     logger.info("Entity extraction with spaCy completed.")
     return entities_per_chunk
 
@@ -366,6 +314,9 @@ def compute_metrics(text: str, chunks: List[str]) -> Dict:
     """
     Computes various metrics based on the original text and its chunks.
 
+    The upload pipeline collects the same metrics with a TextMetrics during
+    extraction; this is for text that is already in memory.
+
     Args:
         text (str): The original extracted text.
         chunks (List[str]): The list of text chunks.
@@ -375,50 +326,7 @@ def compute_metrics(text: str, chunks: List[str]) -> Dict:
     """
     logger.info("Computing metrics...")
     try:
-        # Normalize newlines
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
-
-        # Number of lines (non-empty lines)
-        lines = text.split('\n')
-        num_lines = len([line for line in lines if line.strip()])
-
-        # Enhanced paragraph detection
-        # Split paragraphs on newlines followed by an uppercase letter
-        paragraph_pattern = re.compile(r'\n+(?=\s*[A-Z])')
-        paragraphs = paragraph_pattern.split(text.strip())
-        paragraphs = [para for para in paragraphs if para.strip()]
-        num_paragraphs = len(paragraphs)
-
-        # If no paragraphs detected, default to splitting on single newlines
-        if num_paragraphs <= 1:
-            paragraphs = [para for para in lines if para.strip()]
-            num_paragraphs = len(paragraphs)
-
-        # Number of words
-        num_words = len(text.split())
-
-        # Average words per paragraph
-        avg_words_per_paragraph = num_words / num_paragraphs if num_paragraphs else 0
-
-        # Average words per line
-        avg_words_per_line = num_words / num_lines if num_lines else 0
-
-        # Original content size in bytes
-        original_content_size = len(text.encode('utf-8'))
-
-        # Number of chunks
-        num_chunks = len(chunks)
-
-        metrics = {
-            "num_lines": num_lines,
-            "num_paragraphs": num_paragraphs,
-            "num_words": num_words,
-            "avg_words_per_paragraph": round(avg_words_per_paragraph, 2),
-            "avg_words_per_line": round(avg_words_per_line, 2),
-            "original_content_size": original_content_size,
-            "num_chunks": num_chunks
-        }
-
+        metrics = TextMetrics().update(text).result(num_chunks=len(chunks))
         logger.info(f"Metrics computed: {metrics}")
         return metrics
     except Exception as e:
@@ -0,0 +1,128 @@
+# File: backend/benchmarks/bench_async_pipeline.py
+#
+# Measures RAG pipeline latency under concurrent load against local stand-ins
+# (FakeChatModel, FakeEmbeddings and an in-memory Chroma collection).
+#
+# Usage (from the backend directory):
+#     python -m benchmarks.bench_async_pipeline --requests 200 --concurrency 16
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Dict, List
+
+from src.embedding.fake_embeddings import FakeEmbeddings
+from src.multimodal_llm.fake_llm import FakeChatModel
+from src.multimodal_llm.llm import generate_response, agenerate_response, agenerate_responses
+from src.utils.components import components
+from src.vector_db.vectordb import VectorDB
+
+WORDS = (
+    "revenue margin growth forecast quarter model network layer attention token "
+    "retrieval index vector chunk table image audio document policy contract"
+).split()
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Returns the pct-th percentile (nearest rank) of the values.
+    """
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def summarize(name: str, latencies: List[float], wall_time: float) -> Dict:
+    return {
+        "mode": name,
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / wall_time, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+    }
+
+def setup_stand_ins(num_docs: int, llm_latency: float, embed_latency: float):
+    """
+    Installs local stand-ins in the shared component container and loads a synthetic corpus.
+    """
+    rng = random.Random(0)
+    embeddings = FakeEmbeddings(latency=embed_latency)
+    vector_db = VectorDB(
+        "", f"bench_{uuid.uuid4().hex[:8]}", persist_directory=None, embeddings=embeddings
+    )
+    corpus = [' '.join(rng.choice(WORDS) for _ in range(60)) for _ in range(num_docs)]
+    vector_db.add_documents(None, corpus)
+    components.override('embeddings', embeddings)
+    components.override('vector_db', vector_db)
+    components.override('llm', FakeChatModel(first_token_delay=llm_latency))
+
+async def run_sync(queries: List[str], concurrency: int) -> List[float]:
+    # Mirrors a sync FastAPI route: each request occupies a worker thread end to end
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(query):
+        async with semaphore:
+            start = time.perf_counter()
+            await asyncio.to_thread(generate_response, query)
+            return time.perf_counter() - start
+
+    return await asyncio.gather(*[one(query) for query in queries])
+
+async def run_async(queries: List[str], concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(query):
+        async with semaphore:
+            start = time.perf_counter()
+            await agenerate_response(query)
+            return time.perf_counter() - start
+
+    return await asyncio.gather(*[one(query) for query in queries])
+
+async def run_batched(queries: List[str], concurrency: int, batch_size: int) -> List[float]:
+    semaphore = asyncio.Semaphore(max(1, concurrency // batch_size))
+    batches = [queries[i:i + batch_size] for i in range(0, len(queries), batch_size)]
+
+    async def one(batch):
+        async with semaphore:
+            start = time.perf_counter()
+            await agenerate_responses(batch)
+            # Every question in the batch observes the batch latency
+            return [time.perf_counter() - start] * len(batch)
+
+    results = await asyncio.gather(*[one(batch) for batch in batches])
+    return [latency for batch in results for latency in batch]
+
+async def main(args) -> List[Dict]:
+    setup_stand_ins(args.docs, args.llm_latency, args.embed_latency)
+    rng = random.Random(1)
+    queries = [' '.join(rng.choice(WORDS) for _ in range(6)) for _ in range(args.requests)]
+
+    report = []
+    for name, runner in (
+        ("sync", lambda: run_sync(queries, args.concurrency)),
+        ("async", lambda: run_async(queries, args.concurrency)),
+        ("async_batched", lambda: run_batched(queries, args.concurrency, args.batch_size)),
+    ):
+        start = time.perf_counter()
+        latencies = await runner()
+        report.append(summarize(name, latencies, time.perf_counter() - start))
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the RAG pipeline under concurrent load.")
+    parser.add_argument("--requests", type=int, default=200, help="Number of queries per mode.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Queries in flight at once.")
+    parser.add_argument("--batch-size", type=int, default=8, help="Questions per batched call.")
+    parser.add_argument("--docs", type=int, default=500, help="Synthetic documents in the index.")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Simulated LLM latency (s).")
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="Simulated embedding latency (s).")
+    parser.add_argument("--output", help="Optional path to write the JSON report.")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
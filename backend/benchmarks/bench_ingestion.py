@@ -0,0 +1,97 @@
+# File: backend/benchmarks/bench_ingestion.py
+#
+# Throughput of the ingestion hot paths on synthetic corpora.
+#
+# Usage (from the backend directory):
+#     python -m pytest benchmarks --corpus-size medium
+# Results are saved as JSON under .benchmarks/; compare against an earlier run with
+#     python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+
+import pytest
+
+from src.chunkers.batch_chunker import batch_chunk_text
+from src.chunkers.semantic_chunker import semantic_chunk
+from src.chunkers.strategies import ChunkingInput, registered_strategies, run_strategies
+from src.chunkers.text_chunker import chunk_text, clean_text, split_into_sentences
+from src.parsers.docx_parser import extract_docx
+from src.parsers.pdf_parser import PDF_BACKENDS, available_backends, extract_pdf_text
+
+def _record_throughput(benchmark, items: int, unit: str):
+    benchmark.extra_info["items"] = items
+    benchmark.extra_info["unit"] = unit
+    if benchmark.stats:
+        benchmark.extra_info[f"{unit}_per_second"] = round(items / benchmark.stats.stats.mean, 1)
+
+@pytest.mark.benchmark(group="text")
+def test_clean_text(benchmark, text_corpus):
+    cleaned = benchmark(clean_text, text_corpus)
+    assert cleaned
+    _record_throughput(benchmark, len(text_corpus.split()), "words")
+
+@pytest.mark.benchmark(group="text")
+def test_chunk_text(benchmark, text_corpus):
+    chunks = benchmark.pedantic(chunk_text, args=(text_corpus,), kwargs={"method": "spacy"}, rounds=3)
+    assert chunks
+    _record_throughput(benchmark, len(text_corpus.split()), "words")
+
+@pytest.mark.benchmark(group="text")
+def test_batch_chunk_text(benchmark, text_corpus):
+    chunks = benchmark(batch_chunk_text, text_corpus, 500)
+    assert chunks
+    _record_throughput(benchmark, len(text_corpus.split()), "words")
+
+@pytest.mark.benchmark(group="text")
+def test_semantic_chunk(benchmark, text_corpus, sentence_encoder):
+    # Sentence split included, as in test_chunk_text, so the two compare directly
+    chunks = benchmark.pedantic(
+        lambda: semantic_chunk(split_into_sentences(clean_text(text_corpus), method="spacy"), sentence_encoder), rounds=3
+    )
+    assert chunks
+    _record_throughput(benchmark, len(text_corpus.split()), "words")
+
+@pytest.mark.benchmark(group="text")
+def test_run_all_strategies(benchmark, text_corpus, sentence_encoder):
+    names = [strategy.name for strategy in registered_strategies()]
+    results = benchmark.pedantic(
+        lambda: run_strategies(ChunkingInput(text_corpus, sentence_method="spacy"), names), rounds=3
+    )
+    assert all(results[name] for name in names)
+    _record_throughput(benchmark, len(text_corpus.split()), "words")
+
+@pytest.mark.benchmark(group="text")
+def test_compute_metrics(benchmark, app_utils, text_corpus):
+    chunks = batch_chunk_text(text_corpus, 500)
+    metrics = benchmark(app_utils.compute_metrics, text_corpus, chunks)
+    assert metrics["num_words"] > 0
+    _record_throughput(benchmark, len(text_corpus.split()), "words")
+
+@pytest.mark.benchmark(group="ner")
+def test_extract_entities_with_spacy(benchmark, app_utils, text_corpus):
+    entities = benchmark.pedantic(app_utils.extract_entities_with_spacy, args=(text_corpus,), rounds=1)
+    assert entities
+    _record_throughput(benchmark, len(text_corpus.split()), "words")
+
+@pytest.mark.benchmark(group="extraction")
+@pytest.mark.parametrize("backend", list(PDF_BACKENDS))
+def test_extract_pdf_text(benchmark, pdf_corpus, corpus_size, backend):
+    if backend not in available_backends():
+        pytest.skip(f"PDF backend not installed: {backend}")
+    text = benchmark.pedantic(extract_pdf_text, args=(pdf_corpus, backend, False), rounds=3)
+    assert text.strip()
+    _record_throughput(benchmark, corpus_size["pdf_pages"], "pages")
+
+@pytest.mark.benchmark(group="extraction")
+def test_extract_docx(benchmark, docx_corpus, corpus_size):
+    text, tables = benchmark.pedantic(extract_docx, args=(docx_corpus,), rounds=3)
+    assert text and len(tables) == corpus_size["docx_tables"]
+    _record_throughput(benchmark, corpus_size["docx_paragraphs"], "paragraphs")
+
+@pytest.mark.benchmark(group="tables")
+@pytest.mark.parametrize("extractor", ["camelot", "pdfplumber", "tabula"])
+def test_extract_tables(benchmark, app_utils, pdf_corpus, corpus_size, extractor):
+    # The extractors import their library lazily and log failures, so check it is installed
+    pytest.importorskip(extractor)
+    extract = getattr(app_utils, f"extract_tables_with_{extractor}")
+    tables = benchmark.pedantic(extract, args=(pdf_corpus,), rounds=1)
+    assert tables
+    _record_throughput(benchmark, corpus_size["pdf_pages"], "pages")
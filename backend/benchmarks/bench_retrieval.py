@@ -0,0 +1,79 @@
+# File: backend/benchmarks/bench_retrieval.py
+#
+# Query throughput of the vector, lexical and fused retrieval paths against an
+# in-memory collection embedded with FakeEmbeddings.
+
+import itertools
+import uuid
+
+import pytest
+
+from benchmarks.corpus import synthetic_queries, synthetic_text
+from src.retrieval.retriever import fuse_results, retrieve_documents
+from src.vector_db.filters import build_filter
+
+QUERIES = synthetic_queries(200)
+
+@pytest.fixture(scope="module")
+def hierarchical_index(corpus_size, stand_ins):
+    """
+    Child chunks of a synthetic document in an in-memory collection, and their parents in an in-memory doc store.
+    """
+    from src.chunkers.hierarchical import build_parent_child_records
+    from src.chunkers.strategies import ChunkingInput
+    from src.vector_db.doc_store import DocStore
+    from src.vector_db.vectordb import VectorDB
+
+    chunking_input = ChunkingInput(synthetic_text(corpus_size["index_chunks"] * 60, seed=6))
+    parents, children = build_parent_child_records(chunking_input.sentences, chunking_input.cleaned_text, "doc0")
+    doc_store = DocStore(":memory:")
+    doc_store.put(parents)
+    db = VectorDB("", f"bench_{uuid.uuid4().hex[:8]}", persist_directory=None, embeddings=stand_ins)
+    for start in range(0, len(children), 1000):
+        db.add_records(children[start:start + 1000])
+    return db, doc_store
+
+def _cycle():
+    queries = itertools.cycle(QUERIES)
+    return lambda: next(queries)
+
+@pytest.mark.benchmark(group="retrieval")
+def test_similarity_search(benchmark, vector_db):
+    next_query = _cycle()
+    results = benchmark(lambda: vector_db.similarity_search(next_query(), k=5))
+    assert len(results) == 5
+    benchmark.extra_info["index_size"] = len(vector_db.lexical_index)
+
+@pytest.mark.benchmark(group="retrieval")
+def test_filtered_similarity_search(benchmark, vector_db):
+    next_query = _cycle()
+    where = build_filter(document_id="doc3", page_range=(1, 50))
+    results = benchmark(lambda: vector_db.similarity_search(next_query(), k=5, filter=where))
+    assert all(document.metadata["document_id"] == "doc3" for document in results)
+
+@pytest.mark.benchmark(group="retrieval")
+def test_lexical_search(benchmark, vector_db):
+    next_query = _cycle()
+    results = benchmark(lambda: vector_db.lexical_search(next_query(), k=5))
+    assert results
+
+@pytest.mark.benchmark(group="retrieval")
+def test_hybrid_search(benchmark, vector_db):
+    next_query = _cycle()
+
+    def hybrid():
+        query = next_query()
+        return fuse_results(
+            [vector_db.similarity_search(query, k=20), vector_db.lexical_search(query, k=20)], k=5
+        )
+
+    results = benchmark(hybrid)
+    assert len(results) == 5
+
+@pytest.mark.benchmark(group="retrieval")
+def test_small_to_big_search(benchmark, hierarchical_index):
+    db, doc_store = hierarchical_index
+    next_query = _cycle()
+    documents = benchmark(lambda: retrieve_documents(next_query(), db, k=5, doc_store=doc_store))
+    assert all(document["metadata"]["extractor"] == "parent" for document in documents)
+    benchmark.extra_info["parents"] = len(doc_store)
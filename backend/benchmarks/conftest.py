@@ -0,0 +1,105 @@
+# File: backend/benchmarks/conftest.py
+
+import os
+import uuid
+
+import pytest
+
+from benchmarks.corpus import synthetic_text, write_docx, write_pdf
+from src.utils.components import components
+
+# Corpus dimensions per --corpus-size
+CORPUS_SIZES = {
+    "small": {"words": 5_000, "pdf_pages": 5, "docx_paragraphs": 100, "docx_tables": 5, "index_chunks": 500},
+    "medium": {"words": 50_000, "pdf_pages": 25, "docx_paragraphs": 1_000, "docx_tables": 20, "index_chunks": 5_000},
+    "large": {"words": 200_000, "pdf_pages": 100, "docx_paragraphs": 5_000, "docx_tables": 50, "index_chunks": 20_000},
+}
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--corpus-size",
+        choices=sorted(CORPUS_SIZES),
+        default=os.getenv("BENCH_CORPUS_SIZE", "small"),
+        help="Size of the synthetic corpora (default: small, or BENCH_CORPUS_SIZE).",
+    )
+
+@pytest.fixture(scope="session")
+def corpus_size(request):
+    return CORPUS_SIZES[request.config.getoption("--corpus-size")]
+
+@pytest.fixture(scope="session", autouse=True)
+def stand_ins():
+    """
+    Replaces every networked component (OpenAI LLM and embeddings) with a local fake.
+    """
+    from src.embedding.fake_embeddings import FakeEmbeddings
+    from src.embedding.instrumented_embeddings import InstrumentedEmbeddings
+    from src.multimodal_llm.fake_llm import FakeChatModel
+
+    embeddings = InstrumentedEmbeddings(FakeEmbeddings())
+    components.override('embeddings', embeddings)
+    components.override('llm', FakeChatModel())
+    yield embeddings
+    components.reset()
+
+@pytest.fixture(scope="session")
+def sentence_encoder(stand_ins):
+    """
+    The configured sentence encoder, or the fake embeddings when the spaCy model has no word vectors.
+    """
+    from src.chunkers.semantic_chunker import EmbeddingsEncoder
+
+    try:
+        return components.get('sentence_encoder')
+    except ValueError:
+        encoder = EmbeddingsEncoder(stand_ins)
+        components.override('sentence_encoder', encoder)
+        return encoder
+
+@pytest.fixture(scope="session")
+def text_corpus(corpus_size):
+    return synthetic_text(corpus_size["words"])
+
+@pytest.fixture(scope="session")
+def pdf_corpus(corpus_size, tmp_path_factory):
+    pytest.importorskip("fitz")
+    path = tmp_path_factory.mktemp("corpus") / "corpus.pdf"
+    return write_pdf(str(path), num_pages=corpus_size["pdf_pages"])
+
+@pytest.fixture(scope="session")
+def docx_corpus(corpus_size, tmp_path_factory):
+    pytest.importorskip("docx")
+    path = tmp_path_factory.mktemp("corpus") / "corpus.docx"
+    return write_docx(str(path), num_paragraphs=corpus_size["docx_paragraphs"], num_tables=corpus_size["docx_tables"])
+
+@pytest.fixture(scope="session")
+def app_utils():
+    # The spaCy model and the table extraction libraries load on first use
+    return pytest.importorskip("app.utils")
+
+@pytest.fixture(scope="session")
+def vector_db(corpus_size, stand_ins):
+    """
+    An in-memory collection holding index_chunks synthetic chunk records across ten documents.
+    """
+    from src.chunkers.records import ChunkRecord
+    from src.vector_db.vectordb import VectorDB
+
+    db = VectorDB("", f"bench_{uuid.uuid4().hex[:8]}", persist_directory=None, embeddings=stand_ins)
+    text = synthetic_text(corpus_size["index_chunks"] * 60, seed=2)
+    words = text.split()
+    records = [
+        ChunkRecord(
+            text=" ".join(words[start:start + 60]),
+            document_id=f"doc{index % 10}",
+            chunk_index=index,
+            modality='text',
+            page_start=index // 10 + 1,
+            page_end=index // 10 + 1,
+        )
+        for index, start in enumerate(range(0, len(words) - 60, 60))
+    ][:corpus_size["index_chunks"]]
+    for start in range(0, len(records), 1000):
+        db.add_records(records[start:start + 1000])
+    components.override('vector_db', db)
+    return db
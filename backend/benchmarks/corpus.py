@@ -0,0 +1,139 @@
+# File: backend/benchmarks/corpus.py
+#
+# Deterministic synthetic corpora for the benchmarks: prose with the
+# extraction artifacts clean_text handles, and PDF/DOCX files with ruled tables.
+
+import random
+from typing import List
+
+WORDS = (
+    "revenue margin growth forecast quarter model network layer attention token "
+    "retrieval index vector chunk table image audio document policy contract "
+    "customer supplier invoice payment region market segment product service "
+    "analysis report summary result method dataset training inference latency"
+).split()
+
+NAMES = ("Alice Johnson", "Acme Corporation", "Berlin", "Microsoft", "Paris", "Robert Smith", "Tokyo")
+
+# Artifacts typical of PDF text extraction, exercised by clean_text
+ARTIFACTS = ("infor- mation", "ï¬\x81nancial", "â€™s", "http: //example.com/report", "co-\noperation")
+
+def synthetic_sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 24))]
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), rng.choice(NAMES))
+    if rng.random() < 0.1:
+        words.insert(rng.randrange(len(words)), rng.choice(ARTIFACTS))
+    return " ".join(words).capitalize() + "."
+
+def synthetic_text(num_words: int, seed: int = 0) -> str:
+    """
+    Generates prose of roughly num_words words, in paragraphs of 3-8 sentences
+    with occasional hard line breaks inside sentences.
+
+    Args:
+        num_words (int): Approximate number of words.
+        seed (int): Random seed; the same seed always gives the same text.
+
+    Returns:
+        str: The text.
+    """
+    rng = random.Random(seed)
+    paragraphs = []
+    words = 0
+    while words < num_words:
+        sentences = [synthetic_sentence(rng) for _ in range(rng.randint(3, 8))]
+        paragraph = " ".join(sentences)
+        if rng.random() < 0.3:
+            # Hard-wrapped paragraph, as extracted from a PDF column
+            paragraph = "\n".join(paragraph[i:i + 80] for i in range(0, len(paragraph), 80))
+        paragraphs.append(paragraph)
+        words += len(paragraph.split())
+    return "\n\n".join(paragraphs)
+
+def synthetic_table(rng: random.Random, num_rows: int, num_columns: int) -> List[List[str]]:
+    header = [f"{rng.choice(WORDS).capitalize()} {index + 1}" for index in range(num_columns)]
+    rows = [
+        [rng.choice(WORDS) if column == 0 else f"{rng.uniform(0, 1000):.2f}" for column in range(num_columns)]
+        for _ in range(num_rows)
+    ]
+    return [header] + rows
+
+def synthetic_queries(num_queries: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))) for _ in range(num_queries)]
+
+def write_pdf(path: str, num_pages: int, words_per_page: int = 300, tables_per_page: int = 1, seed: int = 0) -> str:
+    """
+    Writes a PDF with a text layer and ruled tables, detectable by Camelot
+    (lattice), pdfplumber and Tabula.
+
+    Args:
+        path (str): Output path.
+        num_pages (int): Number of pages.
+        words_per_page (int): Approximate words of prose per page.
+        tables_per_page (int): Ruled tables drawn below the prose on each page (0-2).
+        seed (int): Random seed.
+
+    Returns:
+        str: The output path.
+    """
+    import fitz  # PyMuPDF
+
+    rng = random.Random(seed)
+    with fitz.open() as doc:
+        for page_index in range(num_pages):
+            page = doc.new_page(width=595, height=842)  # A4
+            text = synthetic_text(words_per_page, seed=seed + page_index)
+            page.insert_textbox(fitz.Rect(50, 50, 545, 420), " ".join(text.split()), fontsize=8)
+            for table_index in range(min(tables_per_page, 2)):
+                top = 440 + table_index * 190
+                _draw_table(page, synthetic_table(rng, num_rows=8, num_columns=4), left=50, top=top)
+        doc.save(path)
+    return path
+
+def _draw_table(page, rows: List[List[str]], left: float, top: float, cell_width: float = 120, cell_height: float = 18):
+    import fitz  # PyMuPDF
+
+    bottom = top + cell_height * len(rows)
+    right = left + cell_width * len(rows[0])
+    for row_index in range(len(rows) + 1):
+        y = top + row_index * cell_height
+        page.draw_line(fitz.Point(left, y), fitz.Point(right, y))
+    for column_index in range(len(rows[0]) + 1):
+        x = left + column_index * cell_width
+        page.draw_line(fitz.Point(x, top), fitz.Point(x, bottom))
+    for row_index, row in enumerate(rows):
+        for column_index, cell in enumerate(row):
+            page.insert_text(
+                fitz.Point(left + column_index * cell_width + 4, top + row_index * cell_height + 12), cell, fontsize=8
+            )
+
+def write_docx(path: str, num_paragraphs: int, num_tables: int = 5, seed: int = 0) -> str:
+    """
+    Writes a DOCX with prose paragraphs and tables spread through the body.
+
+    Args:
+        path (str): Output path.
+        num_paragraphs (int): Number of paragraphs.
+        num_tables (int): Number of tables, inserted at even intervals.
+        seed (int): Random seed.
+
+    Returns:
+        str: The output path.
+    """
+    import docx
+
+    rng = random.Random(seed)
+    document = docx.Document()
+    table_every = max(1, num_paragraphs // max(1, num_tables))
+    for index in range(num_paragraphs):
+        document.add_paragraph(" ".join(synthetic_sentence(rng) for _ in range(rng.randint(2, 6))))
+        if num_tables and (index + 1) % table_every == 0 and len(document.tables) < num_tables:
+            rows = synthetic_table(rng, num_rows=10, num_columns=4)
+            table = document.add_table(rows=len(rows), cols=len(rows[0]))
+            for row_cells, values in zip(table.rows, rows):
+                for cell, value in zip(row_cells.cells, values):
+                    cell.text = value
+    document.save(path)
+    return path
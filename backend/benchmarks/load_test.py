@@ -0,0 +1,257 @@
+# File: backend/benchmarks/load_test.py
+#
+# Drives the FastAPI app with a mix of uploads and streaming queries and reports
+# throughput, latency percentiles and event-loop lag, to size workers and to
+# catch handlers that block the event loop.
+#
+# By default the app runs in-process through httpx's ASGI transport, with
+# FakeChatModel, FakeEmbeddings and an in-memory collection in place of the
+# OpenAI components; the event-loop lag is then the app's own loop. With --url
+# the harness targets a running server instead (e.g. uvicorn app.main:app), and
+# the lag reported is only the harness's.
+#
+# Usage (from the backend directory):
+#     python -m benchmarks.load_test --requests 300 --concurrency 16 --upload-ratio 0.2
+#     python -m benchmarks.load_test --url http://127.0.0.1:8000 --requests 300
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_async_pipeline import percentile
+from benchmarks.corpus import synthetic_queries, synthetic_text
+from src.utils.config import Config
+
+# ----------------------------
+# Stand-ins
+# ----------------------------
+
+def setup_stand_ins(
+    llm_latency: float, token_delay: float, embed_latency: float, index_docs: int, index_uploads: bool,
+    embed_batching: bool = False
+):
+    """
+    Installs local stand-ins in the shared component container and loads a synthetic corpus.
+    """
+    from src.embedding.fake_embeddings import FakeEmbeddings
+    from src.embedding.instrumented_embeddings import InstrumentedEmbeddings
+    from src.multimodal_llm.fake_llm import FakeChatModel
+    from src.utils.components import components
+    from src.vector_db.vectordb import VectorDB
+
+    client = FakeEmbeddings(latency=embed_latency)
+    if embed_batching:
+        from src.embedding.batching_embeddings import BatchingEmbeddings
+        client = BatchingEmbeddings(
+            client, max_batch_size=Config.EMBED_BATCH_MAX_ITEMS, max_wait_ms=Config.EMBED_BATCH_WAIT_MS,
+            max_concurrency=Config.EMBED_BATCH_CONCURRENCY
+        )
+    embeddings = InstrumentedEmbeddings(client)
+    vector_db = VectorDB(
+        "", f"load_{uuid.uuid4().hex[:8]}", persist_directory=None, embeddings=embeddings
+    )
+    words = synthetic_text(index_docs * 60, seed=2).split()
+    vector_db.add_documents(None, [' '.join(words[i:i + 60]) for i in range(0, len(words), 60)])
+    components.override('embeddings', embeddings)
+    components.override('vector_db', vector_db)
+    components.override('llm', FakeChatModel(first_token_delay=llm_latency, token_delay=token_delay))
+    Config.INDEX_UPLOADS = index_uploads
+
+# ----------------------------
+# Event Loop Lag
+# ----------------------------
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.01):
+        """
+        Measures event-loop lag: how much later than scheduled a periodic timer fires.
+
+        Args:
+            interval (float): Seconds between samples.
+        """
+        self.interval = interval
+        self.lags: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+# ----------------------------
+# Operations
+# ----------------------------
+
+async def do_upload(client: httpx.AsyncClient, text: str, request_number: int, headers: Dict) -> Dict:
+    files = {"file": (f"load_{request_number}_{uuid.uuid4().hex[:6]}.txt", text.encode('utf-8'), "text/plain")}
+    response = await client.post("/api/upload", files=files, headers=headers)
+    return {"status": response.status_code}
+
+async def do_query(client: httpx.AsyncClient, query: str, k: int, headers: Dict) -> Dict:
+    start = time.perf_counter()
+    first_token = None
+    async with client.stream("POST", "/api/query", json={"query": query, "k": k}, headers=headers) as response:
+        # The ASGI transport delivers the body only once the handler finishes, so
+        # time to first token is only meaningful with --url
+        async for line in response.aiter_lines():
+            if first_token is None and line == "event: token":
+                first_token = time.perf_counter() - start
+            if line == "event: error":
+                return {"status": 500, "first_token": first_token}
+    return {"status": response.status_code, "first_token": first_token}
+
+def build_workload(args, num_requests: int, seed: int) -> List[Dict]:
+    """
+    Draws the sequence of operations: uploads of the configured sizes, in the
+    configured proportion, interleaved with queries, spread over args.clients clients.
+    """
+    rng = random.Random(seed)
+    sizes = [int(size) for size in args.upload_words.split(',')]
+    texts = {size: synthetic_text(size, seed=size) for size in sizes}
+    queries = synthetic_queries(max(1, num_requests), seed=seed)
+    workload = []
+    for number in range(num_requests):
+        if rng.random() < args.upload_ratio:
+            size = rng.choice(sizes)
+            workload.append({"kind": f"upload_{size}w", "text": texts[size], "number": number})
+        else:
+            workload.append({"kind": "query", "query": queries[number]})
+        workload[-1]["client"] = f"load-client-{number % args.clients}"
+    return workload
+
+async def run_load(client: httpx.AsyncClient, workload: List[Dict], concurrency: int, k: int) -> List[Dict]:
+    queue: asyncio.Queue = asyncio.Queue()
+    for operation in workload:
+        queue.put_nowait(operation)
+    samples = []
+
+    async def worker():
+        while not queue.empty():
+            operation = queue.get_nowait()
+            start = time.perf_counter()
+            headers = {Config.ADMISSION_CLIENT_HEADER: operation["client"]}
+            try:
+                if operation["kind"] == "query":
+                    result = await do_query(client, operation["query"], k, headers)
+                else:
+                    result = await do_upload(client, operation["text"], operation["number"], headers)
+            except Exception as e:
+                result = {"status": 0, "error": str(e)}
+            result.update(kind=operation["kind"], latency=time.perf_counter() - start)
+            samples.append(result)
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return samples
+
+# ----------------------------
+# Report
+# ----------------------------
+
+def _latency_stats(values: List[float]) -> Dict:
+    if not values:
+        return {}
+    return {
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(max(values) * 1000, 2),
+    }
+
+def summarize(samples: List[Dict], wall_time: float, lags: List[float]) -> Dict:
+    report = {
+        "requests": len(samples),
+        "wall_time_s": round(wall_time, 2),
+        "throughput_rps": round(len(samples) / wall_time, 2),
+        "errors": sum(1 for sample in samples if not 200 <= sample["status"] < 300),
+        # Turned away by admission control; also counted as errors
+        "rejected": sum(1 for sample in samples if sample["status"] in (429, 503)),
+        "latency": _latency_stats([sample["latency"] for sample in samples]),
+        "event_loop_lag": _latency_stats(lags),
+        "operations": {},
+    }
+    for kind in sorted({sample["kind"] for sample in samples}):
+        kind_samples = [sample for sample in samples if sample["kind"] == kind]
+        summary = {
+            "requests": len(kind_samples),
+            "throughput_rps": round(len(kind_samples) / wall_time, 2),
+            "errors": sum(1 for sample in kind_samples if not 200 <= sample["status"] < 300),
+            **_latency_stats([sample["latency"] for sample in kind_samples]),
+        }
+        first_tokens = [sample["first_token"] for sample in kind_samples if sample.get("first_token") is not None]
+        if first_tokens:
+            summary["first_token"] = _latency_stats(first_tokens)
+        report["operations"][kind] = summary
+    return report
+
+async def main(args) -> Dict:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        setup_stand_ins(
+            args.llm_latency, args.token_delay, args.embed_latency, args.docs, args.index_uploads, args.embed_batching
+        )
+        from app.admission import admission
+        from app.main import app
+        admission.enabled = not args.no_admission
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout
+        )
+
+    workload = build_workload(args, args.requests, args.seed)
+    monitor = LoopLagMonitor()
+    async with client:
+        if args.warmup:
+            # First requests pay for lazy component and model loading
+            await run_load(client, build_workload(args, args.warmup, args.seed + 1), 1, args.k)
+        monitor.start()
+        start = time.perf_counter()
+        samples = await run_load(client, workload, args.concurrency, args.k)
+        wall_time = time.perf_counter() - start
+        await monitor.stop()
+    return summarize(samples, wall_time, monitor.lags)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the API with mixed uploads and queries.")
+    parser.add_argument("--url", help="Base URL of a running server. Defaults to driving the app in-process.")
+    parser.add_argument("--requests", type=int, default=200, help="Total number of requests.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight at once.")
+    parser.add_argument("--upload-ratio", type=float, default=0.2, help="Fraction of requests that are uploads.")
+    parser.add_argument("--upload-words", default="500,5000,50000", help="Comma-separated upload sizes in words.")
+    parser.add_argument("--clients", type=int, default=8, help="Distinct client IDs the requests are spread over.")
+    parser.add_argument("--no-admission", action="store_true", help="Disable admission control (in-process only).")
+    parser.add_argument("--k", type=int, default=5, help="Documents retrieved per query.")
+    parser.add_argument("--warmup", type=int, default=4, help="Sequential requests sent before measuring.")
+    parser.add_argument("--docs", type=int, default=500, help="Synthetic documents in the index (in-process only).")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Simulated time to first token (s).")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Simulated delay between tokens (s).")
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="Simulated embedding latency (s).")
+    parser.add_argument("--embed-batching", action="store_true", help="Coalesce concurrent embedding calls (in-process only).")
+    parser.add_argument("--index-uploads", action="store_true", help="Index uploaded chunks (in-process only).")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-request timeout (s).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the request mix.")
+    parser.add_argument("--output", help="Optional path to write the JSON report.")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,170 @@
+# File: backend/benchmarks/worker_memory.py
+#
+# Measures the memory of N worker processes in two serving modes:
+#   - isolated: every worker imports and loads everything itself (uvicorn --workers N)
+#   - preload:  a parent loads the fork-safe components once, freezes the heap and
+#               forks the workers (gunicorn -c gunicorn.conf.py, see preload_for_fork)
+#
+# Each worker serves a few requests' worth of work first, so the report includes
+# the pages that get copied in use. Per process it reads /proc/<pid>/smaps_rollup:
+#   rss - resident memory, shared pages counted in full
+#   pss - proportional share: shared pages divided among the processes sharing them
+#   uss - private pages, freed if the process exits
+# The total PSS of all processes (parent included) is the memory the node really
+# spends. Linux only.
+#
+# Usage (from the backend directory):
+#     python -m benchmarks.worker_memory --workers 4 --components nlp,lexical_index
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List
+
+# Kept light: in isolated mode the workers fork from this process before loading anything
+
+def read_memory(pid: int = None) -> Dict[str, float]:
+    """
+    Returns the rss, pss and uss of a process in MiB.
+    """
+    fields = {}
+    with open(f"/proc/{pid or 'self'}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        "rss_mib": round(fields["Rss"] / 1024, 1),
+        "pss_mib": round(fields["Pss"] / 1024, 1),
+        "uss_mib": round((fields["Private_Clean"] + fields["Private_Dirty"]) / 1024, 1),
+    }
+
+def setup_stand_ins(lexical_docs: int):
+    """
+    Replaces the lexical_index factory with one indexing a synthetic corpus, so
+    the measurement needs no persisted collection.
+    """
+    from benchmarks.corpus import synthetic_text
+    from src.retrieval.lexical import BM25Index
+    from src.utils.components import components
+
+    def build_lexical_index(container):
+        index = BM25Index()
+        words = synthetic_text(lexical_docs * 80, seed=3).split()
+        texts = [' '.join(words[i:i + 80]) for i in range(0, len(words), 80)]
+        index.add([f"doc{i}" for i in range(len(texts))], texts, [{"document_id": f"doc{i % 50}"} for i in range(len(texts))])
+        return index
+
+    components.register('lexical_index', build_lexical_index)
+
+def serve(component_names: List[str], requests: int):
+    """
+    Does a few requests' worth of work with the loaded components.
+    """
+    from benchmarks.corpus import synthetic_queries, synthetic_text
+    from src.utils.components import components
+
+    text = synthetic_text(2000, seed=4)
+    for query in synthetic_queries(requests, seed=5):
+        if 'nlp' in component_names:
+            components.nlp(text)
+        if 'lexical_index' in component_names:
+            components.get('lexical_index').search(query, k=5)
+
+def run_workers(args, preload: bool) -> Dict:
+    from src.utils.warmup import preload_for_fork, warmup
+
+    modules = [module for module in args.modules.split(',') if module]
+    component_names = [name for name in args.components.split(',') if name]
+    if preload:
+        preload_for_fork(modules, component_names)
+
+    # Workers report once loaded and served, then stay alive until all are
+    # measured, so that their shared pages are counted while shared
+    ready_read, ready_write = os.pipe()
+    release_read, release_write = os.pipe()
+    pids = []
+    for _ in range(args.workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            os.close(release_write)
+            try:
+                warmup(modules, component_names)
+                serve(component_names, args.requests)
+            finally:
+                os.write(ready_write, b'.')
+                os.read(release_read, 1)
+                os._exit(0)
+        pids.append(pid)
+    os.close(ready_write)
+    os.close(release_read)
+    for _ in pids:
+        os.read(ready_read, 1)
+
+    workers = [read_memory(pid) for pid in pids]
+    parent = read_memory()
+    os.write(release_write, b'.' * len(pids))
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    def mean(key):
+        return round(sum(worker[key] for worker in workers) / len(workers), 1)
+
+    return {
+        "workers": len(workers),
+        "per_worker": {key: mean(key) for key in ("rss_mib", "pss_mib", "uss_mib")},
+        "parent_pss_mib": parent["pss_mib"] if preload else 0.0,
+        "total_pss_mib": round(sum(worker["pss_mib"] for worker in workers) + (parent["pss_mib"] if preload else 0.0), 1),
+    }
+
+def run_mode(args, mode: str) -> Dict:
+    """
+    Measures one mode in a fresh child, so that both start from a bare interpreter.
+    """
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        try:
+            setup_stand_ins(args.lexical_docs)
+            result = run_workers(args, preload=mode == 'preload')
+        except Exception as e:
+            result = {"error": str(e)}
+        os.write(write_end, json.dumps(result).encode())
+        os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end) as f:
+        output = f.read()
+    os.waitpid(pid, 0)
+    return json.loads(output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare worker memory with and without preloading.")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes per mode.")
+    parser.add_argument("--components", default="nlp,lexical_index", help="Comma-separated components to load.")
+    parser.add_argument("--modules", default="pandas,fitz,pdfplumber", help="Comma-separated modules to import.")
+    parser.add_argument("--lexical-docs", type=int, default=20000, help="Synthetic documents in the lexical index.")
+    parser.add_argument("--requests", type=int, default=20, help="Queries served by each worker before measuring.")
+    parser.add_argument("--output", help="Optional path to write the JSON report.")
+    args = parser.parse_args()
+
+    if not sys.platform.startswith('linux'):
+        sys.exit("worker_memory needs Linux (/proc/<pid>/smaps_rollup).")
+
+    from src.utils.logger import configure_logging
+    configure_logging(level='WARNING')
+
+    report = {mode: run_mode(args, mode) for mode in ('isolated', 'preload')}
+    if "error" not in report["isolated"] and "error" not in report["preload"]:
+        isolated, preload = report["isolated"]["per_worker"], report["preload"]["per_worker"]
+        report["per_worker_pss_reduction_percent"] = round(100 * (1 - preload["pss_mib"] / isolated["pss_mib"]), 1)
+        report["per_worker_uss_reduction_percent"] = round(100 * (1 - preload["uss_mib"] / isolated["uss_mib"]), 1)
+        report["total_pss_reduction_percent"] = round(
+            100 * (1 - report["preload"]["total_pss_mib"] / report["isolated"]["total_pss_mib"]), 1
+        )
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
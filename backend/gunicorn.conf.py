@@ -0,0 +1,35 @@
+# backend/gunicorn.conf.py
+#
+# Production server: gunicorn managing uvicorn workers.
+#     gunicorn -c gunicorn.conf.py app.main:app
+#
+# With PRELOAD_APP (the default) the app is imported and warmed up once in the
+# master, and the workers fork from it: they start in milliseconds and share the
+# loaded libraries, models and lexical index copy-on-write instead of each
+# loading their own (see src.utils.warmup.preload_for_fork). Add lexical_index
+# to WARMUP_COMPONENTS to share it too; each worker then adds the documents the
+# other workers index to its copy before searching it (see
+# VectorDB._sync_lexical_index). Measure with benchmarks/worker_memory.py.
+#
+# Logging is configured by app.main when the app is imported: in the master with
+# PRELOAD_APP (the workers restart the log writer thread after the fork), in
+# each worker otherwise.
+
+import multiprocessing
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', str(min(4, multiprocessing.cpu_count()))))
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = os.getenv('PRELOAD_APP', 'true').lower() == 'true'
+timeout = int(os.getenv('WORKER_TIMEOUT', '120'))
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from src.utils.config import Config
+    from src.utils.warmup import preload_for_fork
+
+    if Config.WARMUP_ON_STARTUP:
+        report = preload_for_fork()
+        server.log.info(f"Warmed up in the master before forking workers: {report}")
@@ -0,0 +1,140 @@
+# File: backend/src/chunkers/audio_chunker.py
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Tuple
+import logging
+
+from .records import ChunkRecord
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Recognizers
+# ----------------------------
+
+class NullRecognizer:
+    """
+    Recognizer that transcribes nothing; useful to exercise the pipeline without a speech model.
+    """
+    def transcribe(self, segment) -> str:
+        return ""
+
+class SpeechRecognitionRecognizer:
+    def __init__(self, engine: str = 'sphinx', model: str = 'base', language: str = 'en'):
+        """
+        Transcribes audio with one of SpeechRecognition's local engines.
+
+        Args:
+            engine (str): 'sphinx' (PocketSphinx) or 'whisper' (local Whisper model).
+            model (str): Whisper model size; ignored for sphinx.
+            language (str): Spoken language.
+        """
+        import speech_recognition as sr
+
+        if engine not in ('sphinx', 'whisper'):
+            raise ValueError(f"Unsupported speech recognition engine: {engine}")
+        self._sr = sr
+        self._recognizer = sr.Recognizer()
+        self.engine = engine
+        self.model = model
+        self.language = language
+
+    def transcribe(self, segment) -> str:
+        """
+        Transcribes a mono pydub AudioSegment.
+
+        Args:
+            segment (AudioSegment): The audio window.
+
+        Returns:
+            str: The transcript, empty when nothing was recognized.
+        """
+        audio = self._sr.AudioData(segment.raw_data, segment.frame_rate, segment.sample_width)
+        try:
+            if self.engine == 'whisper':
+                return self._recognizer.recognize_whisper(audio, model=self.model, language=self.language).strip()
+            return self._recognizer.recognize_sphinx(audio).strip()
+        except self._sr.UnknownValueError:
+            return ""
+
+# ----------------------------
+# Streaming Transcription
+# ----------------------------
+
+def transcribe_windows(windows: Iterable, recognizer, max_workers: int = 4) -> Iterator[Tuple[object, str]]:
+    """
+    Transcribes audio windows in a worker pool and yields results in time order.
+
+    At most 2 * max_workers windows are decoded or in flight at any time: the
+    next window is only pulled from ``windows`` after the oldest one has been
+    yielded, so long recordings stream through with bounded memory.
+
+    Args:
+        windows (Iterable[AudioWindow]): Windows from src.parsers.audio_parser.
+        recognizer: Object with a transcribe(segment) -> str method.
+        max_workers (int): Number of concurrent transcriptions.
+
+    Yields:
+        Tuple[AudioWindow, str]: Each window (with its audio released) and its transcript.
+    """
+    max_pending = 2 * max_workers
+    pending = deque()
+    windows = iter(windows)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for window in windows:
+            pending.append((window, executor.submit(recognizer.transcribe, window.segment)))
+            if len(pending) >= max_pending:
+                yield _finish(*pending.popleft())
+        while pending:
+            yield _finish(*pending.popleft())
+
+def _finish(window, future) -> Tuple[object, str]:
+    try:
+        text = future.result()
+    except Exception as e:
+        logger.error(f"Error transcribing audio window {window.index}: {e}")
+        raise e
+    window.segment = None
+    return window, text
+
+def chunk_audio(
+    windows: Iterable,
+    document_id: str,
+    recognizer=None,
+    max_workers: int = 4,
+    extractor: str = 'speech_recognition'
+) -> Iterator[ChunkRecord]:
+    """
+    Turns audio windows into timestamped transcript chunks as they are transcribed.
+
+    Windows without recognized speech produce no chunk.
+
+    Args:
+        windows (Iterable[AudioWindow]): Windows from src.parsers.audio_parser.iter_audio_windows.
+        document_id (str): ID of the source recording.
+        recognizer: Object with a transcribe(segment) -> str method. Defaults to NullRecognizer.
+        max_workers (int): Number of concurrent transcriptions.
+        extractor (str): Extractor name stored with the records.
+
+    Yields:
+        ChunkRecord: Records with modality 'audio' and start/end times in seconds, in time order.
+    """
+    recognizer = recognizer or NullRecognizer()
+    chunk_index = 0
+    for window, text in transcribe_windows(windows, recognizer, max_workers=max_workers):
+        if not text:
+            continue
+        chunk_index += 1
+        yield ChunkRecord(
+            text=text,
+            document_id=document_id,
+            chunk_index=chunk_index,
+            modality='audio',
+            extractor=extractor,
+            extra={
+                "start_seconds": window.start_ms / 1000,
+                "end_seconds": window.end_ms / 1000,
+            }
+        )
+    logger.info(f"Created {chunk_index} audio chunks for document {document_id}.")
@@ -3,23 +3,11 @@
 import os
 from typing import List
 from .text_chunker import chunk_text  # Ensure correct import path
+from src.utils.logger import log_context
 import logging
 
 # Configure logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # Set to DEBUG for detailed logs
-
-# Create console handler with a higher log level
-ch = logging.StreamHandler()
-ch.setLevel(logging.DEBUG)
-
-# Create formatter and add it to the handlers
-formatter = logging.Formatter('%(levelname)s:%(name)s:%(message)s')
-ch.setFormatter(formatter)
-
-# Add the handlers to the logger if not already added
-if not logger.handlers:
-    logger.addHandler(ch)
 
 def batch_process_documents(input_dir: str, output_dir: str, method: str = 'spacy'):
     """
@@ -42,31 +30,39 @@ def batch_process_documents(input_dir: str, output_dir: str, method: str = 'spac
     for doc in documents:
         doc_path = os.path.join(input_dir, doc)
         doc_output_dir = os.path.join(output_dir, os.path.splitext(doc)[0])
-        logger.info(f"Processing document: {doc_path}")
-        
-        # Ensure output directory exists
-        os.makedirs(doc_output_dir, exist_ok=True)
+        # Each document is a job; its records carry the document name as job_id
+        with log_context(job_id=doc):
+            _process_document(doc, doc_path, doc_output_dir, method)
+    
+    logger.info("Batch processing completed successfully.")
+
+def _process_document(doc: str, doc_path: str, doc_output_dir: str, method: str):
+    """
+    Chunks one document and writes its chunks to doc_output_dir.
+    """
+    logger.info(f"Processing document: {doc_path}")
+    
+    # Ensure output directory exists
+    os.makedirs(doc_output_dir, exist_ok=True)
+    
+    try:
+        with open(doc_path, 'r', encoding='utf-8') as f:
+            text = f.read()
         
-        try:
-            with open(doc_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-            
-            # Chunk the text
-            chunks = chunk_text(text, method=method)
-            logger.info(f"Total chunks created for {doc}: {len(chunks)}")
-            
-            # Save chunks to individual text files
-            for idx, chunk in enumerate(chunks, 1):
-                chunk_filename = f"chunk_{idx}.txt"
-                chunk_path = os.path.join(doc_output_dir, chunk_filename)
-                with open(chunk_path, 'w', encoding='utf-8') as cf:
-                    cf.write(chunk)
-                logger.debug(f"Saved chunk {idx} to {chunk_path}")
+        # Chunk the text
+        chunks = chunk_text(text, method=method)
+        logger.info(f"Total chunks created for {doc}: {len(chunks)}")
         
-        except Exception as e:
-            logger.error(f"Failed to process document {doc}: {e}")
+        # Save chunks to individual text files
+        for idx, chunk in enumerate(chunks, 1):
+            chunk_filename = f"chunk_{idx}.txt"
+            chunk_path = os.path.join(doc_output_dir, chunk_filename)
+            with open(chunk_path, 'w', encoding='utf-8') as cf:
+                cf.write(chunk)
+            logger.debug("Saved chunk %d to %s", idx, chunk_path)
     
-    logger.info("Batch processing completed successfully.")
+    except Exception as e:
+        logger.error(f"Failed to process document {doc}: {e}")
 
 def batch_chunk_text(text: str, batch_size: int = 500) -> List[str]:
     """
@@ -82,7 +78,7 @@ def batch_chunk_text(text: str, batch_size: int = 500) -> List[str]:
     logger.info(f"Batch chunking text into chunks of {batch_size} words.")
     words = text.split()
     chunks = [' '.join(words[i:i + batch_size]) for i in range(0, len(words), batch_size)]
-    logger.debug(f"Batch chunker produced {len(chunks)} chunks.")
+    logger.debug("Batch chunker produced %d chunks.", len(chunks))
     return chunks
 
 if __name__ == "__main__":
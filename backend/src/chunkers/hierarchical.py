@@ -0,0 +1,87 @@
+# File: backend/src/chunkers/hierarchical.py
+
+from typing import List, Tuple
+import logging
+
+from .records import ChunkRecord, build_chunk_records
+
+logger = logging.getLogger(__name__)
+
+# Extractor names of the two levels; child records point to their parent via 'parent_id'
+PARENT_EXTRACTOR = 'parent'
+CHILD_EXTRACTOR = 'child'
+
+def group_sentences(sentences: List[str], min_words: int, max_words: int) -> List[List[str]]:
+    """
+    Groups consecutive sentences without overlap, closing a group once the next
+    sentence would push it past max_words and it holds at least min_words.
+
+    Args:
+        sentences (List[str]): The sentences, in order.
+        min_words (int): Minimum words per group (the last group may be shorter).
+        max_words (int): Maximum words per group, unless min_words is not reached yet.
+
+    Returns:
+        List[List[str]]: The sentences of each group.
+    """
+    groups = []
+    current = []
+    current_words = 0
+    for sentence in sentences:
+        words = len(sentence.split())
+        if not words:
+            continue
+        if current and current_words + words > max_words and current_words >= min_words:
+            groups.append(current)
+            current = []
+            current_words = 0
+        current.append(sentence)
+        current_words += words
+    if current:
+        groups.append(current)
+    return groups
+
+def build_parent_child_records(
+    sentences: List[str],
+    source_text: str,
+    document_id: str,
+    parent_min_words: int = 300,
+    parent_max_words: int = 500,
+    child_max_words: int = 60
+) -> Tuple[List[ChunkRecord], List[ChunkRecord]]:
+    """
+    Splits a document into parent sections and the small child chunks inside them.
+
+    Parents are runs of sentences sized like the text chunker's chunks; children
+    pack consecutive sentences of one parent up to child_max_words (a longer
+    sentence is a child of its own). Children are embedded and searched, parents
+    are what retrieval returns.
+
+    Args:
+        sentences (List[str]): The sentence split of source_text (e.g. ChunkingInput.sentences).
+        source_text (str): The cleaned text the sentences come from.
+        document_id (str): ID of the source document.
+        parent_min_words (int): Minimum words per parent.
+        parent_max_words (int): Maximum words per parent.
+        child_max_words (int): Maximum words per child.
+
+    Returns:
+        Tuple[List[ChunkRecord], List[ChunkRecord]]: The parent records and the child
+            records, each child with its parent's record_id in extra['parent_id'].
+    """
+    sections = group_sentences(sentences, parent_min_words, parent_max_words)
+    parents = build_chunk_records(
+        [' '.join(section) for section in sections], source_text, document_id,
+        modality='text', extractor=PARENT_EXTRACTOR
+    )
+    child_texts = []
+    child_parents = []
+    for parent, section in zip(parents, sections):
+        for group in group_sentences(section, 0, child_max_words):
+            child_texts.append(' '.join(group))
+            child_parents.append(parent)
+    children = build_chunk_records(child_texts, source_text, document_id, modality='text', extractor=CHILD_EXTRACTOR)
+    for child, parent in zip(children, child_parents):
+        child.extra['parent_id'] = parent.record_id
+    logger.info(f"Built {len(parents)} parent sections with {len(children)} child chunks.")
+    return parents, children
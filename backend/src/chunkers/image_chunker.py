@@ -0,0 +1,171 @@
+# File: backend/src/chunkers/image_chunker.py
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List
+import logging
+
+from PIL import Image
+
+from .records import ChunkRecord
+from src.utils.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Captioners
+# ----------------------------
+
+class NullCaptioner:
+    """
+    Captioner that produces no captions; image chunks then rely on OCR text only.
+    """
+    def caption(self, images: List[Image.Image]) -> List[str]:
+        return ["" for _ in images]
+
+class TransformersCaptioner:
+    def __init__(self, model_name: str = 'Salesforce/blip-image-captioning-base', max_new_tokens: int = 30):
+        """
+        Captions images with a local image-to-text model from Hugging Face transformers.
+
+        Args:
+            model_name (str): Image captioning model to load.
+            max_new_tokens (int): Maximum caption length in tokens.
+        """
+        from transformers import pipeline
+
+        self.model_name = model_name
+        self.max_new_tokens = max_new_tokens
+        self._pipeline = pipeline('image-to-text', model=model_name, device=-1)
+        logger.info(f"Loaded captioning model: {model_name}")
+
+    def caption(self, images: List[Image.Image]) -> List[str]:
+        """
+        Captions a batch of images in a single forward pass.
+
+        Args:
+            images (List[Image.Image]): Images to caption.
+
+        Returns:
+            List[str]: One caption per image.
+        """
+        if not images:
+            return []
+        outputs = self._pipeline(
+            images, batch_size=len(images), generate_kwargs={"max_new_tokens": self.max_new_tokens}
+        )
+        return [output[0]["generated_text"].strip() if output else "" for output in outputs]
+
+# ----------------------------
+# OCR
+# ----------------------------
+
+def ocr_image(image: Image.Image) -> str:
+    """
+    Extracts text from an image with Tesseract.
+    """
+    import pytesseract
+
+    return pytesseract.image_to_string(image).strip()
+
+def _ocr_text(future, image) -> str:
+    """
+    Returns the OCR text of an image, or an empty string if OCR failed on it.
+    """
+    try:
+        return future.result()
+    except Exception as e:
+        # One bad bitmap (or a missing Tesseract) must not fail the whole document
+        logger.warning(f"OCR failed for image {image.image_number} on page {image.page_number}: {e}")
+        return ""
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def format_image_chunk(page_number: int, caption: str, ocr_text: str) -> str:
+    """
+    Builds the searchable text of an image chunk from its caption and OCR text.
+    """
+    parts = [f"Image on page {page_number}."]
+    if caption:
+        parts.append(f"Caption: {caption}.")
+    if ocr_text:
+        parts.append(f"Text in image: {' '.join(ocr_text.split())}")
+    return " ".join(parts)
+
+# ----------------------------
+# Image Chunking
+# ----------------------------
+
+def chunk_images(
+    images: Iterable,
+    document_id: str,
+    captioner=None,
+    batch_size: int = 8,
+    ocr: bool = True,
+    ocr_workers: int = 4,
+    extractor: str = 'pymupdf'
+) -> Iterator[ChunkRecord]:
+    """
+    Turns extracted images into image chunk records, one batch at a time.
+
+    Within a batch, OCR runs in a thread pool (Tesseract runs out of process)
+    while the captioner handles the whole batch in one call; an image whose OCR
+    fails gets no OCR text. Decoded images are released once their batch is
+    done, so memory stays bounded by the batch size.
+
+    Args:
+        images (Iterable[ExtractedImage]): Images from src.parsers.image_parser.
+        document_id (str): ID of the source document.
+        captioner: Object with a caption(images) -> List[str] method. Defaults to NullCaptioner.
+        batch_size (int): Number of images captioned together.
+        ocr (bool): Whether to run OCR on the images.
+        ocr_workers (int): Number of concurrent OCR processes.
+        extractor (str): Extractor name stored with the records.
+
+    Yields:
+        ChunkRecord: One record with modality 'image' per image, in document order.
+    """
+    captioner = captioner or NullCaptioner()
+    chunk_index = 0
+    with ThreadPoolExecutor(max_workers=ocr_workers) as executor:
+        for batch in _batched(images, batch_size):
+            pixels = [image.image for image in batch]
+            try:
+                ocr_futures = [executor.submit(ocr_image, pixel) for pixel in pixels] if ocr else []
+                with span("captioning", items=len(pixels)):
+                    captions = captioner.caption(pixels)
+                with span("ocr.images", items=len(ocr_futures)):
+                    if ocr:
+                        ocr_texts = [_ocr_text(future, image) for future, image in zip(ocr_futures, batch)]
+                    else:
+                        ocr_texts = ["" for _ in batch]
+            except Exception as e:
+                logger.error(f"Error processing image batch: {e}")
+                raise e
+
+            for image, caption, ocr_text in zip(batch, captions, ocr_texts):
+                chunk_index += 1
+                image.image = None
+                yield ChunkRecord(
+                    text=format_image_chunk(image.page_number, caption, ocr_text),
+                    document_id=document_id,
+                    chunk_index=chunk_index,
+                    modality='image',
+                    extractor=extractor,
+                    page_start=image.page_number,
+                    page_end=image.page_number,
+                    extra={
+                        "blob_id": image.thumbnail_blob_id,
+                        "width": image.width,
+                        "height": image.height,
+                        "phash": f"{image.phash:016x}",
+                        "caption": caption,
+                    }
+                )
+            logger.debug("Chunked a batch of %d images.", len(batch))
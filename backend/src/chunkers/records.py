@@ -0,0 +1,178 @@
+# File: backend/src/chunkers/records.py
+
+import bisect
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Extractors end every page with a form feed (as pdftotext does), so page
+# numbers can be recovered from character offsets even after text cleaning.
+PAGE_BREAK = '\f'
+
+_WORD_CHAR = re.compile(r'\w')
+_PAGE_BREAK_RUN = re.compile(r'\s*' + PAGE_BREAK + r'\s*')
+
+@dataclass
+class ChunkRecord:
+    """
+    A chunk together with the metadata stored next to it in the vector store.
+
+    Page numbers are 1-based; documents without pages are a single page 1.
+    Character offsets refer to the text the chunker consumed and are -1 when
+    the chunk could not be located in it.
+    """
+    text: str
+    document_id: str
+    chunk_index: int
+    modality: str = 'text'
+    extractor: str = ''
+    page_start: int = 1
+    page_end: int = 1
+    char_start: int = -1
+    char_end: int = -1
+    extra: Dict = field(default_factory=dict)
+
+    @property
+    def record_id(self) -> str:
+        # Deterministic ids make re-indexing the same document idempotent
+        return f"{self.document_id}:{self.modality}:{self.extractor}:{self.chunk_index}"
+
+    def to_metadata(self) -> Dict:
+        """
+        Flattens the record into scalar metadata accepted by the vector store.
+        """
+        metadata = {
+            "document_id": self.document_id,
+            "chunk_index": self.chunk_index,
+            "modality": self.modality,
+            "extractor": self.extractor,
+            "page_start": self.page_start,
+            "page_end": self.page_end,
+            "char_start": self.char_start,
+            "char_end": self.char_end,
+        }
+        for key, value in self.extra.items():
+            if isinstance(value, (str, int, float, bool)):
+                metadata[key] = value
+        return metadata
+
+def make_document_id(file_path: str) -> str:
+    """
+    Derives a stable document ID from the file content.
+
+    Args:
+        file_path (str): Path to the document.
+
+    Returns:
+        str: A 16-character hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+def strip_page_breaks(text: str) -> str:
+    """
+    Removes the PAGE_BREAK markers from a chunk returned to callers.
+
+    A page break and the whitespace around it become a single space. A bare
+    page break inside a word is where cleaning joined a word hyphenated
+    across pages, and is dropped.
+
+    Args:
+        text (str): A chunk cut from text with PAGE_BREAK after each page.
+
+    Returns:
+        str: The chunk without page breaks.
+    """
+    if PAGE_BREAK not in text:
+        return text
+
+    def replace(match) -> str:
+        if match.start() == 0 or match.end() == len(text) or match.group() == PAGE_BREAK:
+            return ''
+        return ' '
+
+    return _PAGE_BREAK_RUN.sub(replace, text)
+
+def locate_chunks(chunks: List[str], source_text: str) -> List[Tuple[int, int]]:
+    """
+    Finds the character span of each chunk in the text it was cut from.
+
+    Chunkers re-join words and sentences with single spaces, so matching ignores
+    whitespace between words. Chunks are searched in order from the
+    previous chunk's start, which allows for overlapping chunks.
+
+    Args:
+        chunks (List[str]): Chunks in document order.
+        source_text (str): The text the chunker consumed.
+
+    Returns:
+        List[Tuple[int, int]]: (char_start, char_end) per chunk, (-1, -1) if not found.
+    """
+    spans = []
+    cursor = 0
+    for chunk in chunks:
+        words = chunk.split()
+        if not words:
+            spans.append((-1, -1))
+            continue
+        body = r'\s*'.join(re.escape(word) for word in words)
+        # Anchor on word boundaries so a chunk starting with "eta" does not match inside "zeta"
+        prefix = r'(?<!\w)' if _WORD_CHAR.match(words[0][0]) else ''
+        suffix = r'(?!\w)' if _WORD_CHAR.match(words[-1][-1]) else ''
+        pattern = re.compile(prefix + body + suffix)
+        match = pattern.search(source_text, cursor) or pattern.search(source_text)
+        if match is None:
+            logger.debug("Could not locate chunk in source text.")
+            spans.append((-1, -1))
+            continue
+        spans.append((match.start(), match.end()))
+        cursor = match.start() + 1
+    return spans
+
+def build_chunk_records(
+    chunks: List[str],
+    source_text: str,
+    document_id: str,
+    modality: str = 'text',
+    extractor: str = ''
+) -> List[ChunkRecord]:
+    """
+    Wraps chunks in ChunkRecords with page spans and character offsets.
+
+    Args:
+        chunks (List[str]): Chunks in document order, as cut from source_text (page breaks included).
+        source_text (str): The text the chunker consumed, with PAGE_BREAK after each page.
+        document_id (str): ID of the source document.
+        modality (str): Content modality ('text', 'table', 'image', 'audio').
+        extractor (str): Name of the chunker or extractor that produced the chunks.
+
+    Returns:
+        List[ChunkRecord]: One record per chunk.
+    """
+    page_breaks = [match.start() for match in re.finditer(PAGE_BREAK, source_text)]
+    records = []
+    for index, (chunk, (start, end)) in enumerate(zip(chunks, locate_chunks(chunks, source_text)), 1):
+        if start >= 0:
+            page_start = bisect.bisect_left(page_breaks, start) + 1
+            page_end = bisect.bisect_left(page_breaks, max(start, end - 1)) + 1
+        else:
+            page_start = page_end = 1
+        records.append(ChunkRecord(
+            text=strip_page_breaks(chunk),
+            document_id=document_id,
+            chunk_index=index,
+            modality=modality,
+            extractor=extractor,
+            page_start=page_start,
+            page_end=page_end,
+            char_start=start,
+            char_end=end
+        ))
+    return records
@@ -0,0 +1,248 @@
+# File: backend/src/chunkers/semantic_chunker.py
+
+from typing import List
+import logging
+
+import numpy as np
+
+from src.utils.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Sentence Encoders
+# ----------------------------
+
+class SpacyVectorEncoder:
+    def __init__(self, nlp, batch_size: int = 256):
+        """
+        Embeds sentences as the mean of the static word vectors of a spaCy model
+        (e.g. en_core_web_lg). Only the tokenizer runs, so this costs a fraction
+        of the sentence split that precedes it.
+
+        Args:
+            nlp: A spaCy pipeline whose vocabulary has word vectors.
+            batch_size (int): Sentences tokenized per batch.
+        """
+        if not nlp.vocab.vectors.shape[0]:
+            raise ValueError(
+                "The spaCy model has no word vectors; use a model with vectors (e.g. en_core_web_lg) "
+                "or set SEMANTIC_ENCODER to 'sentence-transformers' or 'embeddings'."
+            )
+        self.nlp = nlp
+        self.batch_size = batch_size
+
+    def encode(self, sentences: List[str]) -> np.ndarray:
+        from spacy.attrs import ORTH
+
+        table = self.nlp.vocab.vectors
+        vectors = np.zeros((len(sentences), table.shape[1]), dtype=np.float32)
+        docs = self.nlp.tokenizer.pipe(sentences, batch_size=self.batch_size)
+        for start in range(0, len(sentences), self.batch_size):
+            batch = [next(docs) for _ in range(min(self.batch_size, len(sentences) - start))]
+            # Sum the vectors of each sentence's tokens in one lookup per batch,
+            # rather than token by token as doc.vector does. The sum has the
+            # direction of doc.vector, which is all the cosine similarity sees.
+            keys = np.concatenate([doc.to_array([ORTH]).reshape(-1) for doc in batch]).astype(np.uint64)
+            owners = np.repeat(np.arange(len(batch)), [len(doc) for doc in batch])
+            rows = table.find(keys=keys)
+            known = rows >= 0
+            # Tokens are in sentence order, so each sentence's known tokens are one run
+            counts = np.bincount(owners[known], minlength=len(batch))
+            if not counts.any():
+                continue
+            offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            present = np.flatnonzero(counts)
+            vectors[start + present] = np.add.reduceat(np.asarray(table.data)[rows[known]], offsets[present], axis=0)
+        return vectors
+
+class SentenceTransformerEncoder:
+    def __init__(self, model_name: str = 'sentence-transformers/all-MiniLM-L6-v2', batch_size: int = 64):
+        """
+        Embeds sentences with a local sentence-transformers model on CPU.
+
+        Args:
+            model_name (str): Hugging Face model id or local path.
+            batch_size (int): Sentences encoded per batch.
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(model_name, device='cpu')
+            self.batch_size = batch_size
+            logger.info(f"Sentence encoder '{model_name}' loaded.")
+        except Exception as e:
+            logger.error(f"Error loading sentence encoder '{model_name}': {e}")
+            raise e
+
+    def encode(self, sentences: List[str]) -> np.ndarray:
+        return self.model.encode(sentences, batch_size=self.batch_size, convert_to_numpy=True)
+
+class EmbeddingsEncoder:
+    def __init__(self, embeddings, batch_size: int = 256):
+        """
+        Embeds sentences with a LangChain embeddings client, e.g. the shared
+        components.embeddings (FakeEmbeddings runs locally).
+
+        Args:
+            embeddings (Embeddings): The embeddings client.
+            batch_size (int): Sentences sent per call.
+        """
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+
+    def encode(self, sentences: List[str]) -> np.ndarray:
+        vectors = []
+        for start in range(0, len(sentences), self.batch_size):
+            vectors.extend(self.embeddings.embed_documents(sentences[start:start + self.batch_size]))
+        return np.asarray(vectors, dtype=np.float32)
+
+# ----------------------------
+# Breakpoints
+# ----------------------------
+
+def adjacent_similarities(vectors: np.ndarray, window: int = 1) -> np.ndarray:
+    """
+    Cosine similarity across each gap between consecutive sentences.
+
+    With window > 1, the mean of the `window` sentences before the gap is
+    compared with the mean of the `window` sentences after it, which smooths
+    out single off-topic sentences.
+
+    Args:
+        vectors (np.ndarray): One row per sentence.
+        window (int): Sentences averaged on each side of a gap.
+
+    Returns:
+        np.ndarray: len(vectors) - 1 similarities; entry i is the gap after sentence i.
+    """
+    count = len(vectors)
+    if count < 2:
+        return np.zeros(0, dtype=np.float32)
+    # Windowed sums via a cumulative sum: rows [i - window + 1, i] and [i + 1, i + window]
+    cumulative = np.vstack([np.zeros((1, vectors.shape[1]), dtype=vectors.dtype), np.cumsum(vectors, axis=0)])
+    gaps = np.arange(count - 1)
+    left = cumulative[gaps + 1] - cumulative[np.maximum(gaps + 1 - window, 0)]
+    right = cumulative[np.minimum(gaps + 1 + window, count)] - cumulative[gaps + 1]
+    norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+    dots = np.einsum('ij,ij->i', left, right)
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+def find_breakpoints(
+    similarities: np.ndarray,
+    word_counts: np.ndarray,
+    min_words: int = 150,
+    max_words: int = 500,
+    breakpoint_percentile: float = 10
+) -> List[int]:
+    """
+    Chooses where to cut: at the first similarity valley that keeps the chunk
+    within the word bounds.
+
+    A gap is a valley when its similarity is a local minimum at or below the
+    given percentile of all gaps. Without a valley in bounds, a chunk that
+    cannot hold the rest of the text is cut at its least similar gap in bounds.
+    Cuts leave at least min_words for the rest of the text where the bounds
+    allow it.
+
+    Args:
+        similarities (np.ndarray): Similarity of each gap (see adjacent_similarities).
+        word_counts (np.ndarray): Words of each sentence.
+        min_words (int): Minimum words per chunk (the last chunk may be shorter).
+        max_words (int): Maximum words per chunk, unless a single sentence is longer.
+        breakpoint_percentile (float): Gaps at or below this percentile are valleys.
+
+    Returns:
+        List[int]: Indexes of the sentences that end a chunk, the last sentence included.
+    """
+    count = len(word_counts)
+    if count == 0:
+        return []
+    threshold = np.percentile(similarities, breakpoint_percentile) if len(similarities) else 0.0
+    # Local minima at or below the threshold
+    padded = np.concatenate([[np.inf], similarities, [np.inf]])
+    is_valley = (similarities <= threshold) & (similarities <= padded[:-2]) & (similarities <= padded[2:])
+    # ends[i]: words in sentences [0, i]
+    ends = np.cumsum(word_counts)
+    breakpoints = []
+    start = 0
+    while start < count:
+        if start == count - 1:
+            breakpoints.append(start)
+            break
+        before = ends[start - 1] if start else 0
+        remaining = ends[-1] - before
+        # Cutting after sentence b, for b in [low, high], keeps the chunk within bounds
+        low = max(int(np.searchsorted(ends, before + min_words, side='left')), start)
+        high = min(max(int(np.searchsorted(ends, before + max_words, side='right')) - 1, start), count - 2)
+        # Leave at least min_words for the rest, where the bounds allow it
+        last = int(np.searchsorted(ends, ends[-1] - min_words, side='right')) - 1
+        if low <= last < high:
+            high = last
+        if low > high:
+            if remaining <= max_words:
+                breakpoints.append(count - 1)
+                break
+            # The sentence after high would overshoot max_words: cut before it
+            low = high
+        valleys = np.flatnonzero(is_valley[low:high + 1])
+        if len(valleys):
+            cut = low + int(valleys[0])
+        elif remaining <= max_words:
+            breakpoints.append(count - 1)
+            break
+        else:
+            cut = low + int(np.argmin(similarities[low:high + 1]))
+        breakpoints.append(cut)
+        start = cut + 1
+    return breakpoints
+
+# ----------------------------
+# Chunking
+# ----------------------------
+
+def semantic_chunk(
+    sentences: List[str],
+    encoder,
+    min_words: int = 150,
+    max_words: int = 500,
+    window: int = 3,
+    breakpoint_percentile: float = 10
+) -> List[str]:
+    """
+    Groups sentences into chunks that end where the topic shifts.
+
+    Sentences are embedded in batches, the similarity across every gap is
+    computed at once with NumPy, and chunks are cut at similarity valleys
+    within the word bounds.
+
+    Args:
+        sentences (List[str]): The sentences, in order.
+        encoder: Sentence encoder with an encode(List[str]) -> np.ndarray method.
+        min_words (int): Minimum words per chunk.
+        max_words (int): Maximum words per chunk.
+        window (int): Sentences averaged on each side of a gap.
+        breakpoint_percentile (float): Gaps at or below this percentile of similarity are valleys.
+
+    Returns:
+        List[str]: The chunks.
+    """
+    sentences = [sentence for sentence in sentences if sentence.strip()]
+    if not sentences:
+        return []
+    try:
+        with span("semantic.encode", items=len(sentences)):
+            vectors = np.asarray(encoder.encode(sentences), dtype=np.float32)
+        similarities = adjacent_similarities(vectors, window=window)
+        word_counts = np.fromiter((len(sentence.split()) for sentence in sentences), dtype=np.int64, count=len(sentences))
+        breakpoints = find_breakpoints(similarities, word_counts, min_words, max_words, breakpoint_percentile)
+    except Exception as e:
+        logger.error(f"Error during semantic chunking: {e}")
+        raise e
+
+    chunks = []
+    start = 0
+    for end in breakpoints:
+        chunks.append(' '.join(sentences[start:end + 1]))
+        start = end + 1
+    logger.info(f"Semantic chunker created {len(chunks)} chunks from {len(sentences)} sentences.")
+    return chunks
@@ -0,0 +1,198 @@
+# File: backend/src/chunkers/strategies.py
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+import logging
+
+from src.utils.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+class ChunkingInput:
+    def __init__(self, text: str, sentence_method: str = 'spacy'):
+        """
+        The text to chunk and the preprocessing shared by the chunking strategies.
+
+        The cleaned text and its sentence split are computed on first use, once,
+        however many strategies (and threads) ask for them.
+
+        Args:
+            text (str): The extracted text.
+            sentence_method (str): Sentence splitting method ('spacy' or 'nltk').
+        """
+        self.text = text
+        self.sentence_method = sentence_method
+        self._cleaned_text: Optional[str] = None
+        self._sentences: Optional[List[str]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_cleaned(cls, text: str, cleaned_text: str, sentence_method: str = 'spacy') -> "ChunkingInput":
+        """
+        Creates the input for text that was already cleaned with clean_text.
+        """
+        chunking_input = cls(text, sentence_method)
+        chunking_input._cleaned_text = cleaned_text
+        return chunking_input
+
+    @property
+    def cleaned_text(self) -> str:
+        if self._cleaned_text is None:
+            with self._lock:
+                if self._cleaned_text is None:
+                    from .text_chunker import clean_text
+                    with span("cleaning", items=len(self.text)):
+                        self._cleaned_text = clean_text(self.text)
+        return self._cleaned_text
+
+    @property
+    def sentences(self) -> List[str]:
+        if self._sentences is None:
+            cleaned_text = self.cleaned_text
+            with self._lock:
+                if self._sentences is None:
+                    from .text_chunker import split_into_sentences
+                    with span("sentence_split") as split_span:
+                        self._sentences = split_into_sentences(cleaned_text, method=self.sentence_method)
+                        split_span.items = len(self._sentences)
+        return self._sentences
+
+@dataclass(frozen=True)
+class ChunkingStrategy:
+    """
+    A registered chunking strategy.
+
+    Attributes:
+        name: Strategy name, used to select it per request, e.g. 'text_chunker'.
+        chunk: Chunks a ChunkingInput, using its shared preprocessing where it can.
+        description: One line shown in listings.
+    """
+    name: str
+    chunk: Callable[[ChunkingInput], List[str]]
+    description: str = ''
+
+# ----------------------------
+# Built-in Strategies
+# ----------------------------
+
+def _chunk_sentences(chunking_input: ChunkingInput) -> List[str]:
+    from .text_chunker import group_sentences_with_overlap, remove_duplicates
+
+    chunks = group_sentences_with_overlap(chunking_input.sentences, min_words=300, max_words=500, overlap_sentences=2)
+    return remove_duplicates(chunks)
+
+def _chunk_words(chunking_input: ChunkingInput) -> List[str]:
+    from .batch_chunker import batch_chunk_text
+
+    return batch_chunk_text(chunking_input.text, batch_size=500)
+
+def _chunk_semantic(chunking_input: ChunkingInput) -> List[str]:
+    from src.utils.components import components
+    from src.utils.config import Config
+    from .semantic_chunker import semantic_chunk
+
+    return semantic_chunk(
+        chunking_input.sentences,
+        components.get('sentence_encoder'),
+        min_words=Config.SEMANTIC_MIN_WORDS,
+        max_words=Config.SEMANTIC_MAX_WORDS,
+        window=Config.SEMANTIC_WINDOW,
+        breakpoint_percentile=Config.SEMANTIC_BREAKPOINT_PERCENTILE
+    )
+
+def _chunk_paragraphs(chunking_input: ChunkingInput) -> List[str]:
+    from src.preprocessing.chunker import chunk_data
+
+    return chunk_data(chunking_input.cleaned_text, max_paragraphs=5)
+
+def _chunk_characters(chunking_input: ChunkingInput) -> List[str]:
+    from src.preprocessing.cleaner import chunk_data
+
+    return chunk_data(chunking_input.cleaned_text, max_chars=500)
+
+# ----------------------------
+# Registry
+# ----------------------------
+
+_STRATEGIES: Dict[str, ChunkingStrategy] = {}
+
+def register_strategy(strategy: ChunkingStrategy):
+    """
+    Registers a chunking strategy, replacing any strategy with the same name.
+    """
+    _STRATEGIES[strategy.name] = strategy
+
+def get_strategy(name: str) -> ChunkingStrategy:
+    if name not in _STRATEGIES:
+        raise KeyError(f"No chunking strategy registered with name: {name}")
+    return _STRATEGIES[name]
+
+def registered_strategies() -> List[ChunkingStrategy]:
+    return list(_STRATEGIES.values())
+
+def run_strategies(
+    chunking_input: ChunkingInput,
+    names: Iterable[str],
+    max_workers: Optional[int] = None
+) -> Dict[str, List[str]]:
+    """
+    Runs the selected chunking strategies concurrently over shared preprocessing.
+
+    Each strategy runs in a "chunking.<name>" span in its own thread, with the
+    caller's context (request ID, span collection). Strategies needing the
+    cleaned text or the sentences wait for the first one computing them.
+
+    Args:
+        chunking_input (ChunkingInput): The text and its shared preprocessing.
+        names (Iterable[str]): Strategies to run, in the order of the result.
+        max_workers (int, optional): Threads to use. Defaults to one per strategy.
+
+    Returns:
+        Dict[str, List[str]]: The chunks of each strategy.
+
+    Raises:
+        KeyError: If a strategy is not registered.
+    """
+    strategies = [get_strategy(name) for name in dict.fromkeys(names)]
+    if not strategies:
+        return {}
+
+    def run(strategy: ChunkingStrategy) -> List[str]:
+        with span(f"chunking.{strategy.name}") as chunk_span:
+            chunks = strategy.chunk(chunking_input)
+            chunk_span.items = len(chunks)
+        logger.info(f"Total chunks created by {strategy.name}: {len(chunks)}")
+        return chunks
+
+    if len(strategies) == 1:
+        return {strategies[0].name: run(strategies[0])}
+    with ThreadPoolExecutor(max_workers=max_workers or len(strategies)) as executor:
+        futures = {
+            strategy.name: executor.submit(contextvars.copy_context().run, run, strategy)
+            for strategy in strategies
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+register_strategy(ChunkingStrategy(
+    name='text_chunker', chunk=_chunk_sentences,
+    description='Sentence groups of 300-500 words with two sentences of overlap.'
+))
+register_strategy(ChunkingStrategy(
+    name='batch_chunker', chunk=_chunk_words,
+    description='Fixed windows of 500 words of the extracted text.'
+))
+register_strategy(ChunkingStrategy(
+    name='semantic', chunk=_chunk_semantic,
+    description='Sentences grouped until the topic shifts, by sentence embedding similarity.'
+))
+register_strategy(ChunkingStrategy(
+    name='paragraphs', chunk=_chunk_paragraphs,
+    description='Up to five paragraphs of the cleaned text.'
+))
+register_strategy(ChunkingStrategy(
+    name='characters', chunk=_chunk_characters,
+    description='Paragraphs of the cleaned text packed into 500 characters.'
+))
@@ -0,0 +1,226 @@
+# File: backend/src/chunkers/table_chunker.py
+
+import hashlib
+import re
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+from .records import ChunkRecord
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+def _clean_cell(cell) -> str:
+    return _WHITESPACE.sub(' ', str(cell or '')).strip()
+
+def _rows_hash(rows: List[List[str]]) -> str:
+    """
+    Hashes the cell contents of rows, ignoring whitespace, case and column layout.
+
+    Extractors disagree on where columns split and how cells are padded, but
+    they read the same characters in the same order.
+    """
+    digest = hashlib.sha1()
+    for row in rows:
+        for cell in row:
+            digest.update(_WHITESPACE.sub('', cell).lower().encode('utf-8'))
+    return digest.hexdigest()
+
+def table_rows(table: Dict) -> List[List[str]]:
+    """
+    Returns the non-empty rows of a table dictionary as lists of cleaned cell strings.
+    """
+    rows = []
+    for row in table.get("rows", []):
+        cells = [_clean_cell(cell) for cell in row.get("cells", [])]
+        if any(cells):
+            rows.append(cells)
+    return rows
+
+def table_keys(rows: List[List[str]]) -> Tuple[str, Optional[str]]:
+    """
+    Returns the dedupe keys of a table: the hash of all rows and, for tables
+    with a body, of the rows after the first (None otherwise).
+
+    Tabula turns the first row into DataFrame column names, so its tables lack
+    the header row the other extractors return; the second key catches that.
+    """
+    return _rows_hash(rows), _rows_hash(rows[1:]) if len(rows) > 1 else None
+
+def dedupe_tables(tables_by_extractor: Dict[str, List[Dict]]) -> List[Tuple[str, Dict, List[List[str]]]]:
+    """
+    Merges the tables found by several extractors, keeping one copy of each table.
+
+    Tables are compared by cell-content hash. A table also matches a table of
+    another extractor that has the same cells plus a header row, or the same
+    cells minus its header row. Extractors are taken in the order given, so
+    the first extractor that found a table wins.
+
+    Args:
+        tables_by_extractor (Dict[str, List[Dict]]): Output of app.utils.extract_tables.
+
+    Returns:
+        List[Tuple[str, Dict, List[List[str]]]]: (extractor, table, cleaned rows) per unique table.
+    """
+    # Hash -> extractors of the kept tables with those cells, all rows or body rows only
+    seen_full: Dict[str, Set[str]] = {}
+    seen_body: Dict[str, Set[str]] = {}
+    unique = []
+    num_tables = 0
+    for extractor, tables in tables_by_extractor.items():
+        for table in tables:
+            num_tables += 1
+            rows = table_rows(table)
+            if not rows:
+                continue
+            full_key, body_key = table_keys(rows)
+            if (
+                full_key in seen_full
+                or seen_body.get(full_key, set()) - {extractor}
+                or (body_key is not None and seen_full.get(body_key, set()) - {extractor})
+            ):
+                logger.debug("Skipping duplicate table %s from %s.", table.get('table_number'), extractor)
+                continue
+            seen_full.setdefault(full_key, set()).add(extractor)
+            if body_key is not None:
+                seen_body.setdefault(body_key, set()).add(extractor)
+            unique.append((extractor, table, rows))
+    logger.info(f"Kept {len(unique)} unique tables out of {num_tables}.")
+    return unique
+
+# ----------------------------
+# Serialization
+# ----------------------------
+
+def _escape_markdown(cell: str) -> str:
+    return cell.replace('|', '\\|')
+
+def _header(rows: List[List[str]]) -> List[str]:
+    width = max(len(row) for row in rows)
+    header = rows[0] + [''] * (width - len(rows[0]))
+    return [cell or f"Column {i}" for i, cell in enumerate(header, 1)]
+
+def serialize_rows(header: List[str], rows: List[List[str]], style: str = 'markdown') -> str:
+    """
+    Serializes table rows under their header.
+
+    Args:
+        header (List[str]): Column names.
+        rows (List[List[str]]): Body rows.
+        style (str): 'markdown' for a markdown table, 'key-value' for one
+            "column: value" line per row (better for wide, sparse tables).
+
+    Returns:
+        str: The serialized rows.
+    """
+    if style == 'key-value':
+        lines = []
+        for row in rows:
+            pairs = [f"{name}: {cell}" for name, cell in zip(header, row) if cell]
+            lines.append("; ".join(pairs))
+        return "\n".join(lines)
+    if style != 'markdown':
+        raise ValueError(f"Unsupported table serialization style: {style}")
+    lines = [
+        "| " + " | ".join(_escape_markdown(cell) for cell in header) + " |",
+        "|" + " --- |" * len(header),
+    ]
+    for row in rows:
+        padded = row + [''] * (len(header) - len(row))
+        lines.append("| " + " | ".join(_escape_markdown(cell) for cell in padded[:len(header)]) + " |")
+    return "\n".join(lines)
+
+def split_table(
+    rows: List[List[str]],
+    style: str = 'markdown',
+    max_chars: int = 1000
+) -> List[Tuple[int, int, str]]:
+    """
+    Splits a table into row groups that each repeat the header and stay within max_chars.
+
+    A single row longer than max_chars becomes a group of its own.
+
+    Args:
+        rows (List[List[str]]): Cleaned table rows; the first row is the header.
+        style (str): Serialization style (see serialize_rows).
+        max_chars (int): Maximum size of a serialized group.
+
+    Returns:
+        List[Tuple[int, int, str]]: (first_row, last_row, text) per group; rows
+            are 1-based body row numbers.
+    """
+    header = _header(rows)
+    body = rows[1:] or [[''] * len(header)]
+    header_size = len(serialize_rows(header, [], style))
+    groups = []
+    start = 0
+    size = header_size
+    for index, row in enumerate(body):
+        row_size = len(serialize_rows(header, [row], style)) - header_size + 1
+        if index > start and size + row_size > max_chars:
+            groups.append((start + 1, index, serialize_rows(header, body[start:index], style)))
+            start = index
+            size = header_size
+        size += row_size
+    groups.append((start + 1, len(body), serialize_rows(header, body[start:], style)))
+    return groups
+
+# ----------------------------
+# Table Chunking
+# ----------------------------
+
+def chunk_tables(
+    tables_by_extractor: Dict[str, List[Dict]],
+    document_id: str,
+    style: str = 'markdown',
+    max_chars: int = 1000
+) -> List[ChunkRecord]:
+    """
+    Turns extracted tables into size-bounded, deduplicated table chunk records.
+
+    Each chunk starts with a short caption (table number, page and rows) so it
+    can be found by position as well as content.
+
+    Args:
+        tables_by_extractor (Dict[str, List[Dict]]): Output of app.utils.extract_tables.
+        document_id (str): ID of the source document.
+        style (str): 'markdown' or 'key-value'.
+        max_chars (int): Maximum size of the serialized rows in a chunk.
+
+    Returns:
+        List[ChunkRecord]: Records with modality 'table'.
+    """
+    records = []
+    chunk_index = 1
+    for table_index, (extractor, table, rows) in enumerate(dedupe_tables(tables_by_extractor), 1):
+        # DOCX and HTML tables have page 0; records use page 1 for documents without pages
+        page = max(1, int(table.get("page_number") or 1))
+        table_hash = table_keys(rows)[0]
+        groups = split_table(rows, style=style, max_chars=max_chars)
+        num_rows = max(len(rows) - 1, 1)
+        for row_start, row_end, text in groups:
+            caption = f"Table {table_index} (page {page}, rows {row_start}-{row_end} of {num_rows}):"
+            records.append(ChunkRecord(
+                text=f"{caption}\n{text}",
+                document_id=document_id,
+                chunk_index=chunk_index,
+                modality='table',
+                extractor=extractor,
+                page_start=page,
+                page_end=page,
+                # Parsers that keep tables in document order record where the table sits in the text
+                char_start=table.get("char_offset", -1),
+                char_end=table.get("char_offset", -1),
+                extra={
+                    "table_number": table_index,
+                    "table_hash": table_hash,
+                    "row_start": row_start,
+                    "row_end": row_end,
+                    "num_rows": num_rows,
+                    "num_columns": max(len(row) for row in rows),
+                }
+            ))
+            chunk_index += 1
+    logger.info(f"Created {len(records)} table chunks for document {document_id}.")
+    return records
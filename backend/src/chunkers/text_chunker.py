@@ -2,40 +2,18 @@
 
 import re
 from typing import List
-import spacy
-import nltk
 import logging
 import unicodedata
 
-# Initialize SpaCy English model
-try:
-    nlp = spacy.load("en_core_web_lg")  # Upgraded to a larger model for better NER accuracy
-except OSError:
-    logging.info("Downloading 'en_core_web_lg' model...")
-    from spacy.cli import download
-    download("en_core_web_lg")
-    nlp = spacy.load("en_core_web_lg")
+from .records import PAGE_BREAK
+from src.utils.components import components
+from src.utils.instrumentation import span
 
-# Download NLTK punkt tokenizer if not already downloaded
-nltk.download('punkt', quiet=True)
-
-from nltk.tokenize import sent_tokenize
+# spaCy and NLTK are loaded on first use; the spaCy model is the shared
+# components.nlp, and both are provisioned by `python -m src.utils.warmup --provision`.
 
 # Configure logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # Set to DEBUG for detailed logs
-
-# Create console handler with a higher log level
-ch = logging.StreamHandler()
-ch.setLevel(logging.DEBUG)
-
-# Create formatter and add it to the handlers
-formatter = logging.Formatter('%(levelname)s:%(name)s:%(message)s')
-ch.setFormatter(formatter)
-
-# Add the handlers to the logger if not already added
-if not logger.handlers:
-    logger.addHandler(ch)
 
 # ----------------------------
 # Text Cleaning Functions
@@ -83,8 +61,8 @@ def fix_hyphenation_and_spaces(text: str) -> str:
     Corrects hyphenation issues and inserts missing spaces around hyphens.
     """
     logger.debug("Fixing hyphenation and missing spaces...")
-    # Remove hyphens at line breaks
-    text = re.sub(r'-\s*\n\s*', '', text)
+    # Remove hyphens at line breaks, keeping any page break they span
+    text = re.sub(r'-\s*\n\s*', lambda match: PAGE_BREAK if PAGE_BREAK in match.group() else '', text)
     # Add spaces around hyphens if missing
     text = re.sub(r'(?<!\s)([-–—])(?!\s)', r' \1 ', text)
     return text
@@ -187,13 +165,15 @@ def split_into_sentences_spacy(text: str) -> List[str]:
     Splits text into sentences using SpaCy.
     """
     logger.debug("Splitting text into sentences using SpaCy...")
-    doc = nlp(text)
+    doc = components.nlp(text)
     return [sent.text.strip() for sent in doc.sents]
 
 def split_into_sentences_nltk(text: str) -> List[str]:
     """
     Splits text into sentences using NLTK's sentence tokenizer.
     """
+    from nltk.tokenize import sent_tokenize
+
     logger.debug("Splitting text into sentences using NLTK...")
     return sent_tokenize(text)
 
@@ -308,15 +288,32 @@ def chunk_text(text: str, method: str = 'spacy') -> List[str]:
         text (str): The input text.
         method (str, optional): Sentence splitting method ('spacy' or 'nltk'). Defaults to 'spacy'.
     
+    Returns:
+        List[str]: A list of text chunks.
+    """
+    logger.info("Starting text cleaning...")
+    cleaned_text = clean_text(text)
+    return chunk_cleaned_text(cleaned_text, method=method)
+
+def chunk_cleaned_text(cleaned_text: str, method: str = 'spacy') -> List[str]:
+    """
+    Chunks text that has already been through clean_text.
+
+    Use this when the cleaned text is needed elsewhere too (e.g., to locate
+    chunk offsets), so that the text is only cleaned once.
+
+    Args:
+        cleaned_text (str): Output of clean_text.
+        method (str, optional): Sentence splitting method ('spacy' or 'nltk'). Defaults to 'spacy'.
+
     Returns:
         List[str]: A list of text chunks.
     """
     try:
-        logger.info("Starting text cleaning...")
-        cleaned_text = clean_text(text)
-        
         logger.info("Splitting text into sentences...")
-        sentences = split_into_sentences(cleaned_text, method=method)
+        with span("sentence_split") as split_span:
+            sentences = split_into_sentences(cleaned_text, method=method)
+            split_span.items = len(sentences)
         logger.info(f"Total sentences extracted: {len(sentences)}")
         
         logger.info("Grouping sentences into chunks with overlapping context...")
@@ -334,5 +331,5 @@ def chunk_text(text: str, method: str = 'spacy') -> List[str]:
         
         return chunks
     except Exception as e:
-        logger.error(f"Error during chunk_text: {e}")
+        logger.error(f"Error during chunk_cleaned_text: {e}")
         raise
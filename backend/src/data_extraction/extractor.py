@@ -1,41 +1,70 @@
 # backend/src/data_extraction/extractor.py
 
+import os
+import shutil
+import tempfile
 from fastapi import UploadFile
-import PyPDF2
-import io
 import logging
 
+from src.parsers.registry import detect_file_type, parse_file
+
 logger = logging.getLogger(__name__)
 
 async def extract_data_from_file(file: UploadFile) -> str:
     """
     Extract text data from an uploaded file.
 
+    The file type is detected from the content through the parser registry,
+    so uploads share the extraction path of every other entry point.
+
     Args:
         file (UploadFile): The uploaded file.
 
     Returns:
         str: Extracted text.
     """
+    suffix = os.path.splitext(file.filename or '')[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
+        temp_path = temp_file.name
     try:
-        if file.content_type == "text/plain":
-            data = await file.read()
-            text = data.decode('utf-8')
-            logger.info(f"Extracted text from plain text file: {file.filename}")
-            return text
-        elif file.content_type == "application/pdf":
-            data = await file.read()
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
-            text = ""
-            for page_num, page in enumerate(pdf_reader.pages):
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n\n"
-            logger.info(f"Extracted text from PDF file: {file.filename}")
-            return text
-        else:
+        with open(temp_path, 'wb') as buffer:
+            shutil.copyfileobj(file.file, buffer)
+        file_type = detect_file_type(temp_path, file.filename, file.content_type)
+        if file_type is None:
             logger.warning(f"Unsupported file type: {file.content_type}")
             raise ValueError(f"Unsupported file type: {file.content_type}")
+        text = parse_file(temp_path, file_type).text
+        logger.info(f"Extracted text from {file_type} file: {file.filename}")
+        return text
     except Exception as e:
         logger.error(f"Error extracting data from file {file.filename}: {e}")
         raise e
+    finally:
+        os.remove(temp_path)
+
+def extract_data(directory: str) -> str:
+    """
+    Extract the text of every supported file in a directory.
+
+    Args:
+        directory (str): Directory with source documents.
+
+    Returns:
+        str: The texts of all documents, separated by blank lines.
+    """
+    texts = []
+    try:
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if not os.path.isfile(path):
+                continue
+            file_type = detect_file_type(path)
+            if file_type is None:
+                logger.warning(f"Skipping unsupported file: {path}")
+                continue
+            texts.append(parse_file(path, file_type).text)
+            logger.info(f"Extracted text from {file_type} file: {path}")
+    except Exception as e:
+        logger.error(f"Error extracting data from directory {directory}: {e}")
+        raise e
+    return "\n\n".join(texts)
@@ -0,0 +1,160 @@
+# backend/src/embedding/batching_embeddings.py
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List
+import logging
+
+from langchain_core.embeddings import Embeddings
+
+from src.utils.instrumentation import metrics, span
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class _EmbedRequest:
+    texts: List[str]
+    future: Future = field(default_factory=Future)
+
+class BatchingEmbeddings(Embeddings):
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_batch_size: int = 256,
+        max_wait_ms: float = 5.0,
+        max_concurrency: int = 4,
+        batch_queries: bool = True
+    ):
+        """
+        Wraps an embeddings client and coalesces concurrent calls into batched backend calls.
+
+        Callers (request handlers, uploads, from any thread) queue their texts
+        and block until their vectors are back. A dispatcher thread collects
+        queued calls for up to max_wait_ms after the first one, or until
+        max_batch_size texts are waiting, and sends them as one embed_documents
+        call. Up to max_concurrency batches are in flight at once; while they
+        are, calls keep queueing, so batches grow with load. Identical texts in
+        a batch are embedded once. A call that fills a batch on its own skips
+        the queue.
+
+        Args:
+            embeddings (Embeddings): The client to wrap.
+            max_batch_size (int): Texts per backend call; calls are never split across batches.
+            max_wait_ms (float): How long the first queued call waits for others to join it.
+            max_concurrency (int): Batches sent to the backend concurrently.
+            batch_queries (bool): Embed queries through the batches too, with embed_documents.
+                Only valid for clients embedding queries and documents alike (OpenAI, FakeEmbeddings).
+        """
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_concurrency = max_concurrency
+        self.batch_queries = batch_queries
+        self._requests = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_dispatcher(self) -> queue.Queue:
+        # The dispatcher thread is started on first use, and again in a forked process
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    requests = queue.Queue()
+                    executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='embed-batch')
+                    threading.Thread(
+                        target=self._dispatch, args=(requests, executor), name='embed-batcher', daemon=True
+                    ).start()
+                    self._requests = requests
+                    self._pid = os.getpid()
+        return self._requests
+
+    def _dispatch(self, requests: queue.Queue, executor: ThreadPoolExecutor):
+        # Taken before collecting a batch and released once it is embedded: while the
+        # backend is saturated, calls keep queueing and the next batch grows instead
+        slots = threading.Semaphore(self.max_concurrency)
+        carried = None
+        while True:
+            slots.acquire()
+            first = carried or requests.get()
+            carried = None
+            batch = [first]
+            size = len(first.texts)
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = requests.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if size + len(request.texts) > self.max_batch_size:
+                    # Starts the next batch instead
+                    carried = request
+                    break
+                batch.append(request)
+                size += len(request.texts)
+            executor.submit(self._run_batch, batch, slots)
+
+    def _run_batch(self, batch: List[_EmbedRequest], slots: threading.Semaphore):
+        try:
+            self._embed_batch(batch)
+        finally:
+            slots.release()
+
+    def _embed_batch(self, batch: List[_EmbedRequest]):
+        unique = list(dict.fromkeys(text for request in batch for text in request.texts))
+        try:
+            with span("embedding.batch", items=len(unique)):
+                vectors = self.embeddings.embed_documents(unique)
+            if len(vectors) != len(unique):
+                raise ValueError(f"Embeddings client returned {len(vectors)} vectors for {len(unique)} texts.")
+        except Exception as e:
+            logger.error(f"Error embedding a batch of {len(batch)} calls: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        metrics.inc(
+            "rag_embedding_batched_calls_total", "Embedding calls served by batched backend calls.", amount=len(batch)
+        )
+        by_text = dict(zip(unique, vectors))
+        for request in batch:
+            request.future.set_result([by_text[text] for text in request.texts])
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        if len(texts) >= self.max_batch_size:
+            return self.embeddings.embed_documents(texts)
+        request = _EmbedRequest(list(texts))
+        self._ensure_dispatcher().put(request)
+        return request.future.result()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        if not self.batch_queries:
+            return self.embeddings.embed_query(text)
+        return self._embed([text])[0]
+
+    def __getstate__(self):
+        # The queue, lock and dispatcher belong to this process; a copy starts its own
+        state = self.__dict__.copy()
+        state.update(_requests=None, _pid=None, _lock=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Expose attributes of the wrapped client (e.g., FakeEmbeddings.calls). Before
+        # __init__ has run (copy, unpickling) there is no client to delegate to.
+        if name == 'embeddings':
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
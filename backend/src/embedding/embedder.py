@@ -1,32 +1,28 @@
 # backend/src/embedding/embedder.py
 
-import sys
-import os
-
-# Print sys.path for debugging inside embedder.py
-print("sys.path inside embedder.py:")
-for path in sys.path:
-    print(f" - {path}")
-
-from langchain_community.embeddings import OpenAIEmbeddings
 from src.utils.config import Config  # Absolute import based on new structure
 import logging
 
 logger = logging.getLogger(__name__)
 
 class Embedder:
-    def __init__(self):
+    def __init__(self, embeddings=None):
         """
-        Initialize the Embedder with OpenAIEmbeddings.
+        Initialize the Embedder.
+
+        Args:
+            embeddings (Embeddings, optional): Embeddings client to use. Pass the shared
+                client from src.utils.components to avoid creating duplicates. Defaults
+                to a new OpenAIEmbeddings client.
         """
         try:
-            print("Initializing OpenAIEmbeddings...")
-            self.embeddings = OpenAIEmbeddings(openai_api_key=Config.OPENAI_API_KEY)
-            logger.info("OpenAIEmbeddings initialized successfully.")
-            print("OpenAIEmbeddings initialized successfully.")
+            if embeddings is None:
+                from langchain_community.embeddings import OpenAIEmbeddings
+                embeddings = OpenAIEmbeddings(openai_api_key=Config.OPENAI_API_KEY)
+            self.embeddings = embeddings
+            logger.info(f"Embedder initialized with {type(embeddings).__name__}.")
         except Exception as e:
-            logger.error(f"Error initializing OpenAIEmbeddings: {e}")
-            print(f"Error initializing OpenAIEmbeddings: {e}")
+            logger.error(f"Error initializing embeddings client: {e}")
             raise e
 
     def generate_embeddings(self, chunks):
@@ -40,20 +36,17 @@ class Embedder:
             list: A list of embeddings.
         """
         try:
-            logger.info("Generating embeddings for data chunks...")
-            print(f"Generating embeddings for chunks: {chunks}")
+            logger.info("Generating embeddings for %d data chunks...", len(chunks))
             embeddings = self.embeddings.embed_documents(chunks)
             logger.info("Embeddings generated successfully.")
-            print("Embeddings generated successfully.")
             return embeddings
         except Exception as e:
             logger.error(f"Error generating embeddings: {e}")
-            print(f"Error generating embeddings: {e}")
             raise e
 
 def generate_embeddings(chunks):
     """
-    Convenience function to generate embeddings without instantiating the Embedder class.
+    Convenience function to generate embeddings with the shared Embedder.
 
     Args:
         chunks (list): A list of data chunks.
@@ -61,6 +54,5 @@ def generate_embeddings(chunks):
     Returns:
         list: A list of embeddings.
     """
-    print("Calling generate_embeddings function.")
-    embedder = Embedder()
-    return embedder.generate_embeddings(chunks)
+    from src.utils.components import components
+    return components.embedder.generate_embeddings(chunks)
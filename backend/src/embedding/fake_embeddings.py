@@ -0,0 +1,52 @@
+# backend/src/embedding/fake_embeddings.py
+
+import hashlib
+import math
+import re
+import time
+from typing import List
+from langchain_core.embeddings import Embeddings
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+class FakeEmbeddings(Embeddings):
+    def __init__(self, size: int = 256, latency: float = 0.0):
+        """
+        Local stand-in for OpenAIEmbeddings that requires no network or credentials.
+
+        Texts are embedded as L2-normalized hashed bag-of-words vectors, so texts
+        sharing words are similar and similarity search behaves sensibly in tests.
+
+        Args:
+            size (int): Dimensionality of the vectors.
+            latency (float): Seconds each call sleeps to simulate a remote embeddings API.
+        """
+        self.size = size
+        self.latency = latency
+        self.calls = 0
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.size
+        for token in _TOKEN_PATTERN.findall(text.lower()):
+            digest = hashlib.md5(token.encode('utf-8')).digest()
+            vector[int.from_bytes(digest[:4], 'little') % self.size] += 1.0
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm:
+            vector = [value / norm for value in vector]
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of texts.
+        """
+        self.calls += 1
+        time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query.
+        """
+        self.calls += 1
+        time.sleep(self.latency)
+        return self._embed(text)
@@ -0,0 +1,34 @@
+# backend/src/embedding/instrumented_embeddings.py
+
+from typing import List
+from langchain_core.embeddings import Embeddings
+
+from src.utils.instrumentation import span
+
+class InstrumentedEmbeddings(Embeddings):
+    def __init__(self, embeddings: Embeddings):
+        """
+        Wraps an embeddings client and records an 'embedding' span for every call.
+
+        The vector store calls the client internally when it adds texts, so
+        wrapping the client is what separates embedding time from write time.
+
+        Args:
+            embeddings (Embeddings): The client to wrap.
+        """
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with span("embedding", items=len(texts)):
+            return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with span("embedding.query", items=1):
+            return self.embeddings.embed_query(text)
+
+    def __getattr__(self, name):
+        # Expose attributes of the wrapped client (e.g., FakeEmbeddings.calls). Before
+        # __init__ has run (copy, unpickling) there is no client to delegate to.
+        if name == 'embeddings':
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
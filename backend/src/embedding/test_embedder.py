@@ -0,0 +1,93 @@
+# File: backend/src/embedding/test_embedder.py
+
+import copy
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.embedding.batching_embeddings import BatchingEmbeddings
+from src.embedding.fake_embeddings import FakeEmbeddings
+from src.embedding.instrumented_embeddings import InstrumentedEmbeddings
+
+class _RecordingEmbeddings(FakeEmbeddings):
+    """
+    Records the texts of every backend call, and fails them if given an error.
+    """
+    def __init__(self, error: Exception = None):
+        super().__init__()
+        self.error = error
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.batches.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return super().embed_documents(texts)
+
+def test_batching_embeddings_match_the_wrapped_client():
+    fake = FakeEmbeddings()
+    batching = BatchingEmbeddings(fake)
+    assert batching.embed_documents(["a tide", "the moon"]) == fake.embed_documents(["a tide", "the moon"])
+    assert batching.embed_query("a tide") == fake.embed_query("a tide")
+
+def test_batching_embeddings_can_be_copied_and_pickled():
+    batching = BatchingEmbeddings(FakeEmbeddings())
+    batching.embed_query("warm up the dispatcher")
+    for clone in (copy.copy(batching), copy.deepcopy(batching), pickle.loads(pickle.dumps(batching))):
+        assert clone.embed_documents(["a tide"]) == batching.embed_documents(["a tide"])
+        # Delegated to the wrapped client
+        assert clone.size == 256
+
+def test_instrumented_embeddings_can_be_copied_and_pickled():
+    instrumented = InstrumentedEmbeddings(BatchingEmbeddings(FakeEmbeddings()))
+    for clone in (copy.copy(instrumented), pickle.loads(pickle.dumps(instrumented))):
+        assert clone.embed_query("a tide") == instrumented.embed_query("a tide")
+        assert clone.size == 256
+
+def test_concurrent_calls_share_one_backend_call():
+    backend = _RecordingEmbeddings()
+    # The batch closes as soon as every caller has joined, well before max_wait_ms
+    batching = BatchingEmbeddings(backend, max_batch_size=8, max_wait_ms=5000)
+    calls = [["tide", "moon"], ["ocean", "tide"], ["coast", "wave"], ["moon", "sea"]]
+
+    with ThreadPoolExecutor(len(calls)) as pool:
+        results = list(pool.map(batching.embed_documents, calls))
+
+    assert len(backend.batches) == 1
+    # Texts repeated across callers are embedded once
+    assert sorted(backend.batches[0]) == sorted({text for texts in calls for text in texts})
+    assert results == [FakeEmbeddings().embed_documents(texts) for texts in calls]
+
+def test_batch_error_reaches_every_caller():
+    backend = _RecordingEmbeddings(error=RuntimeError("rate limited"))
+    batching = BatchingEmbeddings(backend, max_batch_size=6, max_wait_ms=5000)
+
+    def embed(texts):
+        with pytest.raises(RuntimeError, match="rate limited"):
+            batching.embed_documents(texts)
+        return True
+
+    with ThreadPoolExecutor(3) as pool:
+        assert all(pool.map(embed, [["a", "b"], ["c", "d"], ["e", "f"]]))
+    assert len(backend.batches) == 1
+
+def test_call_that_does_not_fit_starts_the_next_batch():
+    backend = _RecordingEmbeddings()
+    batching = BatchingEmbeddings(backend, max_batch_size=4, max_wait_ms=2000)
+
+    with ThreadPoolExecutor(3) as pool:
+        futures = []
+        for texts in (["a", "b", "c"], ["d", "e"], ["f", "g"]):
+            futures.append(pool.submit(batching.embed_documents, texts))
+            # Queue the calls in this order, well within max_wait_ms
+            time.sleep(0.05)
+        results = [future.result(timeout=5) for future in futures]
+
+    # The second call closes the first batch, and the third joins it in the next
+    assert backend.batches == [["a", "b", "c"], ["d", "e", "f", "g"]]
+    assert results == [FakeEmbeddings().embed_documents(texts) for texts in (["a", "b", "c"], ["d", "e"], ["f", "g"])]
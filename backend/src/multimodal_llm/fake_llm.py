@@ -0,0 +1,107 @@
+# src/multimodal_llm/fake_llm.py
+
+import asyncio
+import time
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class FakeMessage:
+    def __init__(self, content: str):
+        """
+        Minimal stand-in for LangChain's AIMessage / AIMessageChunk.
+
+        Args:
+            content (str): The message content.
+        """
+        self.content = content
+
+class FakeChatModel:
+    def __init__(self, response: str = None, token_delay: float = 0.0, first_token_delay: float = 0.0):
+        """
+        Local stand-in for ChatOpenAI that requires no network or credentials.
+
+        The model answers every prompt with a fixed response (or an echo of the
+        prompt size) and can simulate latency so streaming behaviour, time to
+        first token and cancellation can be exercised locally.
+
+        Args:
+            response (str, optional): Text to answer with. Defaults to a short echo of the prompt size.
+            token_delay (float): Seconds to wait between streamed tokens.
+            first_token_delay (float): Seconds to wait before the first streamed token.
+        """
+        self.response = response
+        self.token_delay = token_delay
+        self.first_token_delay = first_token_delay
+        self.completed_streams = 0
+        self.cancelled_streams = 0
+
+    def _answer(self, prompt: str) -> str:
+        if self.response is not None:
+            return self.response
+        return f"This is a local answer generated from {len(prompt)} characters of context."
+
+    def _tokens(self, prompt: str) -> list:
+        # Keep the separating whitespace on each token so the joined stream equals the answer
+        words = self._answer(prompt).split(' ')
+        return [word if i == len(words) - 1 else word + ' ' for i, word in enumerate(words)]
+
+    def _completion_delay(self, prompt: str) -> float:
+        return self.first_token_delay + self.token_delay * len(self._tokens(prompt))
+
+    def invoke(self, prompt: str) -> FakeMessage:
+        """
+        Return the full answer in one message.
+        """
+        time.sleep(self._completion_delay(prompt))
+        return FakeMessage(self._answer(prompt))
+
+    async def ainvoke(self, prompt: str) -> FakeMessage:
+        """
+        Async variant of invoke.
+        """
+        await asyncio.sleep(self._completion_delay(prompt))
+        return FakeMessage(self._answer(prompt))
+
+    def batch(self, prompts: list) -> list:
+        """
+        Answer several prompts.
+        """
+        return [self.invoke(prompt) for prompt in prompts]
+
+    async def abatch(self, prompts: list) -> list:
+        """
+        Answer several prompts concurrently.
+        """
+        return await asyncio.gather(*[self.ainvoke(prompt) for prompt in prompts])
+
+    def stream(self, prompt: str):
+        """
+        Yield the answer token by token.
+        """
+        time.sleep(self.first_token_delay)
+        for token in self._tokens(prompt):
+            yield FakeMessage(token)
+            time.sleep(self.token_delay)
+
+    async def astream(self, prompt: str):
+        """
+        Asynchronously yield the answer token by token.
+
+        Closing the generator early (e.g. because the client went away) is
+        recorded in ``cancelled_streams`` so callers can verify that upstream
+        work was aborted.
+        """
+        completed = False
+        try:
+            await asyncio.sleep(self.first_token_delay)
+            for token in self._tokens(prompt):
+                yield FakeMessage(token)
+                await asyncio.sleep(self.token_delay)
+            completed = True
+        finally:
+            if completed:
+                self.completed_streams += 1
+            else:
+                self.cancelled_streams += 1
+                logger.info("FakeChatModel stream aborted before completion.")
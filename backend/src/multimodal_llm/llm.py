@@ -1,30 +1,163 @@
 # src/multimodal_llm/llm.py
 
+import asyncio
 import base64
-from src.retrieval.retriever import retrieve_documents
-from src.embedding.embedder import Embedder
-from src.vector_db.vectordb import VectorDB
-from langchain.chat_models import ChatOpenAI  # Updated import based on LangChain version
+import time
+from functools import partial
+from src.retrieval.retriever import retrieve_documents, aretrieve_documents
+from src.utils.components import components
 from src.utils.config import Config
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-# Initialize components
-llm = ChatOpenAI(
-    model_name='gpt-4',  # Verify if 'gpt-4o' was a typo; corrected to 'gpt-4'
-    temperature=0,
-    openai_api_key=Config.OPENAI_API_KEY
-)
-vector_db = VectorDB(Config.REDIS_URL, Config.CHROMA_COLLECTION_NAME)
-embedder = Embedder()
+# The LLM, VectorDB and embeddings client are built lazily by the shared
+# component container on first use (see src/utils/components.py).
 
-def generate_response(query: str) -> dict:
+def get_reranker():
+    """
+    Return the shared reranker when reranking is enabled, else None.
+    """
+    return components.reranker if Config.RERANK_ENABLED else None
+
+def get_doc_store():
+    """
+    Return the shared parent store when the hierarchical index is enabled, else None.
+    """
+    return components.doc_store if Config.HIERARCHICAL_INDEX else None
+
+def process_documents(documents: list) -> list:
+    """
+    Prepare retrieved documents for prompting (e.g., encode images to base64).
+
+    Args:
+        documents (list): Documents returned by retrieve_documents.
+
+    Returns:
+        list: Documents with 'texts' and base64-encoded 'images'. Image chunks
+            get their stored thumbnail attached.
+    """
+    processed_docs = []
+    for doc in documents:
+        doc_texts = doc.get('texts', [])
+        # Encode images to base64 if they exist
+        encoded_images = [load() for _, load in _image_sources(doc)]
+        processed_docs.append({
+            "texts": doc_texts,
+            "images": encoded_images,
+            "metadata": doc.get('metadata', {})
+        })
+    return processed_docs
+
+def collect_sources(processed_docs: list) -> dict:
+    """
+    Flatten processed documents into the sources returned to the client.
+
+    Args:
+        processed_docs (list): Output of process_documents.
+
+    Returns:
+        dict: A dictionary with 'texts' and 'images' lists, plus the chunk
+            'metadata' (document ID, pages, modality, ...) of each document.
+    """
+    sources_texts = []
+    sources_images = []
+    sources_metadata = []
+    for doc in processed_docs:
+        sources_texts.extend(doc.get("texts", []))
+        sources_images.extend(doc.get("images", []))
+        sources_metadata.append(doc.get("metadata", {}))
+    return {
+        "texts": sources_texts,
+        "images": sources_images,
+        "metadata": sources_metadata
+    }
+
+def _encode_image(image: bytes) -> str:
+    return base64.b64encode(image).decode('utf-8')
+
+def _encode_blob(blob_id: str) -> str:
+    return _encode_image(components.blob_store.get(blob_id))
+
+def _image_sources(doc: dict) -> list:
+    """
+    List the images of a retrieved document as (key, loader) pairs.
+
+    Inline images are encoded as is; image chunks reference their thumbnail in
+    the blob store through the 'blob_id' metadata, so the source document never
+    has to be decoded again.
+    """
+    sources = [(hash(image), partial(_encode_image, image)) for image in doc.get('images', [])]
+    blob_id = doc.get('metadata', {}).get('blob_id')
+    if blob_id:
+        sources.append((blob_id, partial(_encode_blob, blob_id)))
+    return sources
+
+class ImageLoader:
+    def __init__(self):
+        """
+        Loads and encodes document images in worker threads, once per image.
+
+        Images can be prefetched as soon as any retrieval leg returns; later calls
+        to process() reuse the in-flight or finished work. One loader can be shared
+        by several queries so that common images are only processed once.
+        """
+        self._tasks = {}
+
+    def prefetch(self, documents: list):
+        """
+        Start loading the images of the given documents in the background.
+
+        Must be called from within the running event loop.
+
+        Args:
+            documents (list): Documents as returned by the retriever.
+        """
+        for doc in documents:
+            for key, load in _image_sources(doc):
+                if key not in self._tasks:
+                    self._tasks[key] = asyncio.ensure_future(asyncio.to_thread(load))
+
+    async def process(self, documents: list) -> list:
+        """
+        Async counterpart of process_documents that reuses prefetched images.
+
+        Args:
+            documents (list): Documents as returned by the retriever.
+
+        Returns:
+            list: Documents with 'texts' and base64-encoded 'images'.
+        """
+        self.prefetch(documents)
+        processed_docs = []
+        for doc in documents:
+            encoded_images = [await self._tasks[key] for key, _ in _image_sources(doc)]
+            processed_docs.append({
+                "texts": doc.get('texts', []),
+                "images": encoded_images,
+                "metadata": doc.get('metadata', {})
+            })
+        return processed_docs
+
+def _extract_answer(answer_response) -> str:
+    """
+    Extract the answer string from an LLM response.
+    """
+    if hasattr(answer_response, 'content'):
+        return answer_response.content  # Extract string content from AIMessage
+    if isinstance(answer_response, str):
+        return answer_response  # Directly assign if it's already a string
+    logger.error("Unexpected response type from LLM.")
+    raise ValueError("LLM returned an unexpected response type.")
+
+def generate_response(query: str, filter: dict = None) -> dict:
     """
     Generate a response for the given query using the RAG pipeline.
 
     Args:
         query (str): The user's query.
+        filter (dict, optional): Metadata filter restricting the searched chunks
+            (see src.vector_db.filters.build_filter).
 
     Returns:
         dict: A dictionary containing the answer and sources.
@@ -33,36 +166,24 @@ def generate_response(query: str) -> dict:
         logger.info("Starting RAG pipeline...")
 
         # Step 1: Retrieve relevant documents
-        documents = retrieve_documents(query, vector_db)
+        documents = retrieve_documents(
+            query, components.vector_db, reranker=get_reranker(), fetch_k=Config.RERANK_FETCH_K, filter=filter,
+            doc_store=get_doc_store(), fetch_factor=Config.PARENT_FETCH_FACTOR
+        )
 
         if not documents:
             logger.warning("No documents retrieved from VectorDB.")
 
         # Step 2: Process documents (e.g., handle images if any)
-        processed_docs = []
-        for doc in documents:
-            doc_texts = doc.get('texts', [])
-            doc_images = doc.get('images', [])
-            # Encode images to base64 if they exist
-            encoded_images = [base64.b64encode(image).decode('utf-8') for image in doc_images]
-            processed_docs.append({
-                "texts": doc_texts,
-                "images": encoded_images
-            })
+        processed_docs = process_documents(documents)
 
         # Step 3: Build prompt
         prompt = build_prompt(query, processed_docs)
 
         # Step 4: Generate answer using LLM
         try:
-            answer_response = llm.invoke(prompt)  # Use 'invoke' instead of '__call__'
-            if hasattr(answer_response, 'content'):
-                answer = answer_response.content  # Extract string content from AIMessage
-            elif isinstance(answer_response, str):
-                answer = answer_response  # Directly assign if it's already a string
-            else:
-                logger.error("Unexpected response type from LLM.")
-                raise ValueError("LLM returned an unexpected response type.")
+            answer_response = components.llm.invoke(prompt)  # Use 'invoke' instead of '__call__'
+            answer = _extract_answer(answer_response)
         except AttributeError as attr_err:
             logger.error(f"Attribute error during LLM invocation: {attr_err}")
             raise
@@ -73,17 +194,7 @@ def generate_response(query: str) -> dict:
         logger.info("RAG pipeline completed successfully.")
 
         # Prepare sources as a dictionary with 'texts' and 'images' keys
-        sources_texts = []
-        sources_images = []
-        for doc in processed_docs:
-            sources_texts.extend(doc.get("texts", []))
-            sources_images.extend(doc.get("images", []))
-
-        # Ensure that sources_texts and sources_images are lists
-        sources = {
-            "texts": sources_texts,
-            "images": sources_images
-        }
+        sources = collect_sources(processed_docs)
 
         return {
             "answer": answer,    # Should be a string
@@ -94,6 +205,184 @@ def generate_response(query: str) -> dict:
         logger.error(f"Error in generate_response: {e}")
         raise e
 
+async def agenerate_response(query: str, k: int = 5, llm_client=None, vector_db_client=None, filter: dict = None) -> dict:
+    """
+    Async variant of generate_response.
+
+    Dense and lexical retrieval run concurrently, images are loaded as soon as
+    either search returns, and the LLM is called through its async client.
+
+    Args:
+        query (str): The user's query.
+        k (int): Number of documents to retrieve.
+        llm_client: Chat model to use. Defaults to the shared LLM.
+        vector_db_client (VectorDB): Vector store to search. Defaults to the shared VectorDB.
+        filter (dict, optional): Metadata filter restricting the searched chunks.
+
+    Returns:
+        dict: A dictionary containing the answer and sources.
+    """
+    try:
+        logger.info("Starting async RAG pipeline...")
+        if llm_client is None:
+            llm_client = await asyncio.to_thread(components.get, 'llm')
+        if vector_db_client is None:
+            vector_db_client = await asyncio.to_thread(components.get, 'vector_db')
+
+        reranker = await asyncio.to_thread(get_reranker)
+        doc_store = await asyncio.to_thread(get_doc_store)
+        loader = ImageLoader()
+        documents = await aretrieve_documents(
+            query, vector_db_client, k, prefetch=loader.prefetch,
+            reranker=reranker, fetch_k=Config.RERANK_FETCH_K, filter=filter,
+            doc_store=doc_store, fetch_factor=Config.PARENT_FETCH_FACTOR
+        )
+        if not documents:
+            logger.warning("No documents retrieved from VectorDB.")
+        processed_docs = await loader.process(documents)
+
+        prompt = build_prompt(query, processed_docs)
+        answer = _extract_answer(await llm_client.ainvoke(prompt))
+
+        logger.info("Async RAG pipeline completed successfully.")
+        return {
+            "answer": answer,
+            "sources": collect_sources(processed_docs)
+        }
+    except Exception as e:
+        logger.error(f"Error in agenerate_response: {e}")
+        raise e
+
+async def agenerate_responses(queries: list, k: int = 5, llm_client=None, vector_db_client=None, filter: dict = None) -> list:
+    """
+    Answer several questions with a single retrieval pass and one batched LLM call.
+
+    All queries are embedded with one embeddings request, their searches run
+    concurrently, images shared between results are loaded once, and the
+    prompts are sent to the LLM together.
+
+    Args:
+        queries (list): The user's queries.
+        k (int): Number of documents to retrieve per query.
+        llm_client: Chat model to use. Defaults to the shared LLM.
+        vector_db_client (VectorDB): Vector store to search. Defaults to the shared VectorDB.
+        filter (dict, optional): Metadata filter applied to every query's search.
+
+    Returns:
+        list: One dictionary with the answer and sources per query, in input order.
+    """
+    if not queries:
+        return []
+    try:
+        logger.info(f"Starting batched RAG pipeline for {len(queries)} queries...")
+        if llm_client is None:
+            llm_client = await asyncio.to_thread(components.get, 'llm')
+        if vector_db_client is None:
+            vector_db_client = await asyncio.to_thread(components.get, 'vector_db')
+
+        reranker = await asyncio.to_thread(get_reranker)
+        doc_store = await asyncio.to_thread(get_doc_store)
+        query_embeddings = await asyncio.to_thread(vector_db_client.embed_queries, list(queries))
+        loader = ImageLoader()
+        documents_per_query = await asyncio.gather(*[
+            aretrieve_documents(
+                query, vector_db_client, k, query_embedding=embedding, prefetch=loader.prefetch,
+                reranker=reranker, fetch_k=Config.RERANK_FETCH_K, filter=filter,
+                doc_store=doc_store, fetch_factor=Config.PARENT_FETCH_FACTOR
+            )
+            for query, embedding in zip(queries, query_embeddings)
+        ])
+        processed_per_query = [await loader.process(documents) for documents in documents_per_query]
+
+        prompts = [build_prompt(query, processed) for query, processed in zip(queries, processed_per_query)]
+        answers = await llm_client.abatch(prompts)
+
+        logger.info("Batched RAG pipeline completed successfully.")
+        return [
+            {"answer": _extract_answer(answer), "sources": collect_sources(processed)}
+            for answer, processed in zip(answers, processed_per_query)
+        ]
+    except Exception as e:
+        logger.error(f"Error in agenerate_responses: {e}")
+        raise e
+
+async def astream_response(query: str, k: int = 5, llm_client=None, vector_db_client=None, filter: dict = None):
+    """
+    Stream a response for the given query using the RAG pipeline.
+
+    Yields events as dictionaries with 'event' and 'data' keys, in order:
+    one 'sources' event with the retrieved sources, one 'token' event per
+    chunk emitted by the LLM, and a final 'done' event with timings.
+
+    Closing this generator early (e.g., on client disconnect) closes the
+    upstream LLM stream, which aborts the in-flight completion request.
+
+    Args:
+        query (str): The user's query.
+        k (int): Number of top similar documents to retrieve.
+        llm_client: Chat model to stream from. Defaults to the shared LLM.
+        vector_db_client (VectorDB): Vector store to search. Defaults to the shared VectorDB.
+        filter (dict, optional): Metadata filter restricting the searched chunks.
+
+    Yields:
+        dict: Stream events.
+    """
+    start_time = time.perf_counter()
+    logger.info("Starting streaming RAG pipeline...")
+
+    # Build (or fetch) the shared clients off the event loop; first use may be slow
+    if llm_client is None:
+        llm_client = await asyncio.to_thread(components.get, 'llm')
+    if vector_db_client is None:
+        vector_db_client = await asyncio.to_thread(components.get, 'vector_db')
+
+    # Same retrieval as agenerate_response: dense and lexical searches run concurrently
+    reranker = await asyncio.to_thread(get_reranker)
+    doc_store = await asyncio.to_thread(get_doc_store)
+    loader = ImageLoader()
+    documents = await aretrieve_documents(
+        query, vector_db_client, k, prefetch=loader.prefetch,
+        reranker=reranker, fetch_k=Config.RERANK_FETCH_K, filter=filter,
+        doc_store=doc_store, fetch_factor=Config.PARENT_FETCH_FACTOR
+    )
+    if not documents:
+        logger.warning("No documents retrieved from VectorDB.")
+    processed_docs = await loader.process(documents)
+    retrieval_ms = (time.perf_counter() - start_time) * 1000
+
+    # Sources go out before any token so the client can render them immediately
+    yield {"event": "sources", "data": collect_sources(processed_docs)}
+
+    prompt = build_prompt(query, processed_docs)
+    ttft_ms = None
+    num_tokens = 0
+    stream = llm_client.astream(prompt)
+    try:
+        async for chunk in stream:
+            token = chunk.content if hasattr(chunk, 'content') else str(chunk)
+            if not token:
+                continue
+            if ttft_ms is None:
+                ttft_ms = (time.perf_counter() - start_time) * 1000
+                logger.info(f"Time to first token: {ttft_ms:.1f} ms")
+            num_tokens += 1
+            yield {"event": "token", "data": {"token": token}}
+    finally:
+        # Runs on normal completion and on cancellation; aborts the upstream call if still open
+        await stream.aclose()
+
+    total_ms = (time.perf_counter() - start_time) * 1000
+    logger.info(f"Streaming RAG pipeline completed: {num_tokens} tokens in {total_ms:.1f} ms.")
+    yield {
+        "event": "done",
+        "data": {
+            "retrieval_ms": round(retrieval_ms, 2),
+            "ttft_ms": round(ttft_ms, 2) if ttft_ms is not None else None,
+            "total_ms": round(total_ms, 2),
+            "num_tokens": num_tokens
+        }
+    }
+
 def build_prompt(query: str, documents: list) -> str:
     """
     Build a prompt for the LLM using the query and retrieved documents.
@@ -0,0 +1,99 @@
+# File: backend/src/multimodal_llm/test_llm.py
+
+import asyncio
+import json
+from contextlib import aclosing
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from src.chunkers.records import ChunkRecord
+from src.embedding.fake_embeddings import FakeEmbeddings
+from src.multimodal_llm.fake_llm import FakeChatModel
+from src.multimodal_llm.llm import astream_response
+from src.utils.components import components
+from src.vector_db.vectordb import VectorDB
+
+ANSWER = "Tides follow the moon."
+
+@pytest.fixture
+def vector_db(tmp_path):
+    """
+    A local vector store with two documents, searched with fake embeddings.
+    """
+    db = VectorDB('', 'test_collection', persist_directory=str(tmp_path), embeddings=FakeEmbeddings())
+    db.add_records([
+        ChunkRecord(text="The moon pulls the oceans and causes tides.", document_id='doc-a', chunk_index=1),
+        ChunkRecord(text="Tides rise twice a day along the coast.", document_id='doc-a', chunk_index=2, page_start=2, page_end=2),
+        ChunkRecord(text="Ocean tides are studied by oceanographers.", document_id='doc-b', chunk_index=1),
+    ])
+    return db
+
+@pytest.fixture
+def llm(vector_db):
+    """
+    The fake LLM and the test vector store, installed as the shared components.
+    """
+    model = FakeChatModel(response=ANSWER)
+    components.override('llm', model)
+    components.override('vector_db', vector_db)
+    yield model
+    components.reset()
+
+def _events(body: str) -> list:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_query_streams_sources_then_tokens_then_done(llm):
+    response = TestClient(app).post("/api/query", json={"query": "What causes tides?", "k": 2})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "sources"
+    assert names[-1] == "done"
+    assert set(names[1:-1]) == {"token"}
+    assert "".join(data["token"] for name, data in events if name == "token") == ANSWER
+    assert events[0][1]["texts"]
+    assert events[-1][1]["num_tokens"] == len(names) - 2
+    assert llm.completed_streams == 1
+
+def test_closing_the_stream_aborts_the_llm_call(vector_db):
+    model = FakeChatModel(response="one two three four five", token_delay=0.01)
+
+    async def consume_first_token():
+        received = []
+        async with aclosing(astream_response("tides", k=2, llm_client=model, vector_db_client=vector_db)) as events:
+            async for event in events:
+                received.append(event["event"])
+                if event["event"] == "token":
+                    break
+        return received
+
+    assert asyncio.run(consume_first_token()) == ["sources", "token"]
+    assert model.cancelled_streams == 1
+    assert model.completed_streams == 0
+
+def test_query_filters_restrict_the_sources(llm):
+    client = TestClient(app)
+
+    response = client.post("/api/query", json={"query": "tides", "k": 5, "document_id": "doc-b"})
+    sources = _events(response.text)[0][1]
+    assert sources["metadata"]
+    assert {metadata["document_id"] for metadata in sources["metadata"]} == {"doc-b"}
+
+    response = client.post("/api/query", json={"query": "tides", "k": 5, "document_id": "doc-a", "page_start": 2})
+    sources = _events(response.text)[0][1]
+    assert [(metadata["document_id"], metadata["page_start"]) for metadata in sources["metadata"]] == [("doc-a", 2)]
+
+@pytest.mark.parametrize("k", [0, -1, 10_000])
+def test_query_rejects_out_of_range_k(llm, k):
+    response = TestClient(app).post("/api/query", json={"query": "tides", "k": k})
+
+    assert response.status_code == 422
+    assert llm.completed_streams == 0
@@ -0,0 +1,130 @@
+# File: backend/src/parsers/audio_parser.py
+
+import os
+import wave
+from dataclasses import dataclass
+from typing import Iterator
+import logging
+
+from pydub import AudioSegment
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class AudioWindow:
+    """
+    A fixed-size window of decoded audio; times are in milliseconds from the start.
+    """
+    index: int
+    start_ms: int
+    end_ms: int
+    segment: AudioSegment
+
+def _is_wav(file_path: str) -> bool:
+    return os.path.splitext(file_path)[1].lower() == '.wav'
+
+def get_audio_duration(file_path: str) -> float:
+    """
+    Returns the duration of an audio file in seconds without decoding it.
+
+    WAV headers are read directly; other formats are probed with ffprobe.
+
+    Args:
+        file_path (str): Path to the audio file.
+
+    Returns:
+        float: Duration in seconds.
+    """
+    if _is_wav(file_path):
+        with wave.open(file_path, 'rb') as wav_file:
+            return wav_file.getnframes() / wav_file.getframerate()
+    from pydub.utils import mediainfo
+
+    return float(mediainfo(file_path)['duration'])
+
+def _read_wav_window(file_path: str, start_seconds: float, duration_seconds: float) -> AudioSegment:
+    """
+    Reads one window of a WAV file by seeking to its first frame.
+
+    pydub slices WAV files only after decoding them completely, so windows are
+    read with the standard library instead.
+    """
+    with wave.open(file_path, 'rb') as wav_file:
+        frame_rate = wav_file.getframerate()
+        wav_file.setpos(min(int(start_seconds * frame_rate), wav_file.getnframes()))
+        data = wav_file.readframes(int(duration_seconds * frame_rate))
+        return AudioSegment(
+            data=data,
+            sample_width=wav_file.getsampwidth(),
+            frame_rate=frame_rate,
+            channels=wav_file.getnchannels()
+        )
+
+def read_audio_window(file_path: str, start_seconds: float, duration_seconds: float) -> AudioSegment:
+    """
+    Decodes only the requested part of an audio file.
+
+    Args:
+        file_path (str): Path to the audio file.
+        start_seconds (float): Window start.
+        duration_seconds (float): Window length.
+
+    Returns:
+        AudioSegment: The decoded window.
+    """
+    if _is_wav(file_path):
+        return _read_wav_window(file_path, start_seconds, duration_seconds)
+    # ffmpeg seeks and stops decoding at the window bounds
+    return AudioSegment.from_file(file_path, start_second=start_seconds, duration=duration_seconds)
+
+def iter_audio_windows(
+    file_path: str,
+    window_seconds: float = 30.0,
+    overlap_seconds: float = 0.0,
+    frame_rate: int = 16000
+) -> Iterator[AudioWindow]:
+    """
+    Decodes an audio file lazily in fixed-size windows.
+
+    Only one window is decoded at a time, so memory use does not depend on the
+    recording length. Windows are converted to mono at the given frame rate,
+    which is what speech recognizers expect.
+
+    Args:
+        file_path (str): Path to the audio file.
+        window_seconds (float): Window length in seconds.
+        overlap_seconds (float): Overlap between consecutive windows, so words on a boundary are not cut.
+        frame_rate (int): Output sample rate in Hz.
+
+    Yields:
+        AudioWindow: Windows in time order.
+    """
+    if overlap_seconds >= window_seconds:
+        raise ValueError("overlap_seconds must be smaller than window_seconds.")
+
+    try:
+        duration = get_audio_duration(file_path)
+    except Exception as e:
+        logger.error(f"Failed to read audio duration: {e}")
+        raise e
+    logger.info(f"Decoding {duration:.1f}s of audio from {file_path} in {window_seconds}s windows.")
+
+    step = window_seconds - overlap_seconds
+    index = 0
+    start = 0.0
+    while start < duration:
+        length = min(window_seconds, duration - start)
+        try:
+            segment = read_audio_window(file_path, start, length)
+        except Exception as e:
+            logger.error(f"Failed to decode audio window at {start:.1f}s: {e}")
+            raise e
+        segment = segment.set_channels(1).set_frame_rate(frame_rate)
+        yield AudioWindow(
+            index=index,
+            start_ms=int(start * 1000),
+            end_ms=int((start + length) * 1000),
+            segment=segment
+        )
+        index += 1
+        start += step
@@ -0,0 +1,143 @@
+# File: backend/src/parsers/docx_parser.py
+
+import zipfile
+from typing import Dict, List, Tuple
+import logging
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_BODY = _W + 'body'
+_P = _W + 'p'
+_R = _W + 'r'
+_T = _W + 't'
+_TAB = _W + 'tab'
+_BR = _W + 'br'
+_CR = _W + 'cr'
+_TBL = _W + 'tbl'
+_TR = _W + 'tr'
+_TC = _W + 'tc'
+_GRID_SPAN = _W + 'gridSpan'
+_V_MERGE = _W + 'vMerge'
+_VAL = _W + 'val'
+# Text boxes and shapes, which python-docx leaves out of paragraph text. Word
+# writes each one twice: as DrawingML in mc:Choice and as VML in mc:Fallback.
+_SKIPPED = (_W + 'txbxContent', '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback')
+
+def extract_docx(file_path: str) -> Tuple[str, List[Dict]]:
+    """
+    Extracts paragraphs and tables from a DOCX file in a single streaming pass over its body XML.
+
+    Paragraph text is returned like python-docx's paragraphs joined by newlines.
+    Each table records in 'char_offset' where it sits in that text, so tables
+    keep their position in the document. Merged cells are reported once:
+    a cell spanning several grid columns is followed by empty cells, and the
+    continuation cells of a vertical merge are empty, where python-docx
+    would repeat the merged cell's text. Text boxes and shapes are skipped,
+    as python-docx does.
+
+    Args:
+        file_path (str): Path to the DOCX file.
+
+    Returns:
+        Tuple[str, List[Dict]]: The text and the tables ({"page_number",
+            "table_number", "char_offset", "rows": [{"cells": [...]}]}).
+    """
+    logger.info(f"Extracting text and tables from DOCX: {file_path}")
+    paragraphs: List[str] = []
+    text_length = 0
+    tables: List[Dict] = []
+
+    paragraph_depth = 0
+    run_text: List[str] = []
+    table_depth = 0
+    rows: List[Dict] = []
+    row: List[str] = []
+    cell_paragraphs: List[str] = []
+    cell_span = 1
+    cell_continues_merge = False
+    skip_depth = 0
+
+    try:
+        with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as document_xml:
+            for event, elem in etree.iterparse(document_xml, events=('start', 'end'), huge_tree=True):
+                tag = elem.tag
+                if tag in _SKIPPED:
+                    skip_depth += 1 if event == 'start' else -1
+                    continue
+                if skip_depth:
+                    continue
+                if event == 'start':
+                    if tag == _P:
+                        if paragraph_depth == 0:
+                            run_text = []
+                        paragraph_depth += 1
+                    elif tag == _TBL:
+                        table_depth += 1
+                        if table_depth == 1:
+                            rows = []
+                    elif table_depth == 1 and tag == _TR:
+                        row = []
+                    elif table_depth == 1 and tag == _TC:
+                        cell_paragraphs = []
+                        cell_span = 1
+                        cell_continues_merge = False
+                    continue
+
+                # event == 'end'
+                if tag == _T:
+                    run_text.append(elem.text or '')
+                elif tag in (_TAB, _BR, _CR) and elem.getparent().tag == _R:
+                    # Only run content; w:tab also defines tab stops in w:pPr/w:tabs
+                    run_text.append('\t' if tag == _TAB else '\n')
+                elif tag == _P:
+                    paragraph_depth -= 1
+                    if paragraph_depth == 0:
+                        text = ''.join(run_text)
+                        if table_depth:
+                            cell_paragraphs.append(text)
+                        else:
+                            text_length += len(text) + (1 if paragraphs else 0)
+                            paragraphs.append(text)
+                            # Top-level paragraphs are done; free them as the body grows
+                            _release(elem)
+                elif table_depth == 1 and tag == _GRID_SPAN:
+                    cell_span = max(1, int(elem.get(_VAL, '1')))
+                elif table_depth == 1 and tag == _V_MERGE:
+                    # <w:vMerge/> without a value continues the merge started above
+                    cell_continues_merge = elem.get(_VAL, 'continue') == 'continue'
+                elif table_depth == 1 and tag == _TC:
+                    text = '' if cell_continues_merge else '\n'.join(cell_paragraphs).strip()
+                    row.append(text)
+                    row.extend([''] * (cell_span - 1))
+                elif table_depth == 1 and tag == _TR:
+                    if any(row):
+                        rows.append({"cells": row})
+                elif tag == _TBL:
+                    table_depth -= 1
+                    if table_depth == 0:
+                        tables.append({
+                            "page_number": 0,  # DOCX doesn't have pages
+                            "table_number": len(tables) + 1,
+                            "char_offset": text_length,
+                            "rows": rows
+                        })
+                        _release(elem)
+    except Exception as e:
+        logger.error(f"Failed to extract text from DOCX: {e}")
+        raise e
+    logger.info(f"Extracted {len(paragraphs)} paragraphs and {len(tables)} tables from {file_path}.")
+    return '\n'.join(paragraphs), tables
+
+def _release(elem):
+    """
+    Clears a finished body-level element and drops the body's earlier children.
+    """
+    parent = elem.getparent()
+    if parent is None or parent.tag != _BODY:
+        return
+    elem.clear()
+    while elem.getprevious() is not None:
+        del parent[0]
@@ -0,0 +1,219 @@
+# File: backend/src/parsers/html_parser.py
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+import logging
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Elements whose whole subtree is never content. <header> is kept because
+# articles often put their title in one; page banners are caught by role.
+SKIP_TAGS = {
+    'head', 'script', 'style', 'noscript', 'template', 'iframe', 'svg', 'canvas',
+    'nav', 'footer', 'aside', 'form', 'button', 'select',
+}
+
+# Elements that end a run of text; their text is emitted as a separate block
+BLOCK_TAGS = {
+    'html', 'body', 'main', 'article', 'section', 'div', 'p', 'pre', 'blockquote',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'dl', 'dt', 'dd',
+    'figure', 'figcaption', 'address', 'hr', 'br',
+}
+
+BOILERPLATE_ROLES = {'navigation', 'banner', 'contentinfo', 'complementary', 'search'}
+
+# Matched against class and id attributes
+BOILERPLATE_PATTERN = re.compile(
+    r'(^|[\s_-])(nav|navbar|menu|breadcrumbs?|sidebar|footer|masthead|cookie|banner|advert|ads|'
+    r'share|social|related|comments?|popup|modal|subscribe|newsletter)($|[\s_-])',
+    re.IGNORECASE
+)
+
+HTML_EXTENSIONS = ('.html', '.htm')
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.split())
+
+def _is_boilerplate(elem) -> bool:
+    if elem.tag in SKIP_TAGS:
+        return True
+    if elem.get('role', '').lower() in BOILERPLATE_ROLES or elem.get('aria-hidden') == 'true':
+        return True
+    hints = f"{elem.get('class', '')} {elem.get('id', '')}"
+    return bool(BOILERPLATE_PATTERN.search(hints))
+
+def _is_block(elem) -> bool:
+    return elem.tag in BLOCK_TAGS or elem.tag == 'table'
+
+def _take_text(parent, stop=None) -> str:
+    """
+    Collects and removes the not yet emitted text of an element, up to the child ``stop``.
+
+    That is the element's own text plus, for each earlier child, its text if it
+    is inline and its tail. Block children have been emitted (and cleared)
+    already, so only their tails remain. Consumed children are removed so the
+    tree does not grow with the document.
+    """
+    if parent.text is None and (not len(parent) or parent[0] is stop):
+        return ''
+    parts = [parent.text or '']
+    parent.text = None
+    for child in list(parent):
+        if child is stop:
+            break
+        if isinstance(child.tag, str) and not _is_block(child):
+            parts.extend(child.itertext())
+        parts.append(child.tail or '')
+        parent.remove(child)
+    return _normalize(' '.join(parts))
+
+def _table_rows(table) -> List[Dict]:
+    """
+    Converts a <table> element into rows of cell strings.
+
+    Rows of nested tables are not included separately; their text ends up in
+    the enclosing cell. Cells spanning several columns are repeated so that
+    columns stay aligned.
+    """
+    rows = []
+    for tr in table.iter('tr'):
+        if next(tr.iterancestors('table'), None) is not table:
+            continue
+        cells = []
+        for cell in tr:
+            if cell.tag not in ('td', 'th'):
+                continue
+            text = _normalize(' '.join(cell.itertext()))
+            try:
+                colspan = max(1, int(cell.get('colspan', '1')))
+            except ValueError:
+                colspan = 1
+            cells.extend([text] * colspan)
+        if any(cells):
+            rows.append({"cells": cells})
+    return rows
+
+def extract_html(file_path: str) -> Tuple[str, List[Dict]]:
+    """
+    Extracts the main text and the tables of an HTML file in a single streaming pass.
+
+    The document is parsed incrementally with lxml's iterparse. Every finished
+    block is emitted and cleared right away, so only the path from the root
+    to the current element stays in memory. Navigation, headers, footers,
+    scripts and similar boilerplate are skipped. Tables use the same structure
+    as app.utils.extract_tables.
+
+    Args:
+        file_path (str): Path to the HTML file.
+
+    Returns:
+        Tuple[str, List[Dict]]: The text, with blocks separated by blank lines, and the tables.
+    """
+    logger.info(f"Extracting text and tables from HTML: {file_path}")
+    blocks = []
+    tables = []
+    skip_root = None
+    table_depth = 0
+    try:
+        context = etree.iterparse(
+            file_path, events=('start', 'end'), html=True, recover=True, huge_tree=True, remove_comments=True
+        )
+        for event, elem in context:
+            if not isinstance(elem.tag, str):
+                continue
+            tag = elem.tag.lower()
+
+            if event == 'start':
+                if skip_root is not None:
+                    continue
+                if table_depth == 0 and _is_block(elem):
+                    # Text before a block belongs to a block of its own; emit it first to keep document order
+                    parent = elem.getparent()
+                    if parent is not None:
+                        text = _take_text(parent, stop=elem)
+                        if text:
+                            blocks.append(text)
+                if _is_boilerplate(elem):
+                    skip_root = elem
+                elif tag == 'table':
+                    table_depth += 1
+                continue
+
+            # event == 'end'
+            if skip_root is not None:
+                if elem is skip_root:
+                    skip_root = None
+                    elem.clear(keep_tail=True)
+                continue
+
+            if tag == 'table':
+                table_depth -= 1
+                if table_depth == 0:
+                    rows = _table_rows(elem)
+                    if rows:
+                        tables.append({
+                            "page_number": 0,  # HTML has no pages
+                            "table_number": len(tables) + 1,
+                            "rows": rows
+                        })
+                    elem.clear(keep_tail=True)
+            elif tag in BLOCK_TAGS and table_depth == 0:
+                text = _take_text(elem)
+                if text:
+                    blocks.append(text)
+                # Children are done; keep the tail, which belongs to the parent's text
+                elem.clear(keep_tail=True)
+    except Exception as e:
+        logger.error(f"Failed to extract text from HTML: {e}")
+        raise e
+    logger.info(f"Extracted {len(blocks)} text blocks and {len(tables)} tables from {file_path}.")
+    return "\n\n".join(blocks), tables
+
+def _extract_html_safe(file_path: str) -> Dict:
+    try:
+        text, tables = extract_html(file_path)
+        return {"path": file_path, "text": text, "tables": tables, "error": None}
+    except Exception as e:
+        return {"path": file_path, "text": "", "tables": [], "error": str(e)}
+
+def find_html_files(directory: str) -> List[str]:
+    """
+    Lists the HTML files under a directory, recursively and in sorted order.
+    """
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(HTML_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+def crawl_html_directory(directory: str, max_workers: int = None) -> Iterator[Dict]:
+    """
+    Extracts every HTML file under a directory of saved pages using a process pool.
+
+    Parsing is CPU-bound, so files are spread over worker processes. Results
+    are yielded in file order as they become available; files that fail to
+    parse are logged and reported with their error instead of aborting the crawl.
+
+    Args:
+        directory (str): Directory to crawl.
+        max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+
+    Yields:
+        Dict: {"path", "text", "tables", "error"} per file.
+    """
+    paths = find_html_files(directory)
+    logger.info(f"Crawling {len(paths)} HTML files in {directory}.")
+    if not paths:
+        return
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        chunksize = max(1, len(paths) // (max_workers * 4))
+        for result in executor.map(_extract_html_safe, paths, chunksize=chunksize):
+            if result["error"]:
+                logger.error(f"Failed to extract {result['path']}: {result['error']}")
+            yield result
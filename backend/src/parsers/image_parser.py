@@ -0,0 +1,127 @@
+# File: backend/src/parsers/image_parser.py
+
+import io
+from dataclasses import dataclass
+from typing import Iterator, List
+import logging
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ExtractedImage:
+    """
+    An image embedded in a document, decoded once at extraction time.
+
+    ``image`` holds the decoded (RGB) image for OCR and captioning and can be
+    dropped afterwards; ``thumbnail_blob_id`` points at the stored thumbnail.
+    """
+    page_number: int
+    image_number: int
+    width: int
+    height: int
+    phash: int
+    thumbnail_blob_id: str
+    image: Image.Image = None
+
+def perceptual_hash(image: Image.Image, hash_size: int = 8) -> int:
+    """
+    Computes a difference hash (dHash), a perceptual hash robust to scaling and re-encoding.
+
+    Args:
+        image (Image.Image): The image.
+        hash_size (int): Hash side length; the hash has hash_size * hash_size bits.
+
+    Returns:
+        int: The hash as an integer.
+    """
+    grayscale = image.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = list(grayscale.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+def hamming_distance(hash_a: int, hash_b: int) -> int:
+    return bin(hash_a ^ hash_b).count('1')
+
+def make_thumbnail(image: Image.Image, max_size: int = 256, quality: int = 85) -> bytes:
+    """
+    Downscales the image to fit in max_size x max_size and encodes it as JPEG.
+    """
+    thumbnail = image.copy()
+    thumbnail.thumbnail((max_size, max_size))
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format='JPEG', quality=quality)
+    return buffer.getvalue()
+
+def extract_images_from_pdf(
+    file_path: str,
+    blob_store,
+    min_size: int = 32,
+    thumbnail_size: int = 256,
+    dedupe_distance: int = 4
+) -> Iterator[ExtractedImage]:
+    """
+    Extracts the embedded images of a PDF with PyMuPDF, one page at a time.
+
+    Images smaller than min_size on either side (icons, rules) are skipped, and
+    images whose perceptual hash is within dedupe_distance bits of an earlier
+    image (logos, repeated figures) are reported only once. A thumbnail of
+    every unique image is written to the blob store.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        blob_store (BlobStore): Store for the thumbnails.
+        min_size (int): Minimum width and height in pixels.
+        thumbnail_size (int): Maximum thumbnail side in pixels.
+        dedupe_distance (int): Maximum Hamming distance between hashes of duplicates.
+
+    Yields:
+        ExtractedImage: Unique images in document order.
+    """
+    import fitz  # PyMuPDF
+
+    logger.info(f"Extracting images from PDF: {file_path}")
+    seen_xrefs = set()
+    seen_hashes: List[int] = []
+    image_number = 0
+    try:
+        with fitz.open(file_path) as doc:
+            for page_num, page in enumerate(doc, 1):
+                for image_info in page.get_images(full=True):
+                    xref = image_info[0]
+                    # The same image object reused on several pages is decoded only once
+                    if xref in seen_xrefs:
+                        continue
+                    seen_xrefs.add(xref)
+                    extracted = doc.extract_image(xref)
+                    if not extracted or extracted["width"] < min_size or extracted["height"] < min_size:
+                        continue
+                    try:
+                        image = Image.open(io.BytesIO(extracted["image"])).convert('RGB')
+                    except Exception as e:
+                        logger.warning(f"Skipping undecodable image {xref} on page {page_num}: {e}")
+                        continue
+                    phash = perceptual_hash(image)
+                    if any(hamming_distance(phash, seen) <= dedupe_distance for seen in seen_hashes):
+                        logger.debug("Skipping duplicate image %s on page %d.", xref, page_num)
+                        continue
+                    seen_hashes.append(phash)
+                    image_number += 1
+                    yield ExtractedImage(
+                        page_number=page_num,
+                        image_number=image_number,
+                        width=extracted["width"],
+                        height=extracted["height"],
+                        phash=phash,
+                        thumbnail_blob_id=blob_store.put(make_thumbnail(image, thumbnail_size)),
+                        image=image
+                    )
+    except Exception as e:
+        logger.error(f"Failed to extract images from PDF: {e}")
+        raise e
+    logger.info(f"Extracted {image_number} unique images from {file_path}.")
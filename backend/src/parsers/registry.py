@@ -0,0 +1,313 @@
+# File: backend/src/parsers/registry.py
+
+import os
+import zipfile
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Number of leading bytes read for content sniffing
+SNIFF_BYTES = 2048
+
+@dataclass
+class ParsedDocument:
+    """
+    Text and tables extracted from a file.
+
+    Tables use the structure of app.utils.extract_tables
+    ({"page_number", "table_number", "rows": [{"cells": [...]}]}), and are
+    reported under tables_key, which defaults to the file type.
+    """
+    text: str
+    file_type: str
+    tables: List[Dict] = field(default_factory=list)
+    tables_key: str = ''
+
+@dataclass(frozen=True)
+class ParserSpec:
+    """
+    A registered parser and the content it handles.
+
+    Attributes:
+        name: File type name, e.g. 'pdf'.
+        parse: Extracts a ParsedDocument from a file path.
+        magic: Byte signatures; a file matches when its first bytes start with one.
+        sniff: Custom check on (first bytes, path) for formats a prefix cannot identify.
+        mime_types / extensions: Used only when no parser recognizes the content.
+        iter_text: Yields text incrementally with bounded memory, for parsers that can stream.
+        paged: Whether the text marks page ends with PAGE_BREAK.
+        declared_only: Whether matching content also needs a declared extension or MIME type
+            of this parser (for catch-all formats such as plain text).
+    """
+    name: str
+    parse: Callable[[str], ParsedDocument]
+    magic: Tuple[bytes, ...] = ()
+    sniff: Optional[Callable[[bytes, str], bool]] = None
+    mime_types: Tuple[str, ...] = ()
+    extensions: Tuple[str, ...] = ()
+    iter_text: Optional[Callable[[str], Iterator[str]]] = None
+    paged: bool = False
+    declared_only: bool = False
+
+    @property
+    def streaming(self) -> bool:
+        return self.iter_text is not None
+
+    def matches(self, header: bytes, file_path: str) -> bool:
+        if any(header.startswith(signature) for signature in self.magic):
+            return True
+        return self.sniff is not None and self.sniff(header, file_path)
+
+    def declared(self, extension: str, content_type: Optional[str]) -> bool:
+        return extension in self.extensions or (content_type is not None and content_type in self.mime_types)
+
+# ----------------------------
+# Sniffers
+# ----------------------------
+
+def _sniff_pdf(header: bytes, file_path: str) -> bool:
+    # The PDF header may be preceded by junk within the first kilobyte
+    return b'%PDF-' in header[:1024]
+
+def _sniff_docx(header: bytes, file_path: str) -> bool:
+    if not header.startswith(b'PK\x03\x04'):
+        return False
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            return 'word/document.xml' in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+_HTML_PREFIXES = ('<!doctype html', '<html', '<head', '<body')
+
+def _sniff_html(header: bytes, file_path: str) -> bool:
+    text = header.decode('utf-8', errors='ignore').lstrip('\ufeff \t\r\n').lower()
+    if text.startswith(_HTML_PREFIXES):
+        return True
+    # Leading comments or an XML declaration (XHTML)
+    return text.startswith(('<!--', '<?xml')) and '<html' in text
+
+# Byte order marks of UTF-8 and UTF-16 text; FF FE would pass for an MPEG frame sync
+_TEXT_BOMS = (b'\xef\xbb\xbf', b'\xff\xfe', b'\xfe\xff')
+
+def _sniff_audio(header: bytes, file_path: str) -> bool:
+    if header.startswith(_TEXT_BOMS):
+        return False
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return True
+    if header[4:8] == b'ftyp' and header[8:11] == b'M4A':
+        return True
+    # MPEG audio frame sync without an ID3 tag
+    return len(header) > 1 and header[0] == 0xFF and (header[1] & 0xE0) == 0xE0
+
+def _sniff_text(header: bytes, file_path: str) -> bool:
+    if b'\x00' in header:
+        return False
+    try:
+        header.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character may be cut off at the end of the sniffed bytes
+        return e.start >= len(header) - 3
+    return True
+
+# ----------------------------
+# Parsers
+# ----------------------------
+
+def _parse_pdf(file_path: str) -> ParsedDocument:
+    from src.parsers.pdf_parser import extract_pdf_text
+
+    return ParsedDocument(text=extract_pdf_text(file_path), file_type='pdf')
+
+def _iter_pdf(file_path: str) -> Iterator[str]:
+    from src.parsers.pdf_parser import iter_pdf_pages
+    from src.chunkers.records import PAGE_BREAK
+
+    for page_text in iter_pdf_pages(file_path):
+        yield page_text + "\n" + PAGE_BREAK
+
+def _parse_docx(file_path: str) -> ParsedDocument:
+    from src.parsers.docx_parser import extract_docx
+
+    text, tables = extract_docx(file_path)
+    # Same key as the python-docx extractor that DOCX tables were reported under before
+    return ParsedDocument(text=text, file_type='docx', tables=tables, tables_key='python-docx')
+
+def _parse_html(file_path: str) -> ParsedDocument:
+    from src.parsers.html_parser import extract_html
+
+    text, tables = extract_html(file_path)
+    return ParsedDocument(text=text, file_type='html', tables=tables)
+
+def _iter_audio(file_path: str) -> Iterator[str]:
+    from src.parsers.audio_parser import iter_audio_windows
+    from src.chunkers.audio_chunker import transcribe_windows
+    from src.utils.components import components
+
+    windows = iter_audio_windows(
+        file_path, window_seconds=Config.AUDIO_WINDOW_SECONDS, overlap_seconds=Config.AUDIO_OVERLAP_SECONDS
+    )
+    for _, text in transcribe_windows(windows, components.recognizer, max_workers=Config.AUDIO_WORKERS):
+        if text:
+            yield text + "\n\n"
+
+def _parse_audio(file_path: str) -> ParsedDocument:
+    return ParsedDocument(text="".join(_iter_audio(file_path)), file_type='audio')
+
+def _iter_txt(file_path: str, block_size: int = 1 << 16) -> Iterator[str]:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for block in iter(lambda: f.read(block_size), ''):
+            yield block
+
+def _parse_txt(file_path: str) -> ParsedDocument:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return ParsedDocument(text=f.read(), file_type='txt')
+
+# ----------------------------
+# Registry
+# ----------------------------
+
+_PARSERS: List[ParserSpec] = []
+
+def register_parser(spec: ParserSpec, before: Optional[str] = None):
+    """
+    Registers a parser, replacing any parser with the same name.
+
+    Parsers are tried in registration order, so specific formats must come
+    before catch-all ones such as plain text.
+
+    Args:
+        spec (ParserSpec): The parser.
+        before (str, optional): Name of a registered parser to insert in front of.
+    """
+    global _PARSERS
+    parsers = [parser for parser in _PARSERS if parser.name != spec.name]
+    names = [parser.name for parser in parsers]
+    position = names.index(before) if before in names else len(parsers)
+    parsers.insert(position, spec)
+    _PARSERS = parsers
+
+def get_parser(name: str) -> ParserSpec:
+    for spec in _PARSERS:
+        if spec.name == name:
+            return spec
+    raise KeyError(f"No parser registered for file type: {name}")
+
+def registered_parsers() -> List[ParserSpec]:
+    return list(_PARSERS)
+
+def read_header(file_path: str, size: int = SNIFF_BYTES) -> bytes:
+    with open(file_path, 'rb') as f:
+        return f.read(size)
+
+def detect_file_type(file_path: str, filename: Optional[str] = None, content_type: Optional[str] = None) -> Optional[str]:
+    """
+    Determines the type of a file from its first bytes.
+
+    The declared file name and MIME type are only consulted when no parser
+    recognizes the content, and for catch-all parsers (plain text), which
+    also need the content to be declared as theirs; they are never trusted
+    over the content.
+
+    Args:
+        file_path (str): Path to the file.
+        filename (str, optional): Original file name, e.g. of an upload.
+        content_type (str, optional): Declared MIME type.
+
+    Returns:
+        Optional[str]: The file type (parser name), or None if unsupported.
+    """
+    header = read_header(file_path)
+    extension = os.path.splitext(filename or file_path)[1].lower()
+    # Parameters such as "; charset=utf-8" do not change the type
+    content_type = content_type.split(';')[0].strip().lower() if content_type else None
+    for spec in _PARSERS:
+        if spec.matches(header, file_path) and (not spec.declared_only or spec.declared(extension, content_type)):
+            return spec.name
+
+    for spec in _PARSERS:
+        if spec.declared(extension, content_type):
+            logger.info(f"Content of {filename or file_path} not recognized; using declared type '{spec.name}'.")
+            return spec.name
+    return None
+
+def parse_file(
+    file_path: str,
+    file_type: Optional[str] = None,
+    on_text: Optional[Callable[[str], None]] = None
+) -> ParsedDocument:
+    """
+    Extracts text (and tables, where the parser provides them) from a file.
+
+    Args:
+        file_path (str): Path to the file.
+        file_type (str, optional): Parser to use. Detected from the content when omitted.
+        on_text (Callable[[str], None], optional): Receives the text in order, piece by
+            piece (e.g. page by page) as a streaming parser extracts it, else all at once.
+
+    Returns:
+        ParsedDocument: The extracted content.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    file_type = file_type or detect_file_type(file_path)
+    if file_type is None:
+        raise ValueError(f"Unsupported file type: {file_path}")
+    try:
+        spec = get_parser(file_type)
+        if on_text is None:
+            return spec.parse(file_path)
+        if spec.streaming:
+            pieces = []
+            for piece in spec.iter_text(file_path):
+                on_text(piece)
+                pieces.append(piece)
+            return ParsedDocument(text="".join(pieces), file_type=spec.name)
+        parsed = spec.parse(file_path)
+        on_text(parsed.text)
+        return parsed
+    except Exception as e:
+        logger.error(f"Error parsing {file_path} as {file_type}: {e}")
+        raise e
+
+def iter_file_text(file_path: str, file_type: Optional[str] = None) -> Iterator[str]:
+    """
+    Yields the text of a file incrementally when its parser can stream, else all at once.
+    """
+    spec = get_parser(file_type or detect_file_type(file_path))
+    if spec.streaming:
+        yield from spec.iter_text(file_path)
+    else:
+        yield spec.parse(file_path).text
+
+# Specific formats first; plain text is the catch-all
+register_parser(ParserSpec(
+    name='pdf', parse=_parse_pdf, sniff=_sniff_pdf,
+    mime_types=('application/pdf',), extensions=('.pdf',),
+    iter_text=_iter_pdf, paged=True
+))
+register_parser(ParserSpec(
+    name='docx', parse=_parse_docx, sniff=_sniff_docx,
+    mime_types=('application/vnd.openxmlformats-officedocument.wordprocessingml.document',),
+    extensions=('.docx',)
+))
+register_parser(ParserSpec(
+    name='html', parse=_parse_html, sniff=_sniff_html,
+    mime_types=('text/html', 'application/xhtml+xml'), extensions=('.html', '.htm', '.xhtml')
+))
+register_parser(ParserSpec(
+    name='audio', parse=_parse_audio, magic=(b'ID3', b'fLaC', b'OggS'), sniff=_sniff_audio,
+    mime_types=('audio/wav', 'audio/x-wav', 'audio/mpeg', 'audio/flac', 'audio/ogg', 'audio/mp4'),
+    extensions=('.wav', '.mp3', '.flac', '.ogg', '.m4a'),
+    iter_text=_iter_audio
+))
+register_parser(ParserSpec(
+    name='txt', parse=_parse_txt, sniff=_sniff_text,
+    mime_types=('text/plain',), extensions=('.txt',),
+    iter_text=_iter_txt, declared_only=True
+))
@@ -0,0 +1,83 @@
+# File: backend/src/parsers/test_docx_parser.py
+
+import docx
+import pytest
+from docx.oxml import parse_xml
+from docx.shared import Inches
+
+from src.parsers.docx_parser import extract_docx
+
+_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"'
+)
+
+# A paragraph with a text box between two runs, written the way Word writes it:
+# once as DrawingML (mc:Choice), once as VML (mc:Fallback)
+_TEXT_BOX_PARAGRAPH = f"""
+<w:p {_NAMESPACES}>
+  <w:r><w:t xml:space="preserve">Before box.</w:t></w:r>
+  <w:r>
+    <mc:AlternateContent>
+      <mc:Choice Requires="wps">
+        <w:drawing><wps:txbx><w:txbxContent><w:p><w:r><w:t>BOXTEXT</w:t></w:r></w:p></w:txbxContent></wps:txbx></w:drawing>
+      </mc:Choice>
+      <mc:Fallback>
+        <w:pict><v:shape><v:textbox><w:txbxContent><w:p><w:r><w:t>BOXTEXT</w:t></w:r></w:p></w:txbxContent></v:textbox></v:shape></w:pict>
+      </mc:Fallback>
+    </mc:AlternateContent>
+  </w:r>
+  <w:r><w:t xml:space="preserve"> After box.</w:t></w:r>
+</w:p>
+"""
+
+@pytest.fixture
+def docx_path(tmp_path):
+    def save(document):
+        path = tmp_path / "document.docx"
+        document.save(path)
+        return str(path)
+    return save
+
+def _python_docx_text(path):
+    return '\n'.join(paragraph.text for paragraph in docx.Document(path).paragraphs)
+
+def test_text_and_tables_match_python_docx(docx_path):
+    document = docx.Document()
+    document.add_paragraph("First paragraph.")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Name"
+    table.cell(0, 1).text = "Qty"
+    table.cell(1, 0).text = "apples"
+    table.cell(1, 1).text = "3"
+    document.add_paragraph("Last paragraph.")
+    path = docx_path(document)
+
+    text, tables = extract_docx(path)
+    assert text == _python_docx_text(path)
+    assert [row["cells"] for row in tables[0]["rows"]] == [["Name", "Qty"], ["apples", "3"]]
+    assert tables[0]["char_offset"] == len("First paragraph.")
+
+def test_tab_stop_definitions_are_not_text(docx_path):
+    document = docx.Document()
+    paragraph = document.add_paragraph()
+    paragraph.paragraph_format.tab_stops.add_tab_stop(Inches(2))
+    paragraph.add_run("Name").add_tab()
+    paragraph.add_run("Value")
+    path = docx_path(document)
+
+    text, _ = extract_docx(path)
+    assert text == "Name\tValue" == _python_docx_text(path)
+
+def test_text_boxes_are_skipped(docx_path):
+    document = docx.Document()
+    body = document.element.body
+    body.insert(len(body) - 1, parse_xml(_TEXT_BOX_PARAGRAPH))
+    document.add_table(rows=1, cols=1).cell(0, 0).text = "cell"
+    path = docx_path(document)
+
+    text, tables = extract_docx(path)
+    assert text == "Before box. After box." == _python_docx_text(path)
+    assert tables[0]["char_offset"] == len(text)
@@ -0,0 +1,86 @@
+# File: backend/src/parsers/test_image_parser.py
+
+import io
+
+import pytest
+from PIL import Image, ImageDraw
+
+from src.chunkers import image_chunker
+from src.chunkers.image_chunker import chunk_images
+from src.parsers.image_parser import (
+    ExtractedImage, extract_images_from_pdf, hamming_distance, make_thumbnail, perceptual_hash
+)
+from src.utils.blob_store import BlobStore
+
+def _figure(size=(400, 300), shapes='circle') -> Image.Image:
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    width, height = size
+    if shapes == 'circle':
+        draw.ellipse((width * 0.1, height * 0.1, width * 0.6, height * 0.9), fill='black')
+    else:
+        draw.rectangle((width * 0.5, 0, width, height * 0.4), fill='black')
+        draw.line((0, height, width, 0), fill='gray', width=max(1, width // 40))
+    return image
+
+def _png(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def test_dhash_is_robust_to_scaling_and_reencoding():
+    original = _figure()
+    rescaled = original.resize((200, 150))
+    reencoded = Image.open(io.BytesIO(make_thumbnail(original, quality=60)))
+    assert hamming_distance(perceptual_hash(original), perceptual_hash(rescaled)) <= 4
+    assert hamming_distance(perceptual_hash(original), perceptual_hash(reencoded)) <= 4
+
+def test_dhash_separates_different_images():
+    assert hamming_distance(perceptual_hash(_figure()), perceptual_hash(_figure(shapes='lines'))) > 10
+
+def test_pdf_images_are_deduplicated_and_stored(tmp_path):
+    fitz = pytest.importorskip('fitz')
+    document = fitz.open()
+    # A figure, the same figure at another resolution, an icon and a different figure
+    for image in (_figure(), _figure((800, 600)), _figure((16, 16)), _figure(shapes='lines')):
+        page = document.new_page()
+        page.insert_image(fitz.Rect(50, 50, 350, 275), stream=_png(image))
+    pdf_path = str(tmp_path / 'figures.pdf')
+    document.save(pdf_path)
+    blob_store = BlobStore(str(tmp_path / 'blobs'))
+
+    images = list(extract_images_from_pdf(pdf_path, blob_store, min_size=32))
+    assert [image.page_number for image in images] == [1, 4]
+    for image in images:
+        thumbnail = Image.open(io.BytesIO(blob_store.get(image.thumbnail_blob_id)))
+        assert max(thumbnail.size) <= 256
+
+def test_blob_store_round_trip(tmp_path):
+    blob_store = BlobStore(str(tmp_path))
+    blob_id = blob_store.put(b'thumbnail bytes')
+    assert blob_store.exists(blob_id)
+    assert blob_store.get(blob_id) == b'thumbnail bytes'
+    # Content-addressed: the same bytes are stored once
+    assert blob_store.put(b'thumbnail bytes') == blob_id
+    assert blob_store.put(b'other bytes') != blob_id
+    assert not blob_store.exists('0' * 64)
+    with pytest.raises(FileNotFoundError):
+        blob_store.get('0' * 64)
+
+def test_ocr_failure_on_one_image_does_not_fail_the_document(monkeypatch):
+    def ocr_image(image):
+        if image.size == (64, 64):
+            raise RuntimeError("tesseract is not installed")
+        return "Figure 1"
+
+    monkeypatch.setattr(image_chunker, 'ocr_image', ocr_image)
+    images = [
+        ExtractedImage(page_number=page, image_number=page, width=size, height=size, phash=page,
+                       thumbnail_blob_id=f'blob-{page}', image=Image.new('RGB', (size, size)))
+        for page, size in ((1, 64), (2, 128))
+    ]
+    records = list(chunk_images(images, 'doc', batch_size=2))
+    assert [record.text for record in records] == [
+        "Image on page 1.",
+        "Image on page 2. Text in image: Figure 1",
+    ]
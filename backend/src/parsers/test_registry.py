@@ -0,0 +1,79 @@
+# File: backend/src/parsers/test_registry.py
+
+import zipfile
+
+import pytest
+
+from src.parsers.registry import detect_file_type
+
+def _write(tmp_path, name, content: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+def _docx(tmp_path, name) -> str:
+    path = tmp_path / name
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('[Content_Types].xml', '<Types/>')
+        archive.writestr('word/document.xml', '<w:document/>')
+    return str(path)
+
+@pytest.mark.parametrize("content, expected", [
+    (b'%PDF-1.7\n%\xe2\xe3\xcf\xd3\n1 0 obj', 'pdf'),
+    # Junk before the PDF header
+    (b'\r\n\r\n%PDF-1.4\n', 'pdf'),
+    (b'<!DOCTYPE html><html><body>Hi</body></html>', 'html'),
+    (b'\xef\xbb\xbf  <html lang="en"><head></head></html>', 'html'),
+    (b'<?xml version="1.0"?>\n<html xmlns="http://www.w3.org/1999/xhtml"></html>', 'html'),
+    (b'RIFF\x24\x08\x00\x00WAVEfmt ', 'audio'),
+    (b'ID3\x04\x00\x00\x00\x00\x00\x00', 'audio'),
+    (b'\xff\xfb\x90\x64\x00\x00\x00\x00', 'audio'),
+    (b'fLaC\x00\x00\x00\x22', 'audio'),
+    (b'OggS\x00\x02\x00\x00', 'audio'),
+    (b'\x00\x00\x00\x20ftypM4A \x00\x00\x00\x00', 'audio'),
+])
+def test_content_decides_over_the_declared_name(tmp_path, content, expected):
+    path = _write(tmp_path, 'upload.bin', content)
+    assert detect_file_type(path, 'upload.txt', 'text/plain') == expected
+
+def test_docx_is_detected_from_its_archive(tmp_path):
+    path = _docx(tmp_path, 'upload.bin')
+    assert detect_file_type(path, 'report.pdf', 'application/pdf') == 'docx'
+
+def test_other_zip_archives_are_not_docx(tmp_path):
+    path = tmp_path / 'archive.zip'
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('data.csv', 'a,b\n')
+    assert detect_file_type(str(path), 'archive.zip', 'application/zip') is None
+
+@pytest.mark.parametrize("filename, content_type", [
+    ('notes.txt', None),
+    ('NOTES.TXT', 'application/octet-stream'),
+    ('notes', 'text/plain'),
+    ('notes', 'text/plain; charset=utf-8'),
+])
+def test_text_needs_a_declared_text_type(tmp_path, filename, content_type):
+    path = _write(tmp_path, 'upload.bin', 'Plain text with ünïcode.\n'.encode('utf-8'))
+    assert detect_file_type(path, filename, content_type) == 'txt'
+
+@pytest.mark.parametrize("filename, content_type", [
+    ('data.csv', 'text/csv'),
+    ('data.json', 'application/json'),
+    ('README.md', 'text/markdown'),
+    ('script.py', 'text/x-python'),
+    (None, None),
+])
+def test_other_text_files_are_not_accepted(tmp_path, filename, content_type):
+    path = _write(tmp_path, 'upload.bin', b'a,b\n1,2\n')
+    assert detect_file_type(path, filename, content_type) is None
+
+def test_utf16_text_is_not_audio(tmp_path):
+    # Starts with the UTF-16LE byte order mark FF FE
+    path = _write(tmp_path, 'upload.bin', '\ufeffHello'.encode('utf-16-le'))
+    assert detect_file_type(path, 'notes.csv', 'text/csv') is None
+    assert detect_file_type(path, 'notes.txt', 'text/plain') == 'txt'
+
+def test_unrecognized_content_falls_back_to_the_declared_type(tmp_path):
+    path = _write(tmp_path, 'upload.bin', b'\x00\x01\x02\x03')
+    assert detect_file_type(path, 'song.mp3', None) == 'audio'
+    assert detect_file_type(path, 'blob.bin', 'application/octet-stream') is None
@@ -1,5 +1,7 @@
 # backend/src/preprocessing/chunker.py
 
+from typing import List
+
 def chunk_data(text: str, max_paragraphs: int = 5) -> List[str]:
     """
     Split the text into chunks, each containing up to max_paragraphs.
@@ -0,0 +1,103 @@
+# File: backend/src/preprocessing/test_chunker.py
+
+import numpy as np
+import pytest
+import spacy
+
+from src.chunkers.records import build_chunk_records, strip_page_breaks
+from src.chunkers.semantic_chunker import SpacyVectorEncoder, find_breakpoints
+from src.chunkers.table_chunker import dedupe_tables
+
+def _table(number, *rows):
+    return {"table_number": number, "page_number": 1, "rows": [{"cells": list(row)} for row in rows]}
+
+def test_dedupe_keeps_distinct_single_row_tables():
+    tables = {"pdfplumber": [_table(1, ['Total', '42']), _table(2, ['Grand', '99'])]}
+    assert len(dedupe_tables(tables)) == 2
+
+def test_dedupe_keeps_tables_with_same_body_and_different_headers():
+    tables = {"pdfplumber": [_table(1, ['Name', 'Qty'], ['a', '1']), _table(2, ['Item', 'Count'], ['a', '1'])]}
+    assert len(dedupe_tables(tables)) == 2
+
+def test_dedupe_drops_tabula_table_without_header_row():
+    tables = {
+        "pdfplumber": [_table(1, ['Name', 'Qty'], ['a', '1'], ['b', '2'])],
+        "tabula": [_table(1, ['a', '1'], ['b', '2'])],
+    }
+    unique = dedupe_tables(tables)
+    assert [extractor for extractor, _, _ in unique] == ["pdfplumber"]
+
+def test_dedupe_drops_header_row_table_after_tabula():
+    tables = {
+        "tabula": [_table(1, ['a', '1'], ['b', '2'])],
+        "camelot": [_table(1, ['Name', 'Qty'], ['a', '1'], ['b', '2'])],
+    }
+    assert [extractor for extractor, _, _ in dedupe_tables(tables)] == ["tabula"]
+
+def test_dedupe_drops_identical_tables_across_extractors():
+    tables = {
+        "pdfplumber": [_table(1, ['Name', 'Qty'], ['a', '1'])],
+        "camelot": [_table(1, [' name ', 'QTY'], ['a', ' 1'])],
+    }
+    assert len(dedupe_tables(tables)) == 1
+
+def test_strip_page_breaks_from_returned_chunks():
+    assert strip_page_breaks('a. \f b') == 'a. b'
+    assert strip_page_breaks('\fhyphen\fated\f') == 'hyphenated'
+
+def test_chunk_records_keep_page_spans_without_page_breaks():
+    source_text = "Page one ends here. \f Page two starts here. \f"
+    record, = build_chunk_records(["Page one ends here. \f Page two starts here."], source_text, 'doc')
+    assert record.text == "Page one ends here. Page two starts here."
+    assert (record.page_start, record.page_end) == (1, 2)
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("min_words, max_words", [(0, 40), (30, 60), (100, 150)])
+def test_breakpoints_keep_chunks_within_max_words(seed, min_words, max_words):
+    rng = np.random.default_rng(seed)
+    count = int(rng.integers(1, 60))
+    # Some sentences are longer than max_words on their own
+    word_counts = rng.choice([3, 8, 15, 25, 70, 200], size=count, p=[.25, .3, .2, .15, .07, .03])
+    similarities = rng.random(count - 1)
+
+    breakpoints = find_breakpoints(similarities, word_counts, min_words=min_words, max_words=max_words)
+
+    assert breakpoints[-1] == count - 1
+    assert breakpoints == sorted(set(breakpoints))
+    starts = [0] + [cut + 1 for cut in breakpoints[:-1]]
+    for start, end in zip(starts, breakpoints):
+        assert end == start or word_counts[start:end + 1].sum() <= max_words
+
+def test_breakpoints_cut_at_the_valley_in_bounds():
+    similarities = np.array([.9, .9, .1, .9, .9, .2, .9])
+    word_counts = np.full(8, 10)
+
+    assert find_breakpoints(similarities, word_counts, min_words=20, max_words=40) == [2, 5, 7]
+    # A single sentence is one chunk, and no sentences are none
+    assert find_breakpoints(np.array([]), np.array([10]), min_words=20, max_words=40) == [0]
+    assert find_breakpoints(np.array([]), np.array([], dtype=int)) == []
+
+def test_spacy_vector_encoder_matches_the_direction_of_doc_vector():
+    nlp = spacy.blank('en')
+    rng = np.random.default_rng(0)
+    for word in ("tides", "moon", "ocean", "rise", "the", "and"):
+        nlp.vocab.set_vector(word, rng.normal(size=8).astype(np.float32))
+    sentences = [
+        "the moon and the tides", "Ocean tides rise", "unknown words only", "moon", "the ocean and the moon rise"
+    ]
+
+    # A batch size that splits the sentences across batches
+    vectors = SpacyVectorEncoder(nlp, batch_size=2).encode(sentences)
+
+    assert vectors.shape == (len(sentences), 8)
+    for sentence, vector in zip(sentences, vectors):
+        expected = nlp(sentence).vector
+        if not expected.any():
+            assert not vector.any()
+            continue
+        cosine = vector @ expected / (np.linalg.norm(vector) * np.linalg.norm(expected))
+        assert cosine == pytest.approx(1.0, abs=1e-5)
+
+def test_spacy_vector_encoder_requires_word_vectors():
+    with pytest.raises(ValueError):
+        SpacyVectorEncoder(spacy.blank('en'))
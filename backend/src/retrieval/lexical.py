@@ -0,0 +1,105 @@
+# src/retrieval/lexical.py
+
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from src.vector_db.filters import matches_filter
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercases the text and splits it into word tokens.
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+class BM25Index:
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        In-memory Okapi BM25 index used for lexical retrieval next to the vector store.
+
+        Args:
+            k1 (float): Term frequency saturation parameter.
+            b (float): Document length normalization parameter.
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._doc_lengths: List[int] = []
+        self._texts: List[str] = []
+        self._metadatas: List[dict] = []
+        self._ids: Dict[str, int] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._ids
+
+    def add(self, ids: List[str], texts: List[str], metadatas: List[dict] = None):
+        """
+        Adds documents to the index. Documents whose id is already indexed are skipped.
+
+        Args:
+            ids (List[str]): Unique document ids (e.g., the vector store ids).
+            texts (List[str]): Document texts.
+            metadatas (List[dict], optional): Metadata for each document.
+        """
+        metadatas = metadatas or [{} for _ in texts]
+        with self._lock:
+            for doc_id, text, metadata in zip(ids, texts, metadatas):
+                if doc_id in self._ids:
+                    continue
+                doc_idx = len(self._texts)
+                tokens = tokenize(text)
+                for term, tf in Counter(tokens).items():
+                    self._postings[term][doc_idx] = tf
+                self._ids[doc_id] = doc_idx
+                self._texts.append(text)
+                self._metadatas.append(metadata or {})
+                self._doc_lengths.append(len(tokens))
+                self._total_length += len(tokens)
+
+    def search(self, query: str, k: int = 5, filter: Optional[dict] = None) -> List[Tuple[str, dict, float]]:
+        """
+        Returns the top-k documents for the query.
+
+        Args:
+            query (str): The query string.
+            k (int): Number of documents to return.
+            filter (dict, optional): Chroma-style metadata filter applied while scoring,
+                so excluded documents never enter the ranking.
+
+        Returns:
+            List[Tuple[str, dict, float]]: (text, metadata, score) tuples, best first.
+        """
+        with self._lock:
+            num_docs = len(self._texts)
+            if not num_docs:
+                return []
+            avg_length = self._total_length / num_docs
+            scores: Dict[int, float] = defaultdict(float)
+            allowed: Dict[int, bool] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (num_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_idx, tf in postings.items():
+                    if filter is not None:
+                        if doc_idx not in allowed:
+                            allowed[doc_idx] = matches_filter(self._metadatas[doc_idx], filter)
+                        if not allowed[doc_idx]:
+                            continue
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_idx] / avg_length)
+                    scores[doc_idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            return [(self._texts[idx], self._metadatas[idx], score) for idx, score in ranked]
@@ -0,0 +1,156 @@
+# src/retrieval/reranker.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+import logging
+
+from src.retrieval.lexical import tokenize
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Pair Scorers
+# ----------------------------
+
+class CrossEncoderScorer:
+    def __init__(self, model_name: str = 'cross-encoder/ms-marco-MiniLM-L-6-v2', max_length: int = 512):
+        """
+        Scores (query, passage) pairs with a local cross-encoder on CPU.
+
+        Args:
+            model_name (str): Hugging Face model id or local path of the cross-encoder.
+            max_length (int): Maximum tokens per pair; longer pairs are truncated.
+        """
+        try:
+            import torch
+            from transformers import AutoTokenizer, AutoModelForSequenceClassification
+            self._torch = torch
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+            self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+            self.model.eval()
+            self.max_length = max_length
+            logger.info(f"Cross-encoder '{model_name}' loaded.")
+        except Exception as e:
+            logger.error(f"Error loading cross-encoder '{model_name}': {e}")
+            raise e
+
+    def score(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """
+        Scores a batch of (query, passage) pairs; higher is more relevant.
+        """
+        with self._torch.inference_mode():
+            features = self.tokenizer(
+                [query for query, _ in pairs],
+                [passage for _, passage in pairs],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors='pt'
+            )
+            logits = self.model(**features).logits
+            # Single-logit models emit a relevance score; two-class models use the positive class
+            scores = logits[:, 0] if logits.shape[-1] == 1 else logits[:, -1]
+            return scores.tolist()
+
+class LexicalOverlapScorer:
+    def score(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """
+        Scores pairs by the fraction of query terms found in the passage.
+
+        Model-free and deterministic; used as a local stand-in for the cross-encoder.
+        """
+        scores = []
+        for query, passage in pairs:
+            query_terms = set(tokenize(query))
+            passage_terms = set(tokenize(passage))
+            scores.append(len(query_terms & passage_terms) / len(query_terms) if query_terms else 0.0)
+        return scores
+
+# ----------------------------
+# Reranker
+# ----------------------------
+
+class Reranker:
+    def __init__(self, scorer, batch_size: int = 16, cache_size: int = 4096, time_budget_ms: float = 300):
+        """
+        Reorders retrieved candidates by (query, chunk) relevance scores.
+
+        Pair scores are computed in batches and kept in an LRU cache. If scoring
+        exceeds the time budget, the candidates are returned in their original
+        (vector) order instead.
+
+        Args:
+            scorer: Object with a score(pairs) -> List[float] method.
+            batch_size (int): Pairs scored per model call.
+            cache_size (int): Maximum number of cached pair scores.
+            time_budget_ms (float): Maximum time to spend scoring one query.
+        """
+        self.scorer = scorer
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.time_budget_ms = time_budget_ms
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(query: str, passage: str) -> str:
+        return hashlib.sha1(f"{query}\x00{passage}".encode('utf-8')).hexdigest()
+
+    def _cache_get(self, key: str):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+
+    def _cache_put(self, key: str, score: float):
+        with self._lock:
+            self._cache[key] = score
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def rerank(self, query: str, results: list, k: int) -> list:
+        """
+        Returns the k most relevant results for the query.
+
+        Args:
+            query (str): The user's query.
+            results (list): Candidate vector store results (with 'page_content'), in vector order.
+            k (int): Number of results to return.
+
+        Returns:
+            list: The top-k results, best first, or the first k in vector order if over budget.
+        """
+        start_time = time.perf_counter()
+        keys = [self._key(query, doc.page_content) for doc in results]
+        scores = [self._cache_get(key) for key in keys]
+        pending = [i for i, score in enumerate(scores) if score is None]
+        logger.debug("Reranking %d candidates (%d cached).", len(results), len(results) - len(pending))
+
+        try:
+            for batch_start in range(0, len(pending), self.batch_size):
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                if elapsed_ms > self.time_budget_ms:
+                    logger.warning(
+                        f"Rerank budget of {self.time_budget_ms} ms exceeded after {elapsed_ms:.1f} ms; "
+                        "falling back to vector order."
+                    )
+                    return results[:k]
+                batch = pending[batch_start:batch_start + self.batch_size]
+                batch_scores = self.scorer.score([(query, results[i].page_content) for i in batch])
+                for i, score in zip(batch, batch_scores):
+                    scores[i] = score
+                    self._cache_put(keys[i], score)
+        except Exception as e:
+            logger.error(f"Error during reranking; falling back to vector order: {e}")
+            return results[:k]
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        # Stable sort keeps vector order among equal scores
+        order = sorted(range(len(results)), key=lambda i: scores[i], reverse=True)
+        logger.info(f"Reranked {len(results)} candidates to top {k} in {elapsed_ms:.1f} ms.")
+        return [results[i] for i in order[:k]]
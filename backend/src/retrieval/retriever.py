@@ -1,10 +1,91 @@
 # src/retrieval/retriever.py
 
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
-def retrieve_documents(query, vector_db, k=5):
+def _to_documents(results) -> list:
+    """
+    Convert vector store results into the document dictionaries used by the pipeline.
+    """
+    documents = []
+    for doc in results:
+        # Assuming each doc has 'page_content' and 'metadata'
+        documents.append({
+            "texts": [doc.page_content],
+            "images": [],  # Image chunks carry a thumbnail 'blob_id' in their metadata instead
+            "metadata": dict(doc.metadata or {})
+        })
+    return documents
+
+def fuse_results(result_lists: list, k: int, rrf_k: int = 60) -> list:
+    """
+    Merge several ranked result lists with reciprocal rank fusion.
+
+    Documents with identical content are merged, keeping the first instance seen.
+
+    Args:
+        result_lists (list): Ranked lists of vector store results.
+        k (int): Number of documents to keep.
+        rrf_k (int): Rank offset; larger values flatten the contribution of top ranks.
+
+    Returns:
+        list: The fused top-k results.
+    """
+    scores = {}
+    first_seen = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results):
+            key = doc.page_content
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank + 1)
+            first_seen.setdefault(key, doc)
+    ranked = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [first_seen[key] for key in ranked]
+
+def expand_to_parents(results: list, doc_store, k: int) -> list:
+    """
+    Replace matched child chunks by their parent sections (small-to-big retrieval).
+
+    Parents are ranked by their best-ranked child and returned once each, with
+    the number of matched children in their 'child_hits' metadata. Results
+    without a parent (tables, images, flat text chunks) are kept as they are,
+    as is a child whose parent is missing from the store.
+
+    Args:
+        results (list): Ranked vector store results.
+        doc_store (DocStore): Store holding the parent sections.
+        k (int): Number of documents to keep.
+
+    Returns:
+        list: The top-k parents and parentless results, in rank order.
+    """
+    from langchain_core.documents import Document
+
+    ranked = {}
+    for doc in results:
+        key = (doc.metadata or {}).get('parent_id') or doc.page_content
+        if key in ranked:
+            ranked[key][1] += 1
+        elif len(ranked) < k:
+            ranked[key] = [doc, 1]
+    parent_ids = [doc.metadata['parent_id'] for doc, _ in ranked.values() if (doc.metadata or {}).get('parent_id')]
+    parents = doc_store.get(parent_ids)
+
+    expanded = []
+    for doc, hits in ranked.values():
+        parent_id = (doc.metadata or {}).get('parent_id')
+        if not parent_id:
+            expanded.append(doc)
+        elif parent_id in parents:
+            text, metadata = parents[parent_id]
+            expanded.append(Document(page_content=text, metadata={**metadata, "child_hits": hits}))
+        else:
+            logger.warning(f"Parent section {parent_id} not found; returning the matched child.")
+            expanded.append(doc)
+    return expanded
+
+def retrieve_documents(query, vector_db, k=5, reranker=None, fetch_k=20, filter=None, doc_store=None, fetch_factor=4):
     """
     Retrieve relevant documents from the vector database based on the query.
 
@@ -12,20 +93,86 @@ def retrieve_documents(query, vector_db, k=5):
         query (str): The user's query.
         vector_db (VectorDB): An instance of the VectorDB class.
         k (int): Number of top similar documents to retrieve.
+        reranker (Reranker, optional): When given, fetch_k candidates are retrieved
+            and reranked down to k.
+        fetch_k (int): Number of candidates to over-fetch for reranking.
+        filter (dict, optional): Metadata filter pushed down into the index
+            (see src.vector_db.filters.build_filter).
+        doc_store (DocStore, optional): Store of parent sections. When given, k * fetch_factor
+            chunks are matched and expanded to k distinct parents (see expand_to_parents).
+        fetch_factor (int): Chunks matched per returned document when expanding to parents.
 
     Returns:
         list: A list of relevant documents.
     """
     try:
         logger.info(f"Retrieving documents for query: {query}")
-        results = vector_db.similarity_search(query, k=k)
-        documents = []
-        for doc in results:
-            # Assuming each doc has 'page_content' and 'metadata'
-            documents.append({
-                "texts": [doc.page_content],
-                "images": []  # Extend this if handling images
-            })
+        match_k = k * fetch_factor if doc_store is not None else k
+        if reranker is not None:
+            results = vector_db.similarity_search(query, k=max(match_k, fetch_k), filter=filter)
+            results = reranker.rerank(query, results, match_k)
+        else:
+            results = vector_db.similarity_search(query, k=match_k, filter=filter)
+        if doc_store is not None:
+            results = expand_to_parents(results, doc_store, k)
+        documents = _to_documents(results)
+        logger.info(f"Retrieved {len(documents)} documents for the query.")
+        return documents
+    except Exception as e:
+        logger.error(f"Error retrieving documents: {e}")
+        raise e
+
+async def aretrieve_documents(
+    query, vector_db, k=5, query_embedding=None, prefetch=None, reranker=None, fetch_k=20, filter=None,
+    doc_store=None, fetch_factor=4
+):
+    """
+    Retrieve documents with dense and lexical search running concurrently.
+
+    Both result lists are merged with reciprocal rank fusion. As soon as either
+    search returns, its documents are handed to ``prefetch`` so that follow-up
+    work (e.g., image loading) starts before the slower search finishes.
+
+    Args:
+        query (str): The user's query.
+        vector_db (VectorDB): An instance of the VectorDB class.
+        k (int): Number of documents to retrieve.
+        query_embedding (list, optional): Precomputed query embedding; skips embedding the query.
+        prefetch (Callable, optional): Called with each search's documents as they arrive.
+        reranker (Reranker, optional): When given, fetch_k candidates are retrieved
+            and reranked down to k.
+        fetch_k (int): Number of candidates to over-fetch for reranking.
+        filter (dict, optional): Metadata filter pushed down into both searches.
+        doc_store (DocStore, optional): Store of parent sections. When given, k * fetch_factor
+            chunks are matched and expanded to k distinct parents (see expand_to_parents).
+        fetch_factor (int): Chunks matched per returned document when expanding to parents.
+
+    Returns:
+        list: A list of relevant documents.
+    """
+    try:
+        logger.info(f"Retrieving documents (dense + lexical) for query: {query}")
+        match_k = k * fetch_factor if doc_store is not None else k
+        search_k = max(match_k, fetch_k) if reranker is not None else match_k
+        if query_embedding is not None:
+            dense = asyncio.to_thread(vector_db.similarity_search_by_vector, query_embedding, search_k, filter)
+        else:
+            dense = asyncio.to_thread(vector_db.similarity_search, query, search_k, filter)
+        lexical = asyncio.to_thread(vector_db.lexical_search, query, search_k, filter)
+
+        result_lists = []
+        for finished in asyncio.as_completed([dense, lexical]):
+            results = await finished
+            result_lists.append(results)
+            if prefetch is not None:
+                prefetch(_to_documents(results))
+
+        results = fuse_results(result_lists, search_k)
+        if reranker is not None:
+            results = await asyncio.to_thread(reranker.rerank, query, results, match_k)
+        if doc_store is not None:
+            results = await asyncio.to_thread(expand_to_parents, results, doc_store, k)
+        documents = _to_documents(results)
         logger.info(f"Retrieved {len(documents)} documents for the query.")
         return documents
     except Exception as e:
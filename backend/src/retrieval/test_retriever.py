@@ -0,0 +1,155 @@
+# File: backend/src/retrieval/test_retriever.py
+
+import time
+
+import pytest
+from langchain_core.documents import Document
+
+from src.chunkers.hierarchical import build_parent_child_records, group_sentences
+from src.chunkers.records import ChunkRecord
+from src.retrieval.reranker import LexicalOverlapScorer, Reranker
+from src.retrieval.retriever import expand_to_parents
+from src.vector_db.doc_store import DocStore
+
+@pytest.fixture
+def doc_store():
+    store = DocStore(':memory:')
+    store.put([
+        ChunkRecord(text="Parent section A.", document_id='doc-a', chunk_index=1, extractor='parent'),
+        ChunkRecord(text="Parent section B.", document_id='doc-a', chunk_index=2, extractor='parent'),
+    ])
+    return store
+
+def _parent_id(chunk_index: int) -> str:
+    return ChunkRecord(text="", document_id='doc-a', chunk_index=chunk_index, extractor='parent').record_id
+
+def _child(text: str, parent_index: int = None) -> Document:
+    metadata = {'document_id': 'doc-a'}
+    if parent_index is not None:
+        metadata['parent_id'] = _parent_id(parent_index)
+    return Document(page_content=text, metadata=metadata)
+
+def test_parents_are_ranked_by_their_best_child_and_count_hits(doc_store):
+    results = [_child("b1", 2), _child("a1", 1), _child("b2", 2), _child("a2", 1), _child("b3", 2)]
+
+    expanded = expand_to_parents(results, doc_store, k=5)
+
+    assert [doc.page_content for doc in expanded] == ["Parent section B.", "Parent section A."]
+    assert [doc.metadata['child_hits'] for doc in expanded] == [3, 2]
+    assert expanded[0].metadata['document_id'] == 'doc-a'
+
+def test_parentless_results_keep_their_rank_and_k_counts_distinct_documents(doc_store):
+    table = Document(page_content="| a | b |", metadata={'modality': 'table'})
+    results = [_child("a1", 1), table, _child("a2", 1), _child("b1", 2)]
+
+    expanded = expand_to_parents(results, doc_store, k=2)
+
+    # The second child of A does not use up a slot, B is past k
+    assert [doc.page_content for doc in expanded] == ["Parent section A.", "| a | b |"]
+    assert expanded[0].metadata['child_hits'] == 2
+    assert 'child_hits' not in expanded[1].metadata
+
+def test_child_with_a_missing_parent_is_returned_as_is(doc_store):
+    orphan = _child("orphan", 9)
+
+    expanded = expand_to_parents([orphan, _child("a1", 1)], doc_store, k=5)
+
+    assert expanded[0] is orphan
+    assert expanded[1].page_content == "Parent section A."
+
+def test_hierarchy_round_trips_through_the_doc_store():
+    sentences = [f"Sentence number {i} has six words." for i in range(12)]
+    parents, children = build_parent_child_records(
+        sentences, " ".join(sentences), 'doc-a', parent_min_words=20, parent_max_words=30, child_max_words=12
+    )
+    store = DocStore(':memory:')
+    store.put(parents)
+    results = [
+        Document(page_content=child.text, metadata=child.to_metadata() | child.extra) for child in reversed(children)
+    ]
+
+    expanded = expand_to_parents(results, store, k=len(parents))
+
+    assert [doc.page_content for doc in expanded] == [parent.text for parent in reversed(parents)]
+    assert sum(doc.metadata['child_hits'] for doc in expanded) == len(children)
+
+@pytest.mark.parametrize("min_words, max_words", [(0, 12), (10, 14), (20, 30), (40, 45)])
+def test_group_sentences_respects_the_bounds(min_words, max_words):
+    sentences = [" ".join(["word"] * n) for n in (3, 7, 2, 9, 4, 4, 1, 8, 6, 5, 2)]
+
+    groups = group_sentences(sentences, min_words, max_words)
+
+    assert [sentence for group in groups for sentence in group] == sentences
+    sizes = [sum(len(sentence.split()) for sentence in group) for group in groups]
+    for group, size in zip(groups[:-1], sizes[:-1]):
+        # Over max_words only while min_words is not reached yet
+        assert size <= max_words or size - len(group[-1].split()) < min_words
+        assert size >= min_words
+
+def test_group_sentences_keeps_a_long_sentence_whole_and_skips_empty_ones():
+    groups = group_sentences(["one two", "", "a b c d e f g h", "three"], 0, 4)
+
+    assert groups == [["one two"], ["a b c d e f g h"], ["three"]]
+
+class _RecordingScorer(LexicalOverlapScorer):
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    def score(self, pairs):
+        self.calls.append([passage for _, passage in pairs])
+        time.sleep(self.delay)
+        return super().score(pairs)
+
+def _candidates(*texts):
+    return [Document(page_content=text, metadata={}) for text in texts]
+
+def test_rerank_orders_by_score_and_caches_pair_scores():
+    scorer = _RecordingScorer()
+    reranker = Reranker(scorer, batch_size=2)
+    results = _candidates("unrelated text", "tides and the moon", "the moon")
+
+    ranked = reranker.rerank("moon tides", results, k=2)
+    assert [doc.page_content for doc in ranked] == ["tides and the moon", "the moon"]
+    assert len(scorer.calls) == 2
+
+    # Only the new candidate is scored for a repeated query
+    ranked = reranker.rerank("moon tides", results + _candidates("moon tides tonight"), k=4)
+    assert scorer.calls[2:] == [["moon tides tonight"]]
+    assert ranked[0].page_content == "tides and the moon"
+    # A different query is a different pair
+    reranker.rerank("ocean", results[:1], k=1)
+    assert scorer.calls[3:] == [["unrelated text"]]
+
+def test_rerank_cache_evicts_the_least_recently_used_pair():
+    scorer = _RecordingScorer()
+    reranker = Reranker(scorer, cache_size=2)
+    first, second, third = _candidates("a", "b", "c")
+
+    reranker.rerank("q", [first, second], k=2)
+    reranker.rerank("q", [first], k=1)
+    reranker.rerank("q", [third], k=1)
+    assert len(reranker._cache) == 2
+    # "b" was the least recently used, "a" is still cached
+    reranker.rerank("q", [first, second], k=2)
+    assert scorer.calls[-1] == ["b"]
+
+def test_rerank_over_budget_falls_back_to_vector_order():
+    scorer = _RecordingScorer(delay=0.05)
+    reranker = Reranker(scorer, batch_size=1, time_budget_ms=10)
+    results = _candidates("unrelated", "other", "moon tides")
+
+    ranked = reranker.rerank("moon tides", results, k=2)
+
+    assert ranked == results[:2]
+    # Scoring stopped at the first batch past the budget
+    assert len(scorer.calls) == 1
+
+def test_rerank_scorer_error_falls_back_to_vector_order():
+    class FailingScorer:
+        def score(self, pairs):
+            raise RuntimeError("model unavailable")
+
+    results = _candidates("unrelated", "moon tides")
+
+    assert Reranker(FailingScorer()).rerank("moon tides", results, k=1) == results[:1]
@@ -1,7 +1,7 @@
 # backend/src/utils/__init__.py
 
 from .config import Config
-from .logger import setup_logger
+from .logger import configure_logging, log_context, setup_logger
 from .summary import generate_summary  # Add this line
 
-__all__ = ["Config", "setup_logger", "generate_summary"]
+__all__ = ["Config", "configure_logging", "log_context", "setup_logger", "generate_summary"]
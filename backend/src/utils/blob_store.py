@@ -0,0 +1,69 @@
+# backend/src/utils/blob_store.py
+
+import hashlib
+import os
+import tempfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+class BlobStore:
+    def __init__(self, root: str):
+        """
+        Content-addressed store for binary blobs (e.g., image thumbnails) on local disk.
+
+        Blobs are keyed by the SHA-256 of their content, so storing the same bytes
+        twice is a no-op and blobs can be shared between documents.
+
+        Args:
+            root (str): Directory holding the blobs.
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, blob_id: str) -> str:
+        """
+        Returns the file path of a blob. Blobs are fanned out by their first two hex digits.
+        """
+        return os.path.join(self.root, blob_id[:2], blob_id)
+
+    def exists(self, blob_id: str) -> bool:
+        return os.path.exists(self.path(blob_id))
+
+    def put(self, data: bytes) -> str:
+        """
+        Stores the bytes and returns their blob ID.
+
+        Args:
+            data (bytes): Blob content.
+
+        Returns:
+            str: The SHA-256 hex digest of the content.
+        """
+        blob_id = hashlib.sha256(data).hexdigest()
+        path = self.path(blob_id)
+        if os.path.exists(path):
+            return blob_id
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so readers never observe a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Failed to store blob {blob_id}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise e
+        return blob_id
+
+    def get(self, blob_id: str) -> bytes:
+        """
+        Returns the bytes of a stored blob.
+
+        Raises:
+            FileNotFoundError: If the blob does not exist.
+        """
+        with open(self.path(blob_id), 'rb') as f:
+            return f.read()
@@ -0,0 +1,305 @@
+# backend/src/utils/components.py
+
+import threading
+import time
+from typing import Any, Callable, Dict
+from src.utils.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# ----------------------------
+# Default Factories
+# ----------------------------
+# Heavy client libraries are imported inside the factories so that importing
+# this module (or anything that depends on it) stays cheap and credential-free.
+
+def _build_embeddings(container: "Components"):
+    from src.embedding.instrumented_embeddings import InstrumentedEmbeddings
+    if Config.EMBEDDING_BACKEND == 'fake':
+        from src.embedding.fake_embeddings import FakeEmbeddings
+        client = FakeEmbeddings()
+    else:
+        from langchain_community.embeddings import OpenAIEmbeddings
+        client = OpenAIEmbeddings(openai_api_key=Config.OPENAI_API_KEY)
+    if Config.EMBED_BATCHING:
+        # One backend call for the concurrent calls of all requests
+        from src.embedding.batching_embeddings import BatchingEmbeddings
+        client = BatchingEmbeddings(
+            client,
+            max_batch_size=Config.EMBED_BATCH_MAX_ITEMS,
+            max_wait_ms=Config.EMBED_BATCH_WAIT_MS,
+            max_concurrency=Config.EMBED_BATCH_CONCURRENCY
+        )
+    return InstrumentedEmbeddings(client)
+
+def _build_llm(container: "Components"):
+    if Config.LLM_BACKEND == 'fake':
+        from src.multimodal_llm.fake_llm import FakeChatModel
+        return FakeChatModel()
+    import httpx
+    from langchain_openai import ChatOpenAI
+    # Pooled keep-alive connections shared by all sync and async LLM calls
+    limits = httpx.Limits(
+        max_connections=Config.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.LLM_MAX_CONNECTIONS
+    )
+    return ChatOpenAI(
+        model_name=Config.LLM_MODEL,
+        temperature=0,
+        openai_api_key=Config.OPENAI_API_KEY,
+        http_client=httpx.Client(limits=limits),
+        http_async_client=httpx.AsyncClient(limits=limits)
+    )
+
+def _build_embedder(container: "Components"):
+    from src.embedding.embedder import Embedder
+    return Embedder(embeddings=container.get('embeddings'))
+
+def _build_vector_db(container: "Components"):
+    from src.vector_db.vectordb import VectorDB
+    return VectorDB(
+        Config.REDIS_URL,
+        Config.CHROMA_COLLECTION_NAME,
+        persist_directory=Config.CHROMA_PERSIST_DIRECTORY,
+        embeddings=container.get('embeddings'),
+        # Use the lexical index if it was preloaded, otherwise the VectorDB loads it on first use
+        lexical_index=container.get('lexical_index') if container.built('lexical_index') else None
+    )
+
+def _build_lexical_index(container: "Components"):
+    from src.vector_db.vectordb import load_lexical_index
+    return load_lexical_index(Config.CHROMA_COLLECTION_NAME, Config.CHROMA_PERSIST_DIRECTORY)
+
+def _build_reranker(container: "Components"):
+    from src.retrieval.reranker import Reranker, CrossEncoderScorer, LexicalOverlapScorer
+    if Config.RERANK_BACKEND == 'lexical':
+        scorer = LexicalOverlapScorer()
+    else:
+        scorer = CrossEncoderScorer(Config.RERANK_MODEL)
+    return Reranker(
+        scorer,
+        batch_size=Config.RERANK_BATCH_SIZE,
+        time_budget_ms=Config.RERANK_BUDGET_MS
+    )
+
+def _build_doc_store(container: "Components"):
+    from src.vector_db.doc_store import DocStore
+    return DocStore(Config.DOC_STORE_PATH)
+
+def _build_blob_store(container: "Components"):
+    from src.utils.blob_store import BlobStore
+    return BlobStore(Config.BLOB_STORE_DIR)
+
+def _build_captioner(container: "Components"):
+    from src.chunkers.image_chunker import NullCaptioner, TransformersCaptioner
+    if Config.CAPTION_BACKEND == 'transformers':
+        return TransformersCaptioner(Config.CAPTION_MODEL)
+    return NullCaptioner()
+
+def _build_nlp(container: "Components"):
+    import spacy
+    try:
+        return spacy.load(Config.SPACY_MODEL)
+    except OSError as e:
+        # Models are installed by the provisioning step, never at request time
+        raise RuntimeError(
+            f"spaCy model '{Config.SPACY_MODEL}' is not installed; run 'python -m src.utils.warmup --provision'."
+        ) from e
+
+def _build_sentence_encoder(container: "Components"):
+    from src.chunkers.semantic_chunker import EmbeddingsEncoder, SentenceTransformerEncoder, SpacyVectorEncoder
+    if Config.SEMANTIC_ENCODER == 'sentence-transformers':
+        return SentenceTransformerEncoder(Config.SEMANTIC_MODEL, batch_size=Config.SEMANTIC_BATCH_SIZE)
+    if Config.SEMANTIC_ENCODER == 'embeddings':
+        return EmbeddingsEncoder(container.get('embeddings'), batch_size=Config.SEMANTIC_BATCH_SIZE)
+    return SpacyVectorEncoder(container.get('nlp'))
+
+def _build_recognizer(container: "Components"):
+    from src.chunkers.audio_chunker import NullRecognizer, SpeechRecognitionRecognizer
+    if Config.SPEECH_BACKEND == 'none':
+        return NullRecognizer()
+    return SpeechRecognitionRecognizer(Config.SPEECH_BACKEND, model=Config.WHISPER_MODEL)
+
+DEFAULT_FACTORIES: Dict[str, Callable[["Components"], Any]] = {
+    "embeddings": _build_embeddings,
+    "llm": _build_llm,
+    "embedder": _build_embedder,
+    "vector_db": _build_vector_db,
+    "reranker": _build_reranker,
+    "blob_store": _build_blob_store,
+    "doc_store": _build_doc_store,
+    "captioner": _build_captioner,
+    "recognizer": _build_recognizer,
+    "nlp": _build_nlp,
+    "lexical_index": _build_lexical_index,
+    "sentence_encoder": _build_sentence_encoder,
+}
+
+# ----------------------------
+# Component Container
+# ----------------------------
+
+class Components:
+    def __init__(self, factories: Dict[str, Callable[["Components"], Any]] = None):
+        """
+        Lazily builds and caches the shared RAG components.
+
+        Each component is constructed on first access, at most once per process,
+        and its construction time is recorded. Components depend on each other
+        through the container, so the Embedder and the VectorDB share a single
+        embeddings client.
+
+        Args:
+            factories (Dict[str, Callable]): Component name to factory mapping.
+                Each factory receives the container. Defaults to DEFAULT_FACTORIES.
+        """
+        self._factories = dict(factories or DEFAULT_FACTORIES)
+        self._instances: Dict[str, Any] = {}
+        self._init_times: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def get(self, name: str) -> Any:
+        """
+        Return the named component, building it on first use.
+
+        Args:
+            name (str): Component name (e.g., 'llm', 'vector_db').
+
+        Returns:
+            Any: The component instance.
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            # Re-check under the lock; another thread may have built it meanwhile
+            if name in self._instances:
+                return self._instances[name]
+            if name not in self._factories:
+                raise KeyError(f"Unknown component: {name}")
+            start_time = time.perf_counter()
+            try:
+                instance = self._factories[name](self)
+            except Exception as e:
+                logger.error(f"Error initializing component '{name}': {e}")
+                raise e
+            # Dependencies built inside the factory record their own time; keep it inclusive here
+            init_ms = (time.perf_counter() - start_time) * 1000
+            self._instances[name] = instance
+            self._init_times[name] = init_ms
+            logger.info(f"Initialized component '{name}' in {init_ms:.1f} ms")
+            return instance
+
+    def built(self, name: str) -> bool:
+        """
+        Return whether the named component has been built (or overridden).
+        """
+        return name in self._instances
+
+    def register(self, name: str, factory: Callable[["Components"], Any]):
+        """
+        Register (or replace) the factory for a component.
+
+        An already-built instance is discarded so the new factory takes effect
+        on the next access.
+
+        Args:
+            name (str): Component name.
+            factory (Callable): Factory receiving the container.
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+            self._init_times.pop(name, None)
+
+    def override(self, name: str, instance: Any):
+        """
+        Install a ready-made instance for a component, e.g. a local fake in tests.
+
+        Args:
+            name (str): Component name.
+            instance (Any): The instance to use.
+        """
+        with self._lock:
+            self._instances[name] = instance
+            self._init_times[name] = 0.0
+
+    def reset(self, name: str = None):
+        """
+        Drop built instances so they are rebuilt on next access.
+
+        Args:
+            name (str, optional): Component to reset. Resets all when omitted.
+        """
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+                self._init_times.clear()
+            else:
+                self._instances.pop(name, None)
+                self._init_times.pop(name, None)
+
+    def warmup(self, names) -> Dict[str, float]:
+        """
+        Build the named components now instead of on first use.
+
+        Args:
+            names (Iterable[str]): Components to build.
+
+        Returns:
+            Dict[str, float]: Construction time in milliseconds of each built component.
+        """
+        for name in names:
+            self.get(name)
+        return self.init_times()
+
+    def init_times(self) -> Dict[str, float]:
+        """
+        Return the construction time in milliseconds of each built component.
+        """
+        with self._lock:
+            return {name: round(ms, 2) for name, ms in self._init_times.items()}
+
+    @property
+    def llm(self):
+        return self.get('llm')
+
+    @property
+    def embeddings(self):
+        return self.get('embeddings')
+
+    @property
+    def embedder(self):
+        return self.get('embedder')
+
+    @property
+    def vector_db(self):
+        return self.get('vector_db')
+
+    @property
+    def reranker(self):
+        return self.get('reranker')
+
+    @property
+    def blob_store(self):
+        return self.get('blob_store')
+
+    @property
+    def doc_store(self):
+        return self.get('doc_store')
+
+    @property
+    def captioner(self):
+        return self.get('captioner')
+
+    @property
+    def recognizer(self):
+        return self.get('recognizer')
+
+    @property
+    def nlp(self):
+        return self.get('nlp')
+
+# Process-wide container
+components = Components()
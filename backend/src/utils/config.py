@@ -11,9 +11,128 @@ class Config:
     TEXT_CHUNKS_PATH = os.getenv('TEXT_CHUNKS_PATH', './data/processed/text_chunks.txt')
     TABLES_PATH = os.getenv('TABLES_PATH', './data/processed/tables.md')
 
+    # PDF text backend: 'auto', 'pymupdf', 'pypdf2' or 'pdfplumber'. With 'auto',
+    # backends are benchmarked on PDF_BENCHMARK_SAMPLE if set, else PyMuPDF is preferred.
+    PDF_BACKEND = os.getenv('PDF_BACKEND', 'auto')
+    PDF_BENCHMARK_SAMPLE = os.getenv('PDF_BENCHMARK_SAMPLE')
+
     # OpenAI API
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
+    # Component backends: 'openai' or 'fake' (local stand-ins, no network)
+    LLM_BACKEND = os.getenv('LLM_BACKEND', 'openai')
+    LLM_MODEL = os.getenv('LLM_MODEL', 'gpt-4')
+    LLM_MAX_CONNECTIONS = int(os.getenv('LLM_MAX_CONNECTIONS', '20'))
+    EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'openai')
+    # Micro-batching: concurrent embedding calls (queries and uploads of all users) are
+    # coalesced for up to EMBED_BATCH_WAIT_MS or EMBED_BATCH_MAX_ITEMS texts per backend call
+    EMBED_BATCHING = os.getenv('EMBED_BATCHING', 'true').lower() == 'true'
+    EMBED_BATCH_WAIT_MS = float(os.getenv('EMBED_BATCH_WAIT_MS', '5'))
+    EMBED_BATCH_MAX_ITEMS = int(os.getenv('EMBED_BATCH_MAX_ITEMS', '256'))
+    EMBED_BATCH_CONCURRENCY = int(os.getenv('EMBED_BATCH_CONCURRENCY', '4'))  # Batches in flight at once
+
     # Database Configurations
     REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379')
     CHROMA_COLLECTION_NAME = os.getenv('CHROMA_COLLECTION_NAME', 'mm_rag')
+    CHROMA_PERSIST_DIRECTORY = os.getenv('CHROMA_PERSIST_DIRECTORY', './chroma_db')
+    INDEX_UPLOADS = os.getenv('INDEX_UPLOADS', 'false').lower() == 'true'  # Embed and store chunks on upload
+
+    # Reranking: over-fetch RERANK_FETCH_K candidates and keep the best k
+    RERANK_ENABLED = os.getenv('RERANK_ENABLED', 'false').lower() == 'true'
+    RERANK_BACKEND = os.getenv('RERANK_BACKEND', 'cross-encoder')  # 'cross-encoder' or 'lexical'
+    RERANK_MODEL = os.getenv('RERANK_MODEL', 'cross-encoder/ms-marco-MiniLM-L-6-v2')
+    RERANK_FETCH_K = int(os.getenv('RERANK_FETCH_K', '20'))
+    RERANK_BATCH_SIZE = int(os.getenv('RERANK_BATCH_SIZE', '16'))
+    RERANK_BUDGET_MS = float(os.getenv('RERANK_BUDGET_MS', '300'))
+
+    # Image ingestion: thumbnails live in a content-addressed blob store
+    BLOB_STORE_DIR = os.getenv('BLOB_STORE_DIR', './data/blobs')
+    CAPTION_BACKEND = os.getenv('CAPTION_BACKEND', 'none')  # 'transformers' or 'none'
+    CAPTION_MODEL = os.getenv('CAPTION_MODEL', 'Salesforce/blip-image-captioning-base')
+    IMAGE_BATCH_SIZE = int(os.getenv('IMAGE_BATCH_SIZE', '8'))
+    THUMBNAIL_SIZE = int(os.getenv('THUMBNAIL_SIZE', '256'))
+
+    # Audio ingestion: recordings are decoded and transcribed in fixed-size windows
+    AUDIO_WINDOW_SECONDS = float(os.getenv('AUDIO_WINDOW_SECONDS', '30'))
+    AUDIO_OVERLAP_SECONDS = float(os.getenv('AUDIO_OVERLAP_SECONDS', '0'))
+    AUDIO_WORKERS = int(os.getenv('AUDIO_WORKERS', '4'))
+    SPEECH_BACKEND = os.getenv('SPEECH_BACKEND', 'sphinx')  # 'sphinx', 'whisper' or 'none'
+    WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'base')
+
+    # Chunking strategies run on uploads unless the request selects others
+    # (registered in src/chunkers/strategies.py)
+    CHUNKING_STRATEGIES = os.getenv('CHUNKING_STRATEGIES', 'text_chunker,batch_chunker')
+
+    # Semantic chunking: cut where adjacent sentences stop being similar. The encoder is
+    # 'spacy' (word vectors of SPACY_MODEL, which needs a model with vectors such as
+    # en_core_web_lg), 'sentence-transformers' (SEMANTIC_MODEL) or 'embeddings' (EMBEDDING_BACKEND)
+    SEMANTIC_ENCODER = os.getenv('SEMANTIC_ENCODER', 'spacy')
+    SEMANTIC_MODEL = os.getenv('SEMANTIC_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+    SEMANTIC_BATCH_SIZE = int(os.getenv('SEMANTIC_BATCH_SIZE', '64'))
+    SEMANTIC_MIN_WORDS = int(os.getenv('SEMANTIC_MIN_WORDS', '150'))
+    SEMANTIC_MAX_WORDS = int(os.getenv('SEMANTIC_MAX_WORDS', '500'))
+    SEMANTIC_WINDOW = int(os.getenv('SEMANTIC_WINDOW', '3'))  # Sentences averaged on each side of a gap
+    SEMANTIC_BREAKPOINT_PERCENTILE = float(os.getenv('SEMANTIC_BREAKPOINT_PERCENTILE', '10'))
+
+    # Hierarchical (small-to-big) index of uploads: small child chunks are embedded and
+    # searched, and retrieval returns their parent sections, stored once in DOC_STORE_PATH
+    HIERARCHICAL_INDEX = os.getenv('HIERARCHICAL_INDEX', 'false').lower() == 'true'
+    DOC_STORE_PATH = os.getenv('DOC_STORE_PATH', './data/doc_store.sqlite3')
+    PARENT_MIN_WORDS = int(os.getenv('PARENT_MIN_WORDS', '300'))
+    PARENT_MAX_WORDS = int(os.getenv('PARENT_MAX_WORDS', '500'))
+    CHILD_MAX_WORDS = int(os.getenv('CHILD_MAX_WORDS', '60'))
+    PARENT_FETCH_FACTOR = int(os.getenv('PARENT_FETCH_FACTOR', '4'))  # Children matched per parent returned
+
+    # Table chunking: row groups repeat the header and stay under TABLE_CHUNK_MAX_CHARS
+    TABLE_CHUNK_STYLE = os.getenv('TABLE_CHUNK_STYLE', 'markdown')  # 'markdown' or 'key-value'
+    TABLE_CHUNK_MAX_CHARS = int(os.getenv('TABLE_CHUNK_MAX_CHARS', '1000'))
+
+    # Admission control of uploads and queries, per worker process. Work is costed in
+    # units of about one text page: a PDF page costs 1 (ADMISSION_OCR_PAGE_COST with OCR),
+    # other files ADMISSION_BYTES_PER_UNIT bytes per unit, a query ADMISSION_QUERY_COST.
+    # Clients (ADMISSION_CLIENT_HEADER, else the client address) get a token bucket of
+    # ADMISSION_BURST units refilled at ADMISSION_RATE units/s and a cap on concurrent
+    # requests (429). The worker runs up to ADMISSION_MAX_INFLIGHT_COST units of uploads and
+    # ADMISSION_MAX_INFLIGHT_QUERIES of queries at once, and queues up to ADMISSION_MAX_QUEUE
+    # more of each for ADMISSION_QUEUE_TIMEOUT seconds (503).
+    ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+    ADMISSION_CLIENT_HEADER = os.getenv('ADMISSION_CLIENT_HEADER', 'X-Client-ID')
+    ADMISSION_RATE = float(os.getenv('ADMISSION_RATE', '5'))
+    ADMISSION_BURST = float(os.getenv('ADMISSION_BURST', '500'))
+    ADMISSION_CLIENT_UPLOADS = int(os.getenv('ADMISSION_CLIENT_UPLOADS', '2'))
+    ADMISSION_CLIENT_QUERIES = int(os.getenv('ADMISSION_CLIENT_QUERIES', '16'))
+    ADMISSION_MAX_INFLIGHT_COST = float(os.getenv('ADMISSION_MAX_INFLIGHT_COST', '1000'))  # Uploads
+    ADMISSION_MAX_INFLIGHT_QUERIES = float(os.getenv('ADMISSION_MAX_INFLIGHT_QUERIES', '64'))  # Query cost units
+    ADMISSION_MAX_QUEUE = int(os.getenv('ADMISSION_MAX_QUEUE', '64'))
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', '30'))
+    ADMISSION_OCR_PAGE_COST = float(os.getenv('ADMISSION_OCR_PAGE_COST', '10'))
+    ADMISSION_BYTES_PER_UNIT = int(os.getenv('ADMISSION_BYTES_PER_UNIT', '5000'))
+    ADMISSION_QUERY_COST = float(os.getenv('ADMISSION_QUERY_COST', '1'))
+
+    # Profiling: per-request sampling profiles are taken for requests with the
+    # X-Profile header (when PROFILE_HEADER_ENABLED) or armed via POST /admin/profile.
+    # Admin endpoints require ADMIN_TOKEN in the X-Admin-Token header and are off without it.
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+    PROFILE_HEADER_ENABLED = os.getenv('PROFILE_HEADER_ENABLED', 'false').lower() == 'true'
+    PROFILE_DIR = os.getenv('PROFILE_DIR', './data/profiles')
+    PROFILE_FORMAT = os.getenv('PROFILE_FORMAT', 'speedscope')  # 'speedscope' or 'collapsed'
+    PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', '5'))
+    # Continuous low-rate sampler ranking the hottest functions in app/ and src/
+    PROFILE_SAMPLER_ENABLED = os.getenv('PROFILE_SAMPLER_ENABLED', 'false').lower() == 'true'
+    PROFILE_SAMPLER_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLER_INTERVAL_MS', '50'))
+    PROFILE_REPORT_SECONDS = float(os.getenv('PROFILE_REPORT_SECONDS', '300'))
+
+    # Logging: records go through a queue to a background writer
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVELS = os.getenv('LOG_LEVELS', '')  # Per-logger levels, e.g. "src.chunkers=DEBUG,chromadb=WARNING"
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' or 'text'
+    LOG_FILE = os.getenv('LOG_FILE', '')  # Optional rotating log file
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))  # Records beyond this are dropped
+
+    # Startup: models are installed by `python -m src.utils.warmup --provision`, never
+    # downloaded at import. WARMUP_COMPONENTS and WARMUP_MODULES are loaded at startup
+    # (in the gunicorn master with preload, so forked workers share them).
+    SPACY_MODEL = os.getenv('SPACY_MODEL', 'en_core_web_lg')
+    WARMUP_ON_STARTUP = os.getenv('WARMUP_ON_STARTUP', 'true').lower() == 'true'
+    WARMUP_COMPONENTS = os.getenv('WARMUP_COMPONENTS', 'nlp')
+    WARMUP_MODULES = os.getenv('WARMUP_MODULES', 'pandas,fitz,pdfplumber,camelot,tabula')
@@ -0,0 +1,238 @@
+# backend/src/utils/instrumentation.py
+
+import bisect
+import contextvars
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Memory
+# ----------------------------
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+def current_rss() -> int:
+    """
+    Returns the resident set size of the process in bytes.
+
+    Reads /proc on Linux; elsewhere falls back to the peak RSS.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return peak_rss()
+
+def peak_rss() -> int:
+    """
+    Returns the highest resident set size the process has reached, in bytes.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+
+# ----------------------------
+# Metrics Registry
+# ----------------------------
+
+# Upper bounds of the duration histogram buckets, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    errors: int = 0
+    items: int = 0
+    seconds: float = 0.0
+    peak_rss: int = 0
+    buckets: List[int] = field(default_factory=lambda: [0] * len(DURATION_BUCKETS))
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Process-wide store of stage timings and named counters, rendered in the
+        Prometheus text exposition format.
+        """
+        self._stages: Dict[str, StageStats] = {}
+        self._counters: Dict[str, Tuple[str, Dict[Tuple[Tuple[str, str], ...], float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe_stage(self, stage: str, seconds: float, items: int, peak_rss_bytes: int, error: bool = False):
+        with self._lock:
+            stats = self._stages.setdefault(stage, StageStats())
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.items += items
+            stats.seconds += seconds
+            stats.peak_rss = max(stats.peak_rss, peak_rss_bytes)
+            index = bisect.bisect_left(DURATION_BUCKETS, seconds)
+            if index < len(DURATION_BUCKETS):
+                stats.buckets[index] += 1
+
+    def inc(self, name: str, help_text: str = '', amount: float = 1, **labels):
+        """
+        Increments a counter, creating it on first use.
+
+        Args:
+            name (str): Metric name, e.g. 'rag_admission_rejected_total'.
+            help_text (str): Description shown in the exposition.
+            amount (float): Increment.
+            **labels: Label values of the series.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            _, series = self._counters.setdefault(name, (help_text, {}))
+            series[key] = series.get(key, 0) + amount
+
+    def stage_snapshot(self) -> Dict[str, StageStats]:
+        with self._lock:
+            return {
+                stage: StageStats(s.calls, s.errors, s.items, s.seconds, s.peak_rss, list(s.buckets))
+                for stage, s in self._stages.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """
+        Renders all metrics in the Prometheus text format (version 0.0.4).
+        """
+        stages = self.stage_snapshot()
+        with self._lock:
+            counters = {name: (help_text, dict(series)) for name, (help_text, series) in self._counters.items()}
+
+        lines = [
+            "# HELP rag_stage_duration_seconds Time spent in each pipeline stage.",
+            "# TYPE rag_stage_duration_seconds histogram",
+        ]
+        for stage, stats in sorted(stages.items()):
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append(f'rag_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'rag_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {stats.calls}')
+            lines.append(f'rag_stage_duration_seconds_sum{{stage="{stage}"}} {stats.seconds:.6f}')
+            lines.append(f'rag_stage_duration_seconds_count{{stage="{stage}"}} {stats.calls}')
+
+        lines += ["# HELP rag_stage_items_total Items processed by each pipeline stage.", "# TYPE rag_stage_items_total counter"]
+        lines += [f'rag_stage_items_total{{stage="{stage}"}} {stats.items}' for stage, stats in sorted(stages.items())]
+        lines += ["# HELP rag_stage_errors_total Failed runs of each pipeline stage.", "# TYPE rag_stage_errors_total counter"]
+        lines += [f'rag_stage_errors_total{{stage="{stage}"}} {stats.errors}' for stage, stats in sorted(stages.items())]
+        lines += [
+            "# HELP rag_stage_peak_rss_bytes Highest resident memory observed during each stage.",
+            "# TYPE rag_stage_peak_rss_bytes gauge",
+        ]
+        lines += [f'rag_stage_peak_rss_bytes{{stage="{stage}"}} {stats.peak_rss}' for stage, stats in sorted(stages.items())]
+
+        for name, (help_text, series) in sorted(counters.items()):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for key, value in sorted(series.items()):
+                label_text = ",".join(f'{label}="{label_value}"' for label, label_value in key)
+                lines.append(f"{name}{{{label_text}}} {value:g}" if label_text else f"{name} {value:g}")
+
+        lines += [
+            "# HELP process_resident_memory_bytes Resident memory size in bytes.",
+            "# TYPE process_resident_memory_bytes gauge",
+            f"process_resident_memory_bytes {current_rss()}",
+        ]
+        return "\n".join(lines) + "\n"
+
+# Process-wide registry
+metrics = MetricsRegistry()
+
+# ----------------------------
+# Spans
+# ----------------------------
+
+class Span:
+    """
+    A timed pipeline stage. Set ``items`` inside the block to report how much it processed.
+    """
+    __slots__ = ('stage', 'items', 'seconds', 'rss_start', 'rss_end', 'peak_rss')
+
+    def __init__(self, stage: str, items: int = 0):
+        self.stage = stage
+        self.items = items
+        self.seconds = 0.0
+        self.rss_start = 0
+        self.rss_end = 0
+        self.peak_rss = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "stage": self.stage,
+            "duration_ms": round(self.seconds * 1000, 2),
+            "items": self.items,
+            "rss_delta_bytes": self.rss_end - self.rss_start,
+            "peak_rss_bytes": self.peak_rss,
+        }
+
+# Spans finished within the current collect_spans() block, if any
+_collected: contextvars.ContextVar[Optional[List[Span]]] = contextvars.ContextVar('collected_spans', default=None)
+
+@contextmanager
+def span(stage: str, items: int = 0):
+    """
+    Times a pipeline stage and records its duration, item count and peak RSS.
+
+    The peak is the process high-water mark if the stage raised it, otherwise
+    the larger of the RSS at the start and end of the stage. Nested spans are
+    recorded independently; durations are inclusive.
+
+    Args:
+        stage (str): Stage name, e.g. 'extraction' or 'tables.camelot'.
+        items (int): Initial item count; can be updated through the yielded span.
+
+    Yields:
+        Span: The running span.
+    """
+    current = Span(stage, items)
+    peak_before = peak_rss()
+    current.rss_start = current_rss()
+    start_time = time.perf_counter()
+    error = False
+    try:
+        yield current
+    except BaseException:
+        error = True
+        raise
+    finally:
+        current.seconds = time.perf_counter() - start_time
+        current.rss_end = current_rss()
+        peak_after = peak_rss()
+        current.peak_rss = peak_after if peak_after > peak_before else max(current.rss_start, current.rss_end)
+        metrics.observe_stage(stage, current.seconds, current.items, current.peak_rss, error=error)
+        collected = _collected.get()
+        if collected is not None:
+            collected.append(current)
+        logger.debug("Stage '%s' took %.1f ms (%d items)", stage, current.seconds * 1000, current.items)
+
+@contextmanager
+def collect_spans():
+    """
+    Collects the spans finished inside the block, e.g. for one request.
+
+    Spans recorded in other threads are included when the context is
+    propagated (as asyncio.to_thread does).
+
+    Yields:
+        List[Span]: Finished spans, in completion order.
+    """
+    spans: List[Span] = []
+    token = _collected.set(spans)
+    try:
+        yield spans
+    finally:
+        _collected.reset(token)
@@ -1,41 +1,207 @@
-# backend/app/src/utils/logger.py
+# backend/src/utils/logger.py
 
+import atexit
+import contextvars
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+import queue
+import time
+import uuid
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
-def setup_logger(name: str) -> logging.Logger:
+from src.utils.config import Config
+
+# ----------------------------
+# Log Context
+# ----------------------------
+
+# IDs attached to every record logged while they are set
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('request_id', default=None)
+job_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('job_id', default=None)
+
+def new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+@contextmanager
+def log_context(request_id: Optional[str] = None, job_id: Optional[str] = None):
     """
-    Set up and configure a logger.
+    Tags the records logged inside the block with a request and/or job ID.
+
+    The IDs follow the context into asyncio tasks and asyncio.to_thread calls.
 
     Args:
-        name (str): Name of the logger.
+        request_id (str, optional): ID of the HTTP request being served.
+        job_id (str, optional): ID of a batch job, e.g. one document of a batch run.
+    """
+    tokens = []
+    if request_id is not None:
+        tokens.append((request_id_var, request_id_var.set(request_id)))
+    if job_id is not None:
+        tokens.append((job_id_var, job_id_var.set(job_id)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
 
-    Returns:
-        logging.Logger: Configured logger instance.
+class ContextFilter(logging.Filter):
+    """
+    Copies the current request and job IDs onto each record. Runs in the calling
+    thread, before the record is handed to the queue.
+    """
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.job_id = job_id_var.get()
+        return True
+
+# ----------------------------
+# Formatting
+# ----------------------------
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'request_id', 'job_id'}
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ('request_id', 'job_id'):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        request_id = getattr(record, 'request_id', None)
+        job_id = getattr(record, 'job_id', None)
+        if request_id or job_id:
+            tags = " ".join(f"{key}={value}" for key, value in (("request_id", request_id), ("job_id", job_id)) if value)
+            line = f"{line} [{tags}]"
+        return line
+
+class _NonBlockingQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now, while the arguments are still
+        # valid, but leave the formatting to the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Drop rather than block the caller when the writer falls behind
+            pass
+
+# ----------------------------
+# Setup
+# ----------------------------
+
+_listener: Optional[QueueListener] = None
+
+def _restart_listener_after_fork():
+    """
+    Gives a forked child (e.g. a gunicorn worker forked from a preloaded master)
+    its own writer thread; the parent's listener thread does not survive the fork.
+    """
+    global _listener
+    if _listener is None:
+        return
+    # Drop whatever the parent had queued, it writes those itself
+    log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, _NonBlockingQueueHandler):
+            handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None, log_file: Optional[str] = None):
+    """
+    Configures the root logger once for the whole process.
+
+    Records are put on a queue by the calling thread and written to stderr
+    (and LOG_FILE, if set) by a background listener, so logging never blocks
+    on I/O. Messages are formatted only for enabled levels: pass arguments
+    %-style (logger.debug("chunk %d", idx)) in hot loops so disabled debug
+    calls cost a level check.
+
+    Args:
+        level (str, optional): Root level. Defaults to Config.LOG_LEVEL.
+        log_format (str, optional): 'json' or 'text'. Defaults to Config.LOG_FORMAT.
+        log_file (str, optional): Also write to this rotating file. Defaults to Config.LOG_FILE.
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    global _listener
+    if _listener is not None:
+        return
 
-    # Prevent adding multiple handlers if the logger already has them
-    if not logger.handlers:
-        # Create console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
+    formatter = JsonFormatter() if (log_format or Config.LOG_FORMAT) == 'json' else TextFormatter()
+    handlers = [logging.StreamHandler()]
+    log_file = log_file if log_file is not None else Config.LOG_FILE
+    if log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        handlers.append(RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=5))
+    for handler in handlers:
+        handler.setFormatter(formatter)
 
-        # Create rotating file handler
-        log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', '..', 'logs')
-        os.makedirs(log_dir, exist_ok=True)
-        file_handler = RotatingFileHandler(os.path.join(log_dir, 'app.log'), maxBytes=5*1024*1024, backupCount=5)
-        file_handler.setLevel(logging.INFO)
+    log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    queue_handler = _NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
 
-        # Create formatter and add it to the handlers
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        console_handler.setFormatter(formatter)
-        file_handler.setFormatter(formatter)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel((level or Config.LOG_LEVEL).upper())
 
-        # Add handlers to the logger
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+    # Per-logger levels, e.g. "src.chunkers=DEBUG,httpx=WARNING"
+    for override in filter(None, (item.strip() for item in Config.LOG_LEVELS.split(','))):
+        name, _, logger_level = override.partition('=')
+        logging.getLogger(name.strip()).setLevel(logger_level.strip().upper())
 
-    return logger
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(lambda: _listener.stop())
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+def setup_logger(name: str) -> logging.Logger:
+    """
+    Returns a module logger.
+
+    Importing a module never configures logging: the entry points do, with
+    configure_logging (app.main, which gunicorn and uvicorn load,
+    app.populate_vector_db and python -m src.utils.warmup).
+
+    Args:
+        name (str): Name of the logger.
+
+    Returns:
+        logging.Logger: Logger that writes through the central configuration.
+    """
+    return logging.getLogger(name)
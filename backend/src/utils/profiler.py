@@ -0,0 +1,304 @@
+# backend/src/utils/profiler.py
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Frames are identified by function, file and first line of the function
+FrameKey = Tuple[str, str, int]
+
+# The samplers' own threads and frames are left out of profiles and reports
+_OWN_FILE = os.path.abspath(__file__)
+_SAMPLER_THREADS = ('sampling-profiler', 'continuous-sampler')
+
+def _thread_names() -> Dict[int, str]:
+    return {thread.ident: thread.name for thread in threading.enumerate()}
+
+def _stack(frame, max_depth: int) -> Tuple[FrameKey, ...]:
+    """
+    Returns the stack of a frame, outermost call first.
+    """
+    stack = []
+    while frame is not None and len(stack) < max_depth:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+# ----------------------------
+# Request Profiler
+# ----------------------------
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, thread_ids: Optional[Set[int]] = None, max_depth: int = 128):
+        """
+        Statistical profiler that samples the stacks of running threads from a background thread.
+
+        Unlike cProfile it adds no per-call overhead to the profiled code, and it
+        also sees time spent in C extensions (the stack shows the Python caller).
+
+        Args:
+            interval (float): Seconds between samples.
+            thread_ids (Set[int], optional): Threads to sample. Defaults to all threads
+                except the sampler itself.
+            max_depth (int): Frames kept per stack, counted from the innermost call.
+        """
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.max_depth = max_depth
+        self.samples: Dict[int, List[Tuple[Tuple[FrameKey, ...], float]]] = defaultdict(list)
+        self.thread_names: Dict[int, str] = {}
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            self.thread_names.update(_thread_names())
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                if self.thread_names.get(thread_id) in _SAMPLER_THREADS:
+                    continue
+                self.samples[thread_id].append((_stack(frame, self.max_depth), elapsed))
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _thread_label(self, thread_id: int) -> str:
+        return f"{self.thread_names.get(thread_id, 'thread')}-{thread_id}"
+
+    def to_speedscope(self, name: str = 'profile') -> Dict:
+        """
+        Returns the samples in the speedscope file format, one profile per thread.
+        """
+        frame_index: Dict[FrameKey, int] = {}
+        frames = []
+        profiles = []
+        for thread_id, thread_samples in self.samples.items():
+            stacks = []
+            for stack, _ in thread_samples:
+                indices = []
+                for key in stack:
+                    if key not in frame_index:
+                        frame_index[key] = len(frames)
+                        frames.append({"name": key[0], "file": key[1], "line": key[2]})
+                    indices.append(frame_index[key])
+                stacks.append(indices)
+            weights = [weight for _, weight in thread_samples]
+            profiles.append({
+                "type": "sampled",
+                "name": self._thread_label(thread_id),
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": stacks,
+                "weights": weights,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "mm-rag sampling profiler",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def to_collapsed(self) -> str:
+        """
+        Returns the samples as collapsed stacks ("thread;outer;...;inner count"),
+        the input format of flamegraph.pl and most flamegraph viewers.
+        """
+        counts = Counter()
+        for thread_id, thread_samples in self.samples.items():
+            label = self._thread_label(thread_id)
+            for stack, _ in thread_samples:
+                frames = [label] + [f"{function} ({os.path.basename(file)}:{line})" for function, file, line in stack]
+                counts[";".join(frames)] += 1
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(counts.items()))
+
+    def write(self, path: str, output_format: str = 'speedscope', name: str = 'profile') -> str:
+        """
+        Writes the profile to a file.
+
+        Args:
+            path (str): Output path.
+            output_format (str): 'speedscope' (JSON, open at https://www.speedscope.app) or 'collapsed'.
+            name (str): Profile name shown by the viewer.
+
+        Returns:
+            str: The output path.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            if output_format == 'collapsed':
+                f.write(self.to_collapsed())
+            else:
+                json.dump(self.to_speedscope(name), f)
+        logger.info(f"Wrote {output_format} profile ({self.duration:.2f} s) to {path}")
+        return path
+
+# ----------------------------
+# Continuous Sampler
+# ----------------------------
+
+class ContinuousSampler:
+    def __init__(
+        self,
+        roots: Iterable[str],
+        interval: float = 0.05,
+        report_interval: float = 300,
+        top: int = 20,
+        max_depth: int = 128
+    ):
+        """
+        Low-frequency sampler that runs for the life of the process and ranks the
+        functions under the given source roots by the time spent in them.
+
+        Each sample is attributed to the innermost function under a root (its
+        "self" time, including library code it calls, e.g. Camelot under
+        extract_tables_with_camelot) and to every root function on the stack
+        ("total" time). Stacks without any root function, such as idle threads,
+        are ignored.
+
+        Args:
+            roots (Iterable[str]): Directories whose functions are reported.
+            interval (float): Seconds between samples.
+            report_interval (float): Seconds between hot-function reports in the log; 0 disables them.
+            top (int): Functions listed per report.
+            max_depth (int): Frames inspected per stack.
+        """
+        self.roots = tuple(os.path.abspath(root) + os.sep for root in roots)
+        self.interval = interval
+        self.report_interval = report_interval
+        self.top = top
+        self.max_depth = max_depth
+        self.samples = 0
+        self.self_counts: Counter = Counter()
+        self.total_counts: Counter = Counter()
+        self._names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _name(self, function: str, file: str) -> Optional[str]:
+        """
+        Returns 'relative/path.py:function' for files under a root, else None.
+        """
+        cached = self._names.get(file)
+        if cached is None:
+            root = None if file == _OWN_FILE else next((root for root in self.roots if file.startswith(root)), None)
+            cached = os.path.relpath(file, os.path.dirname(root.rstrip(os.sep))) if root else ''
+            self._names[file] = cached
+        return f"{cached}:{function}" if cached else None
+
+    def _sample(self, own_id: int):
+        stacks = [frame for thread_id, frame in sys._current_frames().items() if thread_id != own_id]
+        with self._lock:
+            for frame in stacks:
+                names = []
+                depth = 0
+                while frame is not None and depth < self.max_depth:
+                    name = self._name(frame.f_code.co_name, frame.f_code.co_filename)
+                    if name is not None:
+                        names.append(name)
+                    frame = frame.f_back
+                    depth += 1
+                if not names:
+                    continue
+                self.samples += 1
+                self.self_counts[names[0]] += 1  # innermost root function
+                self.total_counts.update(set(names))
+
+    def _run(self):
+        own_id = threading.get_ident()
+        next_report = time.monotonic() + self.report_interval
+        while not self._stop.wait(self.interval):
+            self._sample(own_id)
+            if self.report_interval and time.monotonic() >= next_report:
+                next_report += self.report_interval
+                self.log_report()
+
+    def start(self) -> "ContinuousSampler":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='continuous-sampler', daemon=True)
+            self._thread.start()
+            logger.info(f"Continuous sampler started ({self.interval * 1000:.0f} ms interval).")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def report(self, top: Optional[int] = None) -> Dict:
+        """
+        Returns the hottest functions, ranked by self time.
+
+        Returns:
+            Dict: {"samples", "interval_seconds", "functions": [{"function", "self_seconds",
+                "self_percent", "total_seconds", "total_percent"}]}
+        """
+        with self._lock:
+            samples = self.samples
+            ranked = self.self_counts.most_common(top or self.top)
+            totals = dict(self.total_counts)
+        return {
+            "samples": samples,
+            "interval_seconds": self.interval,
+            "functions": [
+                {
+                    "function": function,
+                    "self_seconds": round(count * self.interval, 3),
+                    "self_percent": round(100 * count / samples, 1),
+                    "total_seconds": round(totals[function] * self.interval, 3),
+                    "total_percent": round(100 * totals[function] / samples, 1),
+                }
+                for function, count in ranked
+            ],
+        }
+
+    def log_report(self):
+        report = self.report()
+        if not report["functions"]:
+            return
+        lines = [
+            f"{entry['self_percent']:5.1f}% self {entry['total_percent']:5.1f}% total  {entry['function']}"
+            for entry in report["functions"]
+        ]
+        logger.info(f"Hot functions over {report['samples']} samples:\n" + "\n".join(lines))
+
+    def reset(self):
+        with self._lock:
+            self.samples = 0
+            self.self_counts.clear()
+            self.total_counts.clear()
@@ -1,5 +1,114 @@
 # backend/src/utils/summary.py
 
+import re
+from typing import Dict
+
+# Whitespace containing a newline and followed by an uppercase letter starts a paragraph
+_PARAGRAPH_START = re.compile(r'\n\s*(?=[A-Z])')
+
+class TextMetrics:
+    def __init__(self):
+        """
+        Streaming document metrics: line, paragraph and word counts and the content size.
+
+        Text is fed in pieces (pages, blocks) as it is extracted, and each piece is
+        scanned once; the result is the same as for the concatenated text. Newlines
+        are normalized, lines count when non-blank, and a paragraph starts at an
+        uppercase letter preceded by whitespace containing a newline (falling back
+        to one paragraph per line when that finds at most one).
+        """
+        self.num_lines = 0
+        self.num_words = 0
+        self.num_paragraph_starts = 0
+        self.content_size = 0
+        self._has_content = False
+        self._line_has_content = False  # the last, still open line
+        self._gap_has_newline = False  # whitespace after the last non-whitespace character
+        self._ends_in_word = False
+        self._ends_in_cr = False
+
+    def update(self, piece: str) -> "TextMetrics":
+        """
+        Adds the next piece of text.
+
+        Args:
+            piece (str): Text following everything added so far.
+
+        Returns:
+            TextMetrics: self, for chaining.
+        """
+        if self._ends_in_cr and piece.startswith('\n'):
+            # The '\r\n' was split between pieces and the '\r' already counted as the newline
+            piece = piece[1:]
+            self._ends_in_cr = False
+        if not piece:
+            return self
+        self._ends_in_cr = piece.endswith('\r')
+        piece = piece.replace('\r\n', '\n').replace('\r', '\n')
+        self.content_size += len(piece.encode('utf-8'))
+
+        # Lines: the first segment continues the open line
+        segments = piece.split('\n')
+        for segment in segments[:-1]:
+            if self._line_has_content or segment.strip():
+                self.num_lines += 1
+            self._line_has_content = False
+        if segments[-1].strip():
+            self._line_has_content = True
+
+        # Words: a word cut between two pieces counts once
+        words = len(piece.split())
+        if words and self._ends_in_word and not piece[0].isspace():
+            words -= 1
+        self.num_words += words
+        self._ends_in_word = not piece[-1].isspace()
+
+        # Paragraphs, including a start right at the beginning of the piece
+        content = piece.lstrip()
+        if not content:
+            self._gap_has_newline = self._gap_has_newline or '\n' in piece
+            return self
+        leading = piece[:len(piece) - len(content)]
+        if self._has_content and (self._gap_has_newline or '\n' in leading) and 'A' <= content[0] <= 'Z':
+            self.num_paragraph_starts += 1
+        self.num_paragraph_starts += len(_PARAGRAPH_START.findall(content))
+        self._has_content = True
+        trailing = content[len(content.rstrip()):]
+        self._gap_has_newline = '\n' in trailing
+        return self
+
+    @property
+    def lines(self) -> int:
+        return self.num_lines + (1 if self._line_has_content else 0)
+
+    @property
+    def paragraphs(self) -> int:
+        paragraphs = self.num_paragraph_starts + 1 if self._has_content else 0
+        # Without paragraph structure, count lines instead
+        return paragraphs if paragraphs > 1 else self.lines
+
+    def result(self, num_chunks: int = 0) -> Dict:
+        """
+        Returns the metrics of the text added so far.
+
+        Args:
+            num_chunks (int): Number of chunks the text was split into, by one chunker.
+
+        Returns:
+            Dict: num_lines, num_paragraphs, num_words, avg_words_per_paragraph,
+                avg_words_per_line, original_content_size and num_chunks.
+        """
+        lines, paragraphs = self.lines, self.paragraphs
+        return {
+            "num_lines": lines,
+            "num_paragraphs": paragraphs,
+            "num_words": self.num_words,
+            "avg_words_per_paragraph": round(self.num_words / paragraphs, 2) if paragraphs else 0,
+            "avg_words_per_line": round(self.num_words / lines, 2) if lines else 0,
+            "original_content_size": self.content_size,
+            "num_chunks": num_chunks
+        }
+
 def generate_summary(text: str) -> dict:
     """
     Generate summary details of the document.
@@ -10,16 +119,14 @@ def generate_summary(text: str) -> dict:
     Returns:
         dict: A dictionary containing summary metrics.
     """
-    lines = text.split('\n')
-    paragraphs = [para for para in text.split('\n\n') if para.strip()]
-    words = text.split()
+    metrics = TextMetrics().update(text).result()
 
     summary = {
-        "number_of_lines": len(lines),
-        "number_of_paragraphs": len(paragraphs),
-        "number_of_words": len(words),
-        "average_words_per_paragraph": round(len(words) / len(paragraphs), 2) if len(paragraphs) > 0 else 0,
-        "average_words_per_line": round(len(words) / len(lines), 2) if len(lines) > 0 else 0
+        "number_of_lines": metrics["num_lines"],
+        "number_of_paragraphs": metrics["num_paragraphs"],
+        "number_of_words": metrics["num_words"],
+        "average_words_per_paragraph": metrics["avg_words_per_paragraph"],
+        "average_words_per_line": metrics["avg_words_per_line"]
     }
 
     return summary
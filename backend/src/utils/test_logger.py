@@ -0,0 +1,110 @@
+# File: backend/src/utils/test_logger.py
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+from src.utils.logger import ContextFilter, JsonFormatter, _NonBlockingQueueHandler, log_context, new_id
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _record(message="indexed %d chunks", args=(3,), **extra):
+    record = logging.LogRecord('src.test', logging.INFO, __file__, 1, message, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+def _queue_logger(log_queue):
+    handler = _NonBlockingQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    logger = logging.getLogger(f'test_logger.{new_id()}')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    return logger
+
+def test_json_formatter_writes_one_object_with_the_record_fields():
+    line = JsonFormatter().format(_record(request_id='req-1', job_id=None, document_id='doc-a'))
+
+    entry = json.loads(line)
+    assert "\n" not in line
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "src.test"
+    assert entry["message"] == "indexed 3 chunks"
+    assert entry["ts"].endswith("Z")
+    assert entry["request_id"] == "req-1"
+    assert "job_id" not in entry
+    # Fields passed with extra= are kept
+    assert entry["document_id"] == "doc-a"
+    assert "exception" not in entry
+
+def test_json_formatter_includes_the_exception_resolved_by_the_queue_handler():
+    log_queue = queue.Queue()
+    logger = _queue_logger(log_queue)
+    try:
+        raise ValueError("bad page")
+    except ValueError:
+        logger.exception("parse failed")
+
+    entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+    assert entry["message"] == "parse failed"
+    assert "ValueError: bad page" in entry["exception"]
+
+def test_log_context_tags_records_and_is_restored():
+    log_queue = queue.Queue()
+    logger = _queue_logger(log_queue)
+
+    with log_context(request_id='req-1'):
+        with log_context(job_id='job-1'):
+            logger.info("inner")
+        logger.info("outer")
+    logger.info("after")
+
+    records = [log_queue.get_nowait() for _ in range(3)]
+    assert [(r.request_id, r.job_id) for r in records] == [('req-1', 'job-1'), ('req-1', None), (None, None)]
+
+def test_log_context_follows_tasks_and_to_thread():
+    log_queue = queue.Queue()
+    logger = _queue_logger(log_queue)
+
+    async def scenario():
+        with log_context(request_id='req-1'):
+            await asyncio.to_thread(logger.info, "in a worker thread")
+            task = asyncio.create_task(asyncio.to_thread(logger.info, "in a task"))
+        # The task was created inside the block, so it keeps the ID
+        await task
+
+    asyncio.run(scenario())
+    records = [log_queue.get_nowait() for _ in range(2)]
+    assert [r.request_id for r in records] == ['req-1', 'req-1']
+
+def test_full_queue_drops_records_instead_of_blocking():
+    log_queue = queue.Queue(maxsize=1)
+    logger = _queue_logger(log_queue)
+    done = threading.Event()
+
+    def log_past_the_limit():
+        for i in range(5):
+            logger.info("record %d", i)
+        done.set()
+
+    threading.Thread(target=log_past_the_limit, daemon=True).start()
+    assert done.wait(timeout=5), "logging blocked on a full queue"
+    assert log_queue.qsize() == 1
+    # The first record is kept, with its message resolved for the listener thread
+    record = log_queue.get_nowait()
+    assert record.msg == "record 0"
+    assert record.args is None
+
+def test_importing_modules_leaves_logging_unconfigured():
+    # In a fresh interpreter, since re-importing would replace shared module state here
+    code = (
+        "import logging, src.utils.components, src.multimodal_llm.fake_llm, app.routes\n"
+        "assert not logging.getLogger().handlers, logging.getLogger().handlers\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=BACKEND_DIR)
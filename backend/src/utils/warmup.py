@@ -0,0 +1,146 @@
+# backend/src/utils/warmup.py
+#
+# Startup hooks. Importing the app loads no models and downloads nothing;
+# instead:
+#   - provision() installs the spaCy model and NLTK data (run once per image:
+#     `python -m src.utils.warmup --provision`),
+#   - warmup() imports the heavy libraries and builds the models listed in
+#     WARMUP_MODULES / WARMUP_COMPONENTS, so the first request does not pay for
+#     them,
+#   - preload_for_fork() is the gunicorn master's variant: it builds only the
+#     fork-safe components, then freezes the heap so that forked workers share
+#     the loaded models and indexes read-only instead of each loading a copy.
+#
+# Usage (from the backend directory):
+#     python -m src.utils.warmup --provision
+#     python -m src.utils.warmup
+
+import argparse
+import gc
+import importlib
+import json
+import logging
+import time
+from typing import Dict, Iterable, Optional
+
+from src.utils.components import components
+from src.utils.config import Config
+from src.utils.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+NLTK_PACKAGES = ('punkt', 'punkt_tab')
+
+# Components holding no connections, threads or open files once built. They can
+# be built in a parent process and used by the workers forked from it; the
+# others (vector_db, llm, embeddings, ...) are built in each worker.
+FORK_SAFE_COMPONENTS = (
+    'nlp', 'lexical_index', 'reranker', 'captioner', 'recognizer', 'blob_store', 'sentence_encoder'
+)
+
+# Timings of the last warmup in this process, in milliseconds
+startup_report: Dict[str, float] = {}
+
+def _split(value: str):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def provision():
+    """
+    Installs the spaCy model and NLTK data the pipeline needs, if missing.
+    """
+    import nltk
+    import spacy
+
+    if not spacy.util.is_package(Config.SPACY_MODEL):
+        logger.info(f"Downloading spaCy model '{Config.SPACY_MODEL}'...")
+        from spacy.cli import download
+        download(Config.SPACY_MODEL)
+    for package in NLTK_PACKAGES:
+        nltk.download(package, quiet=True)
+    logger.info("Provisioning complete.")
+
+def warmup(modules: Optional[Iterable[str]] = None, component_names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Imports heavy modules and builds components ahead of the first request.
+
+    Each step runs in a "startup.<name>" span, so its duration also shows up in
+    /metrics. A module or component that fails to load is logged and skipped;
+    the request needing it reports the error instead.
+
+    Args:
+        modules (Iterable[str], optional): Modules to import. Defaults to Config.WARMUP_MODULES.
+        component_names (Iterable[str], optional): Components to build. Defaults to Config.WARMUP_COMPONENTS.
+
+    Returns:
+        Dict[str, float]: Milliseconds spent on each module ("import.<module>") and
+            component ("component.<name>"), plus the "total".
+    """
+    modules = _split(Config.WARMUP_MODULES) if modules is None else list(modules)
+    component_names = _split(Config.WARMUP_COMPONENTS) if component_names is None else list(component_names)
+
+    report: Dict[str, float] = {}
+    start = time.perf_counter()
+    for module in modules:
+        step = time.perf_counter()
+        try:
+            with span(f"startup.import.{module}"):
+                importlib.import_module(module)
+        except Exception as e:
+            logger.warning(f"Warmup could not import {module}: {e}")
+            continue
+        report[f"import.{module}"] = round((time.perf_counter() - step) * 1000, 1)
+    for name in component_names:
+        step = time.perf_counter()
+        try:
+            with span(f"startup.component.{name}"):
+                components.get(name)
+        except Exception as e:
+            logger.warning(f"Warmup could not build component '{name}': {e}")
+            continue
+        report[f"component.{name}"] = round((time.perf_counter() - step) * 1000, 1)
+    report["total"] = round((time.perf_counter() - start) * 1000, 1)
+
+    startup_report.clear()
+    startup_report.update(report)
+    logger.info(f"Warmup finished in {report['total']:.0f} ms.", extra={"startup": report})
+    return report
+
+def preload_for_fork(modules: Optional[Iterable[str]] = None, component_names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Loads what the workers share, in the parent process, right before forking them.
+
+    Forked workers see the parent's memory copy-on-write, so model weights and
+    index data loaded here stay physically shared as long as nobody writes to
+    them. Components that are not fork-safe are skipped and left to each
+    worker's own warmup. Finally the heap is frozen (gc.freeze): the workers'
+    garbage collector then never walks, and so never writes to, the inherited
+    objects, which would otherwise copy their pages one by one.
+
+    Args:
+        modules (Iterable[str], optional): Modules to import. Defaults to Config.WARMUP_MODULES.
+        component_names (Iterable[str], optional): Components to build. Defaults to Config.WARMUP_COMPONENTS.
+
+    Returns:
+        Dict[str, float]: The warmup timings (see warmup()).
+    """
+    component_names = _split(Config.WARMUP_COMPONENTS) if component_names is None else list(component_names)
+    skipped = [name for name in component_names if name not in FORK_SAFE_COMPONENTS]
+    if skipped:
+        logger.info(f"Not preloading {', '.join(skipped)} in the parent; workers build their own.")
+    report = warmup(modules, [name for name in component_names if name in FORK_SAFE_COMPONENTS])
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Froze {gc.get_freeze_count()} objects before forking workers.")
+    return report
+
+if __name__ == "__main__":
+    from src.utils.logger import configure_logging
+
+    parser = argparse.ArgumentParser(description="Provision models and report startup timings.")
+    parser.add_argument("--provision", action="store_true", help="Download missing models and data first.")
+    args = parser.parse_args()
+
+    configure_logging()
+    if args.provision:
+        provision()
+    print(json.dumps(warmup(), indent=2))
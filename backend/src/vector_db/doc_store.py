@@ -0,0 +1,121 @@
+# backend/src/vector_db/doc_store.py
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Dict, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parents (
+    id TEXT PRIMARY KEY,
+    document_id TEXT NOT NULL,
+    text BLOB NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS parents_document_id ON parents (document_id);
+"""
+
+class DocStore:
+    def __init__(self, path: str, compression_level: int = 6):
+        """
+        Compact key-value store for the parent sections of a hierarchical index.
+
+        Parents are stored once, zlib-compressed, in a SQLite file and fetched by
+        ID after their children matched a search; they are never embedded. The
+        connection is opened on first use and reopened in forked processes.
+
+        Args:
+            path (str): SQLite database file, or ':memory:'.
+            compression_level (int): zlib level, 1 (fastest) to 9 (smallest).
+        """
+        self.path = path
+        self.compression_level = compression_level
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection inherited through fork must not be used by the child
+        if self._connection is None or self._pid != os.getpid():
+            if self.path != ':memory:' and os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(_SCHEMA)
+            self._pid = os.getpid()
+        return self._connection
+
+    def put(self, records: list):
+        """
+        Stores parent records, replacing any with the same ID.
+
+        Args:
+            records (list): ChunkRecord objects; their record_id is the key.
+        """
+        if not records:
+            return
+        rows = [
+            (
+                record.record_id,
+                record.document_id,
+                zlib.compress(record.text.encode('utf-8'), self.compression_level),
+                json.dumps(record.to_metadata())
+            )
+            for record in records
+        ]
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.executemany("INSERT OR REPLACE INTO parents VALUES (?, ?, ?, ?)", rows)
+            logger.info(f"Stored {len(rows)} parent sections.")
+        except Exception as e:
+            logger.error(f"Error storing parent sections: {e}")
+            raise e
+
+    def get(self, ids: List[str]) -> Dict[str, Tuple[str, Dict]]:
+        """
+        Fetches parents by ID.
+
+        Args:
+            ids (List[str]): Parent record IDs.
+
+        Returns:
+            Dict[str, Tuple[str, Dict]]: (text, metadata) of each parent found.
+        """
+        if not ids:
+            return {}
+        ids = list(dict.fromkeys(ids))
+        placeholders = ','.join('?' * len(ids))
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    f"SELECT id, text, metadata FROM parents WHERE id IN ({placeholders})", ids
+                ).fetchall()
+        except Exception as e:
+            logger.error(f"Error fetching parent sections: {e}")
+            raise e
+        return {
+            parent_id: (zlib.decompress(text).decode('utf-8'), json.loads(metadata))
+            for parent_id, text, metadata in rows
+        }
+
+    def delete_document(self, document_id: str) -> int:
+        """
+        Removes the parents of a document.
+
+        Returns:
+            int: Number of parents removed.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                return connection.execute("DELETE FROM parents WHERE document_id = ?", (document_id,)).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM parents").fetchone()[0]
@@ -0,0 +1,92 @@
+# backend/src/vector_db/filters.py
+
+from typing import Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+def build_filter(
+    document_id: Optional[str] = None,
+    page_range: Optional[Tuple[int, int]] = None,
+    modality: Optional[str] = None,
+    extractor: Optional[str] = None
+) -> Optional[Dict]:
+    """
+    Builds a Chroma 'where' filter over chunk record metadata.
+
+    A page range selects chunks that overlap it. Omitted arguments do not filter.
+
+    Args:
+        document_id (str, optional): Restrict to one document.
+        page_range (Tuple[int, int], optional): Inclusive (first, last) page; either end may be None.
+        modality (str, optional): Restrict to a modality ('text', 'table', 'image', 'audio').
+        extractor (str, optional): Restrict to chunks from one chunker or extractor.
+
+    Returns:
+        Optional[Dict]: The filter, or None when nothing is restricted.
+    """
+    conditions = []
+    if document_id:
+        conditions.append({"document_id": {"$eq": document_id}})
+    if modality:
+        conditions.append({"modality": {"$eq": modality}})
+    if extractor:
+        conditions.append({"extractor": {"$eq": extractor}})
+    if page_range:
+        first_page, last_page = page_range
+        if last_page is not None:
+            conditions.append({"page_start": {"$lte": last_page}})
+        if first_page is not None:
+            conditions.append({"page_end": {"$gte": first_page}})
+
+    if not conditions:
+        return None
+    # Chroma requires at least two operands for $and
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+_COMPARISONS = {
+    "$eq": lambda value, operand: value == operand,
+    "$ne": lambda value, operand: value != operand,
+    "$gt": lambda value, operand: value is not None and value > operand,
+    "$gte": lambda value, operand: value is not None and value >= operand,
+    "$lt": lambda value, operand: value is not None and value < operand,
+    "$lte": lambda value, operand: value is not None and value <= operand,
+    "$in": lambda value, operand: value in operand,
+    "$nin": lambda value, operand: value not in operand,
+}
+
+def matches_filter(metadata: Dict, where: Optional[Dict]) -> bool:
+    """
+    Evaluates a Chroma-style 'where' filter against a metadata dictionary.
+
+    Supports $and, $or and the comparison operators $eq, $ne, $gt, $gte, $lt,
+    $lte, $in and $nin, as well as the {"field": value} equality shorthand.
+
+    Args:
+        metadata (Dict): Chunk metadata.
+        where (Dict, optional): The filter; None matches everything.
+
+    Returns:
+        bool: Whether the metadata satisfies the filter.
+    """
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for operator, operand in condition.items():
+                if operator not in _COMPARISONS:
+                    raise ValueError(f"Unsupported filter operator: {operator}")
+                if not _COMPARISONS[operator](value, operand):
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
@@ -0,0 +1,115 @@
+# File: backend/src/vector_db/test_vectordb.py
+
+import pytest
+
+from src.chunkers.records import ChunkRecord
+from src.embedding.fake_embeddings import FakeEmbeddings
+from src.vector_db.filters import build_filter, matches_filter
+from src.vector_db.vectordb import VectorDB
+
+RECORDS = [
+    ChunkRecord(text="Tides on page one.", document_id='doc-a', chunk_index=1, page_start=1, page_end=1),
+    ChunkRecord(text="Tides across pages two to four.", document_id='doc-a', chunk_index=2, page_start=2, page_end=4),
+    ChunkRecord(text="Tides on page six.", document_id='doc-a', chunk_index=3, page_start=6, page_end=6),
+    ChunkRecord(
+        text="| tides | height |", document_id='doc-a', chunk_index=1, modality='table', extractor='pdfplumber',
+        page_start=3, page_end=3
+    ),
+    ChunkRecord(text="Tides in another document.", document_id='doc-b', chunk_index=1, page_start=3, page_end=5),
+]
+
+@pytest.fixture
+def vector_db(tmp_path):
+    db = VectorDB('', 'test_collection', persist_directory=str(tmp_path), embeddings=FakeEmbeddings())
+    db.add_records(RECORDS)
+    return db
+
+def _pages(metadatas):
+    return sorted((m['document_id'], m['modality'], m['page_start'], m['page_end']) for m in metadatas)
+
+def _matching(where):
+    return _pages(record.to_metadata() for record in RECORDS if matches_filter(record.to_metadata(), where))
+
+def test_build_filter_without_restrictions_is_none():
+    assert build_filter() is None
+    assert build_filter(page_range=(None, None)) is None
+
+def test_build_filter_with_one_condition_has_no_and():
+    assert build_filter(document_id='doc-a') == {"document_id": {"$eq": "doc-a"}}
+    assert build_filter(page_range=(None, 3)) == {"page_start": {"$lte": 3}}
+
+def test_build_filter_combines_conditions_with_and():
+    where = build_filter(document_id='doc-a', modality='table', extractor='pdfplumber', page_range=(2, 3))
+
+    assert where == {"$and": [
+        {"document_id": {"$eq": "doc-a"}},
+        {"modality": {"$eq": "table"}},
+        {"extractor": {"$eq": "pdfplumber"}},
+        {"page_start": {"$lte": 3}},
+        {"page_end": {"$gte": 2}},
+    ]}
+
+@pytest.mark.parametrize("page_range, expected_pages", [
+    # Chunks overlapping the range are selected, including ones that start before it
+    ((3, 3), [(2, 4), (3, 3), (3, 5)]),
+    ((4, 5), [(2, 4), (3, 5)]),
+    ((5, 6), [(3, 5), (6, 6)]),
+    ((7, 9), []),
+    ((None, 1), [(1, 1)]),
+    ((6, None), [(6, 6)]),
+])
+def test_page_range_selects_overlapping_chunks(page_range, expected_pages):
+    where = build_filter(page_range=page_range)
+
+    assert sorted((start, end) for _, _, start, end in _matching(where)) == sorted(expected_pages)
+
+@pytest.mark.parametrize("where, metadata, expected", [
+    ({"page": {"$eq": 2}}, {"page": 2}, True),
+    ({"page": {"$ne": 2}}, {"page": 2}, False),
+    ({"page": {"$gt": 2}}, {"page": 3}, True),
+    ({"page": {"$gte": 2}}, {"page": 1}, False),
+    ({"page": {"$lt": 2}}, {"page": 1}, True),
+    ({"page": {"$lte": 2}}, {"page": 3}, False),
+    ({"modality": {"$in": ["table", "image"]}}, {"modality": "image"}, True),
+    ({"modality": {"$nin": ["table", "image"]}}, {"modality": "image"}, False),
+    # Missing fields never satisfy an ordering comparison
+    ({"page": {"$gt": 2}}, {}, False),
+    ({"page": {"$ne": 2}}, {}, True),
+    # Equality shorthand
+    ({"document_id": "doc-a"}, {"document_id": "doc-a"}, True),
+    ({"document_id": "doc-a"}, {"document_id": "doc-b"}, False),
+    ({"$or": [{"page": 1}, {"page": 3}]}, {"page": 3}, True),
+    ({"$or": [{"page": 1}, {"page": 3}]}, {"page": 2}, False),
+    ({"$and": [{"page": {"$gte": 1}}, {"page": {"$lte": 3}}]}, {"page": 2}, True),
+    ({"$and": [{"page": {"$gte": 1}}, {"page": {"$lte": 3}}]}, {"page": 4}, False),
+    # Several operators on one field must all hold
+    ({"page": {"$gte": 1, "$lte": 3}}, {"page": 4}, False),
+    (None, {"page": 4}, True),
+    ({}, {"page": 4}, True),
+])
+def test_matches_filter_operators(where, metadata, expected):
+    assert matches_filter(metadata, where) is expected
+
+def test_matches_filter_rejects_unknown_operators():
+    with pytest.raises(ValueError):
+        matches_filter({"page": 1}, {"page": {"$regex": "1"}})
+
+@pytest.mark.parametrize("filter_args", [
+    {},
+    {"document_id": "doc-a"},
+    {"modality": "table"},
+    {"page_range": (3, 3)},
+    {"page_range": (5, None)},
+    {"document_id": "doc-a", "page_range": (2, 4)},
+    {"document_id": "doc-b", "modality": "table"},
+])
+def test_dense_and_lexical_search_apply_the_same_filter(vector_db, filter_args):
+    where = build_filter(**filter_args)
+    k = len(RECORDS)
+
+    dense = vector_db.similarity_search("tides", k=k, filter=where)
+    lexical = vector_db.lexical_search("tides", k=k, filter=where)
+
+    expected = _matching(where)
+    assert _pages(doc.metadata for doc in dense) == expected
+    assert _pages(doc.metadata for doc in lexical) == expected
@@ -1,14 +1,54 @@
 # backend/src/vector_db/vectordb.py
 
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import OpenAIEmbeddings
 from src.utils.config import Config
+from src.retrieval.lexical import BM25Index
+from src.utils.instrumentation import span
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
+def load_lexical_index(collection_name: str, persist_directory: str) -> BM25Index:
+    """
+    Build a BM25 index over the documents persisted in a Chroma collection.
+
+    The Chroma client is closed afterwards, so the index can be built in a
+    parent process and inherited by forked workers.
+
+    Args:
+        collection_name (str): Name of the Chroma collection.
+        persist_directory (str): Directory of the persisted Chroma database.
+
+    Returns:
+        BM25Index: Index of the stored documents (empty if the collection does not exist).
+    """
+    import chromadb
+    index = BM25Index()
+    client = chromadb.PersistentClient(path=persist_directory)
+    try:
+        if collection_name not in [collection.name for collection in client.list_collections()]:
+            logger.info(f"Collection {collection_name} does not exist yet; lexical index is empty.")
+            return index
+        stored = client.get_collection(collection_name).get(include=["documents", "metadatas"])
+        index.add(stored["ids"], stored["documents"], stored["metadatas"])
+        logger.info(f"Lexical index loaded with {len(index)} documents.")
+        return index
+    except Exception as e:
+        logger.error(f"Error loading lexical index: {e}")
+        raise e
+    finally:
+        # Drop the cached client and its SQLite connections
+        client.clear_system_cache()
+
 class VectorDB:
-    def __init__(self, redis_url: str, collection_name: str, persist_directory: str = './chroma_db'):
+    def __init__(
+        self,
+        redis_url: str,
+        collection_name: str,
+        persist_directory: str = './chroma_db',
+        embeddings=None,
+        lexical_index: BM25Index = None
+    ):
         """
         Initialize the VectorDB with Chroma.
 
@@ -16,14 +56,28 @@ class VectorDB:
             redis_url (str): Redis connection URL.
             collection_name (str): Name of the Chroma collection.
             persist_directory (str): Directory to persist the Chroma database.
+            embeddings (Embeddings, optional): Client used to embed documents and queries.
+                Defaults to a new OpenAIEmbeddings client.
+            lexical_index (BM25Index, optional): Already loaded lexical index of the collection,
+                e.g. one shared from a parent process. Defaults to loading it on first lexical search.
+                Either way, documents written to the collection by other processes are added
+                to it before the next lexical search.
         """
         try:
-            self.embeddings = OpenAIEmbeddings(openai_api_key=Config.OPENAI_API_KEY)
+            from langchain_community.vectorstores import Chroma
+            if embeddings is None:
+                from langchain_community.embeddings import OpenAIEmbeddings
+                embeddings = OpenAIEmbeddings(openai_api_key=Config.OPENAI_API_KEY)
+            self.embeddings = embeddings
             self.vector_store = Chroma(
                 collection_name=collection_name,
                 embedding_function=self.embeddings,
                 persist_directory=persist_directory
             )
+            # Lexical (BM25) view of the same documents; synced with the collection before each search
+            self.lexical_index = lexical_index if lexical_index is not None else BM25Index()
+            self._lexical_count = None  # Collection size at the last sync
+            self._lexical_lock = threading.Lock()
             logger.info(f"VectorDB initialized with collection: {collection_name}")
         except Exception as e:
             logger.error(f"Error initializing VectorDB: {e}")
@@ -39,29 +93,141 @@ class VectorDB:
         """
         try:
             logger.info("Adding documents to VectorDB...")
-            self.vector_store.add_texts(texts=documents, embeddings=embeddings)
+            ids = self.vector_store.add_texts(texts=documents, embeddings=embeddings)
+            self.lexical_index.add(ids, documents)
             # Since manual persistence is deprecated, no need to call persist()
             logger.info("Documents added to VectorDB successfully.")
         except Exception as e:
             logger.error(f"Error adding documents to VectorDB: {e}")
             raise e
 
-    def similarity_search(self, query: str, k: int = 5):
+    def add_records(self, records: list):
+        """
+        Add chunk records with their metadata to the vector database.
+
+        Record ids are deterministic, so re-adding a document does not duplicate it.
+
+        Args:
+            records (list): A list of ChunkRecord objects.
+        """
+        if not records:
+            return
+        try:
+            logger.info(f"Adding {len(records)} chunk records to VectorDB...")
+            texts = [record.text for record in records]
+            metadatas = [record.to_metadata() for record in records]
+            # Includes embedding the texts, which the embeddings client records separately
+            with span("vector_write", items=len(records)):
+                ids = self.vector_store.add_texts(
+                    texts=texts, metadatas=metadatas, ids=[record.record_id for record in records]
+                )
+                self.lexical_index.add(ids, texts, metadatas)
+            logger.info("Chunk records added to VectorDB successfully.")
+        except Exception as e:
+            logger.error(f"Error adding chunk records to VectorDB: {e}")
+            raise e
+
+    def similarity_search(self, query: str, k: int = 5, filter: dict = None):
         """
         Query the vector database for relevant documents.
 
         Args:
             query (str): The query string.
             k (int): Number of top similar documents to retrieve.
+            filter (dict, optional): Metadata filter (see src.vector_db.filters.build_filter),
+                evaluated by the index during the search.
 
         Returns:
             list: A list of relevant documents.
         """
         try:
             logger.info(f"Performing similarity search for query: {query}")
-            results = self.vector_store.similarity_search(query, k=k)
+            results = self.vector_store.similarity_search(query, k=k, filter=filter)
             logger.info(f"Retrieved {len(results)} documents from VectorDB.")
             return results
         except Exception as e:
             logger.error(f"Error during similarity search: {e}")
             raise e
+
+    def similarity_search_by_vector(self, embedding: list, k: int = 5, filter: dict = None):
+        """
+        Query the vector database with a precomputed query embedding.
+
+        Args:
+            embedding (list): The query embedding.
+            k (int): Number of top similar documents to retrieve.
+            filter (dict, optional): Metadata filter evaluated by the index during the search.
+
+        Returns:
+            list: A list of relevant documents.
+        """
+        try:
+            results = self.vector_store.similarity_search_by_vector(embedding, k=k, filter=filter)
+            logger.info(f"Retrieved {len(results)} documents from VectorDB by vector.")
+            return results
+        except Exception as e:
+            logger.error(f"Error during similarity search by vector: {e}")
+            raise e
+
+    def embed_queries(self, queries: list) -> list:
+        """
+        Embed several queries with a single call to the embeddings client.
+
+        Args:
+            queries (list): Query strings.
+
+        Returns:
+            list: One embedding per query.
+        """
+        try:
+            return self.embeddings.embed_documents(queries)
+        except Exception as e:
+            logger.error(f"Error embedding queries: {e}")
+            raise e
+
+    def _sync_lexical_index(self):
+        """
+        Add documents of the collection that the lexical index lacks.
+
+        Loads the persisted documents on first use, and picks up documents that
+        other processes (e.g. the other server workers) wrote since: whenever the
+        collection's size changed, the missing ids are fetched and indexed.
+        """
+        count = self.vector_store._collection.count()
+        if count == self._lexical_count:
+            return
+        with self._lexical_lock:
+            if count == self._lexical_count:
+                return
+            stored_ids = self.vector_store.get(include=[])["ids"]
+            missing = [doc_id for doc_id in stored_ids if doc_id not in self.lexical_index]
+            if missing:
+                stored = self.vector_store.get(ids=missing, include=["documents", "metadatas"])
+                self.lexical_index.add(stored["ids"], stored["documents"], stored["metadatas"])
+                logger.info(f"Lexical index synced: {len(missing)} documents added, {len(self.lexical_index)} in total.")
+            self._lexical_count = len(stored_ids)
+
+    def lexical_search(self, query: str, k: int = 5, filter: dict = None):
+        """
+        Query the lexical (BM25) index for documents sharing terms with the query.
+
+        Args:
+            query (str): The query string.
+            k (int): Number of top documents to retrieve.
+            filter (dict, optional): Metadata filter applied while scoring.
+
+        Returns:
+            list: A list of relevant documents.
+        """
+        from langchain_core.documents import Document
+        try:
+            self._sync_lexical_index()
+            results = [
+                Document(page_content=text, metadata=metadata)
+                for text, metadata, _ in self.lexical_index.search(query, k=k, filter=filter)
+            ]
+            logger.info(f"Retrieved {len(results)} documents from the lexical index.")
+            return results
+        except Exception as e:
+            logger.error(f"Error during lexical search: {e}")
+            raise e